@@ -82,27 +82,23 @@ class UserRoleAdmin(ModelAdmin):
     
 
     async def get_form_fields(self):
-        """动态获取表单字段配置"""
-        # 获取所有用户和角色选项
-        users = await AdminUser.all()
-        roles = await Role.all()
-        
-        user_choices = {str(user.id): user.username for user in users}
-        role_choices = {str(role.id): role.name for role in roles}
+        """表单字段配置, 用户和角色选项由 /choices 接口分页加载"""
         return [
             FormField(
                 "user_id",
                 label="用户",
                 field_type=DisplayType.SELECT,
                 required=True,
-                choices=user_choices
+                choices_model=AdminUser,
+                choices_label="username"
             ),
             FormField(
                 "role_id",
                 label="角色",
                 field_type=DisplayType.SELECT,
                 required=True,
-                choices=role_choices
+                choices_model=Role,
+                choices_label="name"
             )
         ]
     
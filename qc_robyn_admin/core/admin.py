@@ -1,8 +1,12 @@
 from typing import Type, Optional, List, Dict, Union, Callable, Any
 from urllib.parse import unquote
 from tortoise.models import Model
-from tortoise import fields
+from tortoise import fields, timezone
 from tortoise.queryset import QuerySet
+from tortoise.signals import Signals
+from tortoise.functions import Count, Lower
+from tortoise.expressions import RawSQL
+from tortoise.exceptions import DoesNotExist, FieldError, ValidationError
 from robyn import Robyn, Request, Response, jsonify
 from robyn.templating import JinjaTemplate
 from pathlib import Path
@@ -17,20 +21,35 @@ import asyncio
 
 from ..models import AdminUser
 from .fields import (
-    DisplayType, TableField, FormField, SearchField, 
+    DisplayType, TableField, FormField, SearchField, load_related_values, get_related_path,
+    get_list_columns, get_sort_field
 )
 from .filters import (
     FilterField, SelectFilter, DateRangeFilter, 
-    NumberRangeFilter, BooleanFilter, FilterType
+    NumberRangeFilter, BooleanFilter, FilterType,
+    DATE_LEVELS, date_bucket_sql, parse_date_bucket
 )
 from ..i18n.translations import get_text
 from .menu import MenuManager  # 确保导入 MenuManager
 from .inline import InlineModelAdmin
+from .pagination import encode_cursor, decode_cursor, keyset_condition, nulls_sort_first
+from .cache import LRUCache, make_cache_key
+from .serializer import RowSerializer, ValuesRow, serialize_with_display, to_compact, to_wire_value
+from .encoders import estimate_size, make_etag
+from .fulltext import SQLiteFullTextIndex
+from .ngram import TrigramIndex
+from .indexes import IndexSuggestion, index_column
 
 from tortoise.expressions import Q
 import operator
 from functools import reduce
 
+# 参数未传入的标记, 用于区分 None
+_UNSET = object()
+
+# 三元组索引每增量更新多少次检查一次内存占用
+NGRAM_MEMORY_CHECK_INTERVAL = 1000
+
 @dataclass
 class MenuItem:
     """菜单项配置"""
@@ -55,11 +74,74 @@ class ModelAdmin:
     menu_icon: bootstrap icon class
 
     menu_order: int 排序位置  
+
+    pagination: 分页方式 "offset"(默认) 或 "keyset"(游标分页, 适合大表深度翻页)
+
+    max_per_page: 单页最大记录数, 客户端传入的 limit 超过该值时会被截断
+
+    count_cache_ttl: 列表总数缓存时间(秒), 0 表示不缓存; 增删改和导入后自动失效
+
+    count_cache_max_entries: 总数缓存最大条数(按搜索/过滤条件区分)
+
+    count_cache_stale_ttl: 总数缓存过期后仍直接返回旧值的时间(秒), 同时在后台刷新
+
+    concurrent_queries: 列表页的总数、分页和关联查询是否并发执行, 默认 None
+    表示 SQLite 之外的数据库自动并发
+
+    cache_ttl: 列表页数据缓存时间(秒), 0 表示不缓存; 本模型及关联字段引用的模型
+    保存或删除后自动失效
+
+    cache_max_entries: 列表页缓存最大条数
+
+    cache_max_bytes: 列表页缓存占用内存上限(按 JSON 编码后的大小估算)
+
+    show_facet_counts: 过滤面板的下拉/布尔选项是否显示对应的记录数
+
+    facet_cache_ttl: 选项记录数缓存时间(秒), 0 表示不缓存
+
+    date_hierarchy: 按年/月/日逐级筛选的日期或日期时间字段名, 通过 date_hierarchy
+    参数("2024" / "2024-05" / "2024-05-17")过滤
+
+    date_hierarchy_cache_ttl: 日期层级各区间记录数的缓存时间(秒)
+
+    fulltext_search: 是否为 search_fields 中的普通字段建立 SQLite FTS5 全文索引, 搜索
+    改为子串匹配并按相关度排序; 仅 SQLite 且主键为整数时生效, 其他情况使用普通查询
+
+    fulltext_tokenizer: FTS5 分词器, 默认 "trigram"(子串匹配, 关键字至少 3 个字符)
+
+    ngram_search: 是否在进程内为 search_fields 中的普通字段建立三元组索引, 首次搜索时
+    构建, 保存/删除后增量更新, 搜索改为不区分大小写的子串匹配; 未开启 fulltext_search 时生效
+
+    ngram_max_rows: 建立三元组索引的最大记录数, 超出时使用普通查询
+
+    ngram_max_bytes: 三元组索引占用内存上限(估算), 超出时放弃索引
+
+    ngram_max_candidates: 索引命中的记录数超过该值时改用数据库 icontains 查询
+
+    autocomplete_cache_ttl: 搜索框输入提示的缓存时间(秒), 0 表示不缓存
+
+    autocomplete_max_results: 输入提示单次返回的最大条数
+
+    distinct_cache_ttl: 过滤字段不重复值(distinct_values=True)的缓存时间(秒), 0 表示不缓存;
+    本模型及关联模型保存/删除后自动失效
+
+    distinct_page_size: 不重复值每页条数
+
+    show_inline_counts: 列表数据是否附带当前页每行各内联模型的子记录数(inline_counts),
+    也可以通过 inline_counts=true/false 参数按请求指定
+
+    detail_cache_ttl: 单条记录详情的缓存时间(秒), 0 表示不缓存; 本模型及关联字段引用的
+    模型保存或删除后自动失效
+
+    detail_cache_max_entries: 详情缓存最大条数
     """
     
     
     # 添加内联配置
     inlines: List[Type[InlineModelAdmin]] = []
+
+    # 分页/排序相关参数, 不影响总记录数
+    PAGE_PARAMS = ('limit', 'offset', 'cursor', 'sort', 'order', 'fields', 'format', 'inline_counts')
     
     def __init__(self, model: Type[Model]):
 
@@ -78,6 +160,73 @@ class ModelAdmin:
         self.edit_form_title = getattr(self, 'edit_form_title', f"编辑{self.verbose_name}")
         self.allow_import = getattr(self, 'allow_import', False)  # 是否允许导入
         self.import_fields = getattr(self, 'import_fields', [])   # 允许导入的字段
+        self.pagination = getattr(self, 'pagination', 'offset')   # 分页方式 offset/keyset
+        self.max_per_page = getattr(self, 'max_per_page', 500)    # 单页最大记录数
+        self.concurrent_queries = getattr(self, 'concurrent_queries', None)  # 列表查询是否并发
+        # 列表总数缓存
+        self.count_cache_ttl = getattr(self, 'count_cache_ttl', 0)
+        self.count_cache_max_entries = getattr(self, 'count_cache_max_entries', 128)
+        self.count_cache_stale_ttl = getattr(self, 'count_cache_stale_ttl', 0)
+        self._count_cache = LRUCache(
+            max_entries=self.count_cache_max_entries,
+            ttl=self.count_cache_ttl,
+            stale_ttl=self.count_cache_stale_ttl
+        )
+        self._count_refreshing = {}  # 正在后台刷新的总数缓存 {key: task}
+        # 列表页数据缓存
+        self.cache_ttl = getattr(self, 'cache_ttl', 0)
+        self.cache_max_entries = getattr(self, 'cache_max_entries', 256)
+        self.cache_max_bytes = getattr(self, 'cache_max_bytes', 32 * 1024 * 1024)
+        self._page_cache = LRUCache(
+            max_entries=self.cache_max_entries,
+            ttl=self.cache_ttl,
+            max_bytes=self.cache_max_bytes
+        )
+        # 过滤选项记录数
+        self.show_facet_counts = getattr(self, 'show_facet_counts', False)
+        self.facet_cache_ttl = getattr(self, 'facet_cache_ttl', 60)
+        self._facet_cache = LRUCache(max_entries=self.count_cache_max_entries, ttl=self.facet_cache_ttl)
+        # 日期层级
+        self.date_hierarchy = getattr(self, 'date_hierarchy', None)
+        self.date_hierarchy_cache_ttl = getattr(self, 'date_hierarchy_cache_ttl', 60)
+        self._date_hierarchy_cache = LRUCache(
+            max_entries=self.count_cache_max_entries, ttl=self.date_hierarchy_cache_ttl
+        )
+        if self.date_hierarchy and not isinstance(
+            self.model._meta.fields_map.get(self.date_hierarchy), (fields.DatetimeField, fields.DateField)
+        ):
+            raise ValueError(f"date_hierarchy 必须是日期或日期时间字段: {self.date_hierarchy}")
+        # 全文索引, 在数据库初始化后由 setup_fulltext_index 创建
+        self.fulltext_search = getattr(self, 'fulltext_search', False)
+        self.fulltext_tokenizer = getattr(self, 'fulltext_tokenizer', 'trigram')
+        self._fulltext: Optional[SQLiteFullTextIndex] = None
+        # 进程内三元组索引, 首次搜索时构建
+        self.ngram_search = getattr(self, 'ngram_search', False)
+        self.ngram_max_rows = getattr(self, 'ngram_max_rows', 200000)
+        self.ngram_max_bytes = getattr(self, 'ngram_max_bytes', 256 * 1024 * 1024)
+        self.ngram_max_candidates = getattr(self, 'ngram_max_candidates', 10000)
+        self._ngram_index: Optional[TrigramIndex] = None
+        self._ngram_building: Optional[asyncio.Future] = None
+        self._ngram_pending = set()  # 构建期间保存/删除的主键
+        self._ngram_disabled = False
+        self._ngram_failed = False  # 构建出错, 数据变更或 reset_ngram_index 后重试
+        self._ngram_changes = 0     # 构建后增量更新的次数, 用于定期检查内存占用
+        # 搜索框输入提示
+        self.autocomplete_cache_ttl = getattr(self, 'autocomplete_cache_ttl', 30)
+        self.autocomplete_max_results = getattr(self, 'autocomplete_max_results', 20)
+        self._autocomplete_cache = LRUCache(max_entries=512, ttl=self.autocomplete_cache_ttl)
+        # 过滤字段的不重复值
+        self.distinct_cache_ttl = getattr(self, 'distinct_cache_ttl', 300)
+        self.distinct_page_size = getattr(self, 'distinct_page_size', 50)
+        self._distinct_cache = LRUCache(max_entries=self.count_cache_max_entries, ttl=self.distinct_cache_ttl)
+        # 内联子记录数
+        self.show_inline_counts = getattr(self, 'show_inline_counts', False)
+        # 单条记录详情
+        self.detail_cache_ttl = getattr(self, 'detail_cache_ttl', 300)
+        self.detail_cache_max_entries = getattr(self, 'detail_cache_max_entries', 256)
+        self._detail_cache = LRUCache(max_entries=self.detail_cache_max_entries, ttl=self.detail_cache_ttl)
+        # 预编译的行序列化器 {字段名元组: RowSerializer}
+        self._serializers = LRUCache(max_entries=32, ttl=float('inf'))
         # 初始化其他配置
         if not hasattr(self, 'table_fields'):
             self.table_fields = []
@@ -200,7 +349,27 @@ class ModelAdmin:
         search = params.get('search', '')
         if search and self.search_fields:
             search_conditions = []
+            pk_attr = self.model._meta.pk_attr
+            indexed_columns = []
+            fulltext = self._fulltext if self.uses_fulltext(search) else None
+            ngram = await self.get_ngram_index() if not fulltext else None
+            if fulltext:
+                # 全文索引覆盖的字段 JOIN 一次 FTS5 匹配结果, 并按相关度排序(见 uses_fulltext)
+                indexed_columns = fulltext.columns
+                search_match, search_rank = fulltext.search_terms(search)
+                queryset = queryset.annotate(search_match=search_match, search_rank=search_rank)
+                search_conditions.append(Q(search_match__isnull=False))
+            elif ngram is not None:
+                # 三元组索引给出匹配的主键, 命中过多时交给数据库匹配
+                indexed_columns = self.get_search_columns()
+                pks = ngram.search(search)
+                if len(pks) <= self.ngram_max_candidates:
+                    search_conditions.append(Q(**{f"{pk_attr}__in": list(pks)}))
+                else:
+                    search_conditions.extend(Q(**{f"{column}__icontains": search}) for column in indexed_columns)
             for field in self.search_fields:
+                if field.name in indexed_columns:
+                    continue
                 try:
                     # 使用 SearchField 的 build_search_query 方法构建查询
                     query_dict = await field.build_search_query(search)
@@ -222,7 +391,7 @@ class ModelAdmin:
         # 处理过滤器
         filter_fields = await self.get_filter_fields()
         for filter_field in filter_fields:
-            filter_value = params.get(filter_field.name)
+            filter_value = filter_field.get_filter_value(params)
             if filter_value:
                 try:
                     query_dict = await filter_field.build_filter_query(filter_value)
@@ -238,7 +407,82 @@ class ModelAdmin:
                 except Exception as e:
                     print(f"Error building filter query for {filter_field.name}: {str(e)}")
                     continue
+
+        # 处理日期层级, 选中的年/月/日转换为范围条件以便使用索引
+        if self.date_hierarchy and params.get('date_hierarchy'):
+            try:
+                queryset = queryset.filter(**self.get_date_hierarchy_range(params['date_hierarchy']))
+            except Exception as e:
+                print(f"Error building date hierarchy query: {str(e)}")
         return queryset
+
+    def get_date_hierarchy_range(self, value: str) -> dict:
+        """将日期层级的选中值转换为 __gte/__lt 条件, 日期时间按 UTC 划分, 与区间统计一致"""
+        start, end, _ = parse_date_bucket(value)
+        if isinstance(self.model._meta.fields_map[self.date_hierarchy], fields.DatetimeField):
+            start = datetime.combine(start, datetime.min.time())
+            end = datetime.combine(end, datetime.min.time())
+            if timezone.get_use_tz():
+                start, end = timezone.make_aware(start, 'UTC'), timezone.make_aware(end, 'UTC')
+        return {f"{self.date_hierarchy}__gte": start, f"{self.date_hierarchy}__lt": end}
+
+    async def get_date_hierarchy(self, request: Request, params: dict) -> dict:
+        """
+        获取日期层级当前选中值的下一级区间及记录数
+
+        未选择时按年统计, 选中年份时按月统计, 选中月份时按日统计; 每一级一条
+        GROUP BY 查询, 条件包含当前的搜索和过滤
+
+        Returns:
+            dict: {"field", "selected", "parents", "level", "buckets": [{"value", "count"}]}
+        """
+        selected = params.get('date_hierarchy') or ''
+        parents = []
+        level = DATE_LEVELS[0]
+        if selected:
+            _, _, selected_level = parse_date_bucket(selected)
+            parts = selected.split('-')
+            parents = ['-'.join(parts[:i + 1]) for i in range(len(parts))]
+            index = DATE_LEVELS.index(selected_level) + 1
+            level = DATE_LEVELS[index] if index < len(DATE_LEVELS) else None
+        result = {
+            "field": self.date_hierarchy,
+            "selected": selected,
+            "parents": parents,
+            "level": level,
+            "buckets": []
+        }
+        if not level:
+            return result
+
+        cache_key = None
+        if self.date_hierarchy_cache_ttl and not self.is_request_scoped():
+            cache_key = make_cache_key(params, exclude=self.PAGE_PARAMS)
+            cached = self._date_hierarchy_cache.get(cache_key)
+            if cached is not None:
+                result["buckets"] = cached
+                return result
+            generation = self._date_hierarchy_cache.generation
+
+        meta = self.model._meta
+        column = meta.fields_map[self.date_hierarchy].source_field or self.date_hierarchy
+        dialect = meta.db.capabilities.dialect
+        quote = '`' if dialect == 'mysql' else '"'
+        bucket_sql = date_bucket_sql(
+            dialect, level, f"{quote}{meta.db_table}{quote}.{quote}{column}{quote}",
+            utc=isinstance(meta.fields_map[self.date_hierarchy], fields.DatetimeField)
+        )
+
+        queryset = await self.get_queryset(request, dict(params))
+        rows = await queryset.filter(**{f"{self.date_hierarchy}__isnull": False}).annotate(
+            bucket=RawSQL(bucket_sql), bucket_count=Count(meta.pk_attr)
+        ).group_by('bucket').order_by('bucket').values_list('bucket', 'bucket_count')
+        buckets = [{"value": str(value), "count": count} for value, count in rows if value]
+
+        if cache_key is not None:
+            self._date_hierarchy_cache.set(cache_key, buckets, generation=generation)
+        result["buckets"] = buckets
+        return result
         
     def get_field_label(self, field_name: str) -> str:
         for field in self.table_fields:
@@ -296,6 +540,210 @@ class ModelAdmin:
             return str(getattr(obj, field_name, ''))
         return field.format_value(getattr(obj, field_name, ''))
 
+    def get_related_field_name(self, field: TableField) -> str:
+        """从 "模型类_字段名" 格式的字段名中解析要显示的关联字段"""
+        model_name = field.related_model.__name__
+        if field.name.startswith(model_name + '_'):
+            # 移除模型名称前缀，获取实际字段名
+            return field.name[len(model_name + '_'):]
+        # 如果字段名不符合预期格式，使用默认字段
+        return 'id'
+
+    def get_sort_field(self, name: str) -> Optional[str]:
+        """
+        将表格字段名转换为排序用的 ORM 字段
+
+        "模型类_字段名" 格式的关联字段转换为外键关系路径(如 user__username),
+        由数据库 JOIN 关联表排序; 无法排序的字段返回 None
+        """
+        return get_sort_field(self.model, self.table_field_map.get(name), name, self.get_related_field_name)
+
+    def _overrides(self, method_name: str) -> bool:
+        """子类是否重写了指定方法"""
+        return getattr(type(self), method_name) is not getattr(ModelAdmin, method_name)
+
+    def is_request_scoped(self) -> bool:
+        """列表结果是否可能依赖当前请求(例如按登录用户过滤), 此时不同会话不共享结果"""
+        return any(
+            self._overrides(name)
+            for name in ('get_queryset', 'handle_query', 'get_list_data')
+        )
+
+    def get_requested_fields(self, params: dict) -> List[TableField]:
+        """
+        根据 fields 参数(逗号分隔的字段名)获取需要返回的表格字段
+
+        未指定或没有有效字段时返回全部表格字段, 主键字段始终返回
+        """
+        names = [name.strip() for name in (params.get('fields') or '').split(',') if name.strip()]
+        requested = [self.table_field_map[name] for name in names if name in self.table_field_map]
+        if not requested:
+            return self.table_fields
+        pk_attr = self.model._meta.pk_attr
+        return [
+            field for field in self.table_fields
+            if field in requested or field.name == pk_attr
+        ]
+
+    def get_list_columns(self, table_fields: List[TableField]) -> Optional[List[str]]:
+        """
+        列表查询需要读取的数据库列: 主键、表格字段列和关联字段的外键列
+
+        子类重写了 serialize_object, 或表格字段不是数据库列(例如模型属性)时
+        无法确定需要的列, 返回 None 表示查询全部列
+        """
+        if self._overrides('serialize_object'):
+            return None
+        return get_list_columns(self.model, table_fields)
+
+    def get_serializer(self, table_fields: Optional[List[TableField]] = None) -> Optional[RowSerializer]:
+        """
+        获取预编译的行序列化器, 子类重写了 serialize_object 时返回 None
+
+        table_fields: 只序列化这些字段, 默认全部表格字段
+        """
+        if self._overrides('serialize_object'):
+            return None
+        table_fields = table_fields or self.table_fields
+        key = tuple(field.name for field in table_fields)
+        serializer = self._serializers.get(key)
+        if serializer is None:
+            serializer = RowSerializer(table_fields, self.get_related_field_name)
+            self._serializers.set(key, serializer)
+        return serializer
+
+    def compile_serializers(self):
+        """预编译本管理类及内联管理类的行序列化器"""
+        self._serializers.clear()
+        self.get_serializer()
+        for inline in self._inline_instances:
+            inline.compile_serializer()
+
+    async def serialize_objects(self, objects: List[Model], for_display: bool = True,
+                                table_fields: Optional[List[TableField]] = None,
+                                related_values: Optional[Dict[str, Dict[Any, Any]]] = None) -> List[dict]:
+        """
+        批量序列化一页数据
+
+        关联字段按页批量查询, 避免每行每个关联字段各查询一次, 再由预编译的
+        行序列化器输出; 子类重写了 serialize_object 时逐条调用重写的方法
+
+        table_fields: 只序列化这些字段, 默认全部表格字段
+
+        related_values: 已查询的关联值(见 fetch_values), 为空时按页批量查询
+        """
+        serializer = self.get_serializer(table_fields)
+        if serializer is not None:
+            if related_values is None:
+                related_values = await load_related_values(
+                    objects, table_fields or self.table_fields, self.get_related_field_name,
+                    concurrent=self.can_run_concurrently()
+                )
+            return await serializer.serialize_many(objects, related_values, for_display)
+
+        field_names = {field.name for field in table_fields} if table_fields else None
+        data = []
+        for obj in objects:
+            try:
+                serialized = await self.serialize_object(obj, for_display=for_display)
+                if field_names is not None:
+                    serialized = {k: v for k, v in serialized.items() if k in field_names}
+                data.append(serialized)
+            except Exception as e:
+                print(f"Error serializing object: {str(e)}")
+                continue
+        return data
+
+    async def serialize_data_display(self, objects: List[Model],
+                                     related_values: Optional[Dict[str, Dict[Any, Any]]] = None) -> List[dict]:
+        """
+        序列化一页数据的未格式化值和显示值: [{"data", "display"}]
+
+        关联值只查询一次, 每行只序列化一次; 子类重写了 serialize_object 时 data 由重写的
+        方法输出, 显示值在其基础上替换有格式化函数的非关联列
+        """
+        display_fields = [
+            field for field in self.table_fields
+            if field.formatter and field.display_type != DisplayType.SWITCH
+            and not (field.related_model and field.related_key)
+        ]
+        serializer = self.get_serializer()
+        if serializer is not None:
+            if related_values is None:
+                related_values = await load_related_values(
+                    objects, self.table_fields, self.get_related_field_name,
+                    concurrent=self.can_run_concurrently()
+                )
+            # 没有格式化函数时显示值与未格式化值相同
+            rows, display_rows = await serialize_with_display(
+                objects, serializer, serializer if display_fields else None, related_values
+            )
+            return [
+                {'data': row, 'display': display_rows[i] if display_fields else row}
+                for i, row in enumerate(rows)
+            ]
+
+        display_serializer = RowSerializer(display_fields, self.get_related_field_name) if display_fields else None
+        result = []
+        for obj in objects:
+            try:
+                row = await self.serialize_object(obj, for_display=False)
+                display = dict(row)
+                if display_serializer:
+                    display.update(await display_serializer.serialize_one(obj, {}, for_display=True))
+            except Exception as e:
+                print(f"Error serializing object: {str(e)}")
+                continue
+            result.append({'data': row, 'display': display})
+        return result
+
+    async def serialize_compact(self, objects: List[Model],
+                                table_fields: Optional[List[TableField]] = None,
+                                related_values: Optional[Dict[str, Dict[Any, Any]]] = None) -> dict:
+        """
+        以紧凑的列式格式序列化一页数据
+
+        rows 为未经格式化函数处理的值(与默认格式的 data 相同), 设置了格式化函数的
+        非关联列额外输出显示值; 每行只序列化一次
+        """
+        table_fields = table_fields or self.table_fields
+        columns = [field.name for field in table_fields]
+        display_fields = [
+            field for field in table_fields
+            if field.formatter and field.display_type != DisplayType.SWITCH
+            and not (field.related_model and field.related_key)
+        ]
+        display_columns = [field.name for field in display_fields]
+        # 显示值列都不是关联字段, 不需要查询关联表
+        display_serializer = RowSerializer(display_fields, self.get_related_field_name) if display_fields else None
+
+        serializer = self.get_serializer(table_fields)
+        if serializer is not None:
+            if related_values is None:
+                related_values = await load_related_values(
+                    objects, table_fields, self.get_related_field_name,
+                    concurrent=self.can_run_concurrently()
+                )
+            rows, display_rows = await serialize_with_display(
+                objects, serializer, display_serializer, related_values
+            )
+            return to_compact(columns, rows, display_columns, display_rows)
+
+        rows, display_rows = [], []
+        for obj in objects:
+            try:
+                row = await self.serialize_object(obj, for_display=False)
+                display_row = (
+                    await display_serializer.serialize_one(obj, {}, for_display=True)
+                    if display_serializer else {}
+                )
+            except Exception as e:
+                print(f"Error serializing object: {str(e)}")
+                continue
+            rows.append(row)
+            display_rows.append(display_row)
+        return to_compact(columns, rows, display_columns, display_rows)
+
     async def serialize_object(self, obj: Model, for_display: bool = True) -> dict:
         """序列化对象"""
         result = {}
@@ -320,16 +768,10 @@ class ModelAdmin:
                             related_obj = await field.related_model.get(id=fk_value)
                             if related_obj:
                                 # 从字段名中解析要显示的关联字段
-                                model_name = field.related_model.__name__
-                                if field.name.startswith(model_name + '_'):
-                                    # 移除模型名称前缀，获取实际字段名
-                                    related_field = field.name[len(model_name + '_'):]
-                                else:
-                                    # 如果字段名不符合预期格式，使用默认字段
-                                    related_field = 'id'
+                                related_field = self.get_related_field_name(field)
                                 # 获取关联字段的值
                                 related_value = getattr(related_obj, related_field)
-                                result[field.name] = str(related_value) if related_value is not None else ''
+                                result[field.name] = to_wire_value(related_value)
                                 continue
                     except Exception as e:
                         result[field.name] = ''
@@ -346,7 +788,7 @@ class ModelAdmin:
                         print(f"Error formatting field {field.name}: {str(e)}")
                         result[field.name] = str(value) if value is not None else ''
                 else:
-                    result[field.name] = str(value) if value is not None else ''
+                    result[field.name] = to_wire_value(value)
                 
             except Exception as e:
                 print(f"Error serializing field {field.name}: {str(e)}")
@@ -386,12 +828,18 @@ class ModelAdmin:
         return self.search_fields
 
     @trace_method
-    async def get_frontend_config(self) -> dict:
-        """获取前端配置"""
+    async def get_frontend_config(self, request: Optional[Request] = None) -> dict:
+        """获取前端配置, 传入 request 且开启 show_facet_counts 时过滤字段附带初始的选项记录数"""
         form_fields = await self.get_form_fields()
         add_form_fields = await self.get_add_form_fields()
         filter_fields = await self.get_filter_fields()
         search_fields = await self.get_search_fields()
+        facets = {}
+        if request is not None and self.show_facet_counts:
+            try:
+                facets = await self.get_facet_counts(request, {})
+            except Exception as e:
+                print(f"Error in get_facet_counts: {str(e)}")
         config = {
             "tableFields": [field.to_dict() for field in self.table_fields],
             "modelName": self.model.__name__,
@@ -402,7 +850,10 @@ class ModelAdmin:
             "addFormTitle": self.add_form_title or f"添加{self.verbose_name}",
             "editFormTitle": self.edit_form_title or f"编辑{self.verbose_name}",
             "searchFields": [field.to_dict() for field in search_fields],
-            "filterFields": [field.to_dict() for field in filter_fields],
+            "filterFields": [field.to_dict(facets.get(field.name)) for field in filter_fields],
+            "showFacetCounts": self.show_facet_counts,
+            "dateHierarchy": self.date_hierarchy,
+            "showInlineCounts": self.show_inline_counts,
             "enableEdit": self.enable_edit,
             "allowAdd": self.allow_add,
             "allowDelete": self.allow_delete,
@@ -438,37 +889,40 @@ class ModelAdmin:
             formsets.append(formset)
         return formsets
 
-    async def get_inline_data(self, parent_id: str, inline_model: str):
-        """获取内联数据"""
+    async def get_inline_data(self, parent_id: str, inline_model: str,
+                              limit: Optional[int] = None, cursor: str = '', search: str = '') -> dict:
+        """
+        获取一页内联数据, 默认每页 inline.per_page 条, cursor 为上一页返回的 next_cursor
+
+        Returns:
+            dict: {"data", "total", "next_cursor", "next_offset"}, 内联模型或父记录不存在时 data 为空
+        """
+        empty = {"data": [], "total": 0, "next_cursor": None, "next_offset": None}
         try:
             # 找到对应的内联实例
             inline = next((i for i in self._inline_instances if i.model.__name__ == inline_model), None)
             if not inline:
-                return []
+                return empty
             # 获取父实例
-            parent_instance = await self.model.get(id=parent_id)
+            parent_instance = await self.model.get_or_none(id=parent_id)
             if not parent_instance:
-                return []
-            # 获取关联单记录
-            queryset = await inline.get_queryset(parent_instance)
-            data = []
-            async for obj in queryset:
-                try:
-                    # 使用内联模型的序列化方法
-                    serialized = await inline.serialize_object(obj)
-                    data.append({
-                        'data': serialized,
-                        'display': serialized
-                    })
-                except Exception as e:
-                    print(f"Error serializing object: {str(e)}")
-                    traceback.print_exc()
-                    continue
-            return data
+                return empty
+            # 获取关联记录
+            page = await inline.get_page(parent_instance, limit=limit, cursor=cursor, search=search)
+            # 使用内联模型的序列化方法
+            return {
+                "data": [
+                    {'data': serialized, 'display': serialized}
+                    for serialized in await inline.serialize_objects(page['objects'])
+                ],
+                "total": page['total'],
+                "next_cursor": page['next_cursor'],
+                "next_offset": page['next_offset'],
+            }
         except Exception as e:
             print(f"Error in get_inline_data: {str(e)}")
             traceback.print_exc()
-            return []
+            return empty
 
     async def get_list_config(self) -> dict:
         """获取列表页面配置"""
@@ -602,6 +1056,824 @@ class ModelAdmin:
             print(f"Batch delete error: {str(e)}")
             return False, f"批量删除失败: {str(e)}", 0
 
+    def get_keyset_state(self, params: dict) -> Optional[dict]:
+        """
+        解析游标分页状态
+
+        只有 pagination = "keyset" 时生效; 未携带游标且 offset 大于 0 时
+        (例如页面表格直接跳页) 退回普通的 offset 分页。
+        排序字段 + 主键 共同组成游标, 排序字段可为空 (见 keyset_condition)。
+
+        Returns:
+            Optional[dict]: {"sort", "desc", "cursor"}, 不使用游标分页时返回 None
+
+        Raises:
+            InvalidCursor: 游标格式错误
+        """
+        if self.pagination != 'keyset':
+            return None
+        cursor = decode_cursor(params.get('cursor', ''))
+        if not cursor and int(params.get('offset') or 0) > 0:
+            return None
+
+        pk_attr = self.model._meta.pk_attr
+        sort = params.get('sort') or ''
+        desc = params.get('order') == 'desc'
+        if not sort and self.default_ordering:
+            sort = self.default_ordering[0]
+            desc = sort.startswith('-')
+            sort = sort.lstrip('-')
+        meta = self.model._meta
+        # 外键关系名映射为外键列, 游标中保存外键值而不是关联对象
+        if sort in meta.fk_fields or sort in meta.o2o_fields:
+            sort = meta.fields_map[sort].source_field
+        if sort not in meta.db_fields:
+            sort = pk_attr
+
+        # 排序方式改变后旧游标失效, 从第一页开始
+        if cursor and (cursor['sort'] != sort or cursor['order'] != ('desc' if desc else 'asc')):
+            cursor = None
+        return {"sort": sort, "desc": desc, "cursor": cursor}
+
+    def apply_keyset(self, queryset: QuerySet, keyset: dict, limit: int) -> QuerySet:
+        """按游标过滤并排序, 多取一条用于判断是否还有下一页"""
+        pk_attr = self.model._meta.pk_attr
+        sort, desc, cursor = keyset['sort'], keyset['desc'], keyset['cursor']
+        forward = not cursor or cursor['direction'] == 'next'
+
+        if cursor:
+            # 向后翻页时比较方向与排序方向一致, 向前翻页时相反
+            op = 'lt' if desc == forward else 'gt'
+            queryset = queryset.filter(keyset_condition(
+                sort, pk_attr, cursor['value'], cursor['pk'], op, nulls_sort_first(self.model)
+            ))
+
+        prefix = '-' if desc == forward else ''
+        ordering = [f"{prefix}{pk_attr}"] if sort == pk_attr else [f"{prefix}{sort}", f"{prefix}{pk_attr}"]
+        return queryset.order_by(*ordering).limit(limit + 1)
+
+    def paginate_keyset(self, objects: list, keyset: dict, limit: int) -> tuple[list, dict]:
+        """截取当前页数据并生成前后页游标"""
+        sort, desc, cursor = keyset['sort'], keyset['desc'], keyset['cursor']
+        forward = not cursor or cursor['direction'] == 'next'
+        has_more = len(objects) > limit
+        objects = objects[:limit]
+        if not forward:
+            objects.reverse()
+
+        order = 'desc' if desc else 'asc'
+        pk_attr = self.model._meta.pk_attr
+
+        def make_cursor(obj, direction):
+            return encode_cursor(sort, order, getattr(obj, sort), getattr(obj, pk_attr), direction)
+
+        next_cursor = prev_cursor = None
+        if objects:
+            if has_more or not forward:
+                next_cursor = make_cursor(objects[-1], 'next')
+            if (cursor and forward) or (not forward and has_more):
+                prev_cursor = make_cursor(objects[0], 'prev')
+        return objects, {"next_cursor": next_cursor, "prev_cursor": prev_cursor}
+
+    async def get_count(self, queryset: QuerySet, params: dict) -> int:
+        """
+        获取查询集总记录数, 开启 count_cache_ttl 时按搜索/过滤条件缓存
+
+        缓存过期但仍在 count_cache_stale_ttl 窗口内时直接返回旧值, 并在后台刷新;
+        结果依赖当前请求(重写了 get_queryset 等)时不缓存
+        """
+        if not self.count_cache_ttl or self.is_request_scoped():
+            return await queryset.count()
+
+        key = (self.model.__name__, make_cache_key(params, exclude=self.PAGE_PARAMS))
+        entry = self._count_cache.lookup(key)
+        if entry is not None:
+            total, stale = entry
+            if stale and key not in self._count_refreshing:
+                task = asyncio.create_task(self._refresh_count(key, queryset))
+                self._count_refreshing[key] = task
+            return total
+
+        generation = self._count_cache.generation
+        total = await queryset.count()
+        self._count_cache.set(key, total, generation=generation)
+        return total
+
+    async def _refresh_count(self, key: tuple, queryset: QuerySet):
+        """后台刷新总数缓存"""
+        try:
+            generation = self._count_cache.generation
+            total = await queryset.count()
+            self._count_cache.set(key, total, generation=generation)
+        except Exception as e:
+            print(f"Error refreshing count cache: {str(e)}")
+        finally:
+            self._count_refreshing.pop(key, None)
+
+    def invalidate_cache(self):
+        """模型数据变更后清空缓存"""
+        self._count_cache.clear()
+        self._page_cache.clear()
+        self._facet_cache.clear()
+        self._date_hierarchy_cache.clear()
+        self._autocomplete_cache.clear()
+        self._distinct_cache.clear()
+        self._detail_cache.clear()
+
+    def connect_cache_signals(self):
+        """开启缓存时, 本模型及关联字段引用的模型保存/删除后清空缓存; 同时增量更新三元组索引"""
+        if self.ngram_search:
+            self.model.register_listener(Signals.post_save, self._on_ngram_saved)
+            self.model.register_listener(Signals.post_delete, self._on_ngram_deleted)
+        if not (self.cache_ttl or self.count_cache_ttl or self.detail_cache_ttl or self.autocomplete_cache_ttl
+                or (self.show_facet_counts and self.facet_cache_ttl)
+                or (self.date_hierarchy and self.date_hierarchy_cache_ttl)
+                or (self.distinct_cache_ttl and any(f.distinct_values for f in self.filter_fields))):
+            return
+        models = [self.model] + [
+            field.related_model for field in self.table_fields if field.related_model
+        ] + [
+            # 缓存的列表页可能包含内联子记录数
+            inline.model for inline in self._inline_instances if self.cache_ttl
+        ] + [
+            field.related_model for field in self.filter_fields
+            if field.distinct_values and field.related_model
+        ] + [
+            # 关联搜索字段的输入提示来自关联模型
+            field.related_model for field in self.search_fields
+            if field.related_model and self.autocomplete_cache_ttl
+        ]
+        for model in dict.fromkeys(models):
+            model.register_listener(Signals.post_save, self._on_model_changed)
+            model.register_listener(Signals.post_delete, self._on_model_changed)
+
+    async def _on_model_changed(self, sender, instance, *args):
+        self.invalidate_cache()
+
+    def get_search_columns(self) -> List[str]:
+        """可以建立全文/三元组索引的搜索字段(当前模型的普通列, 子串匹配 icontains);
+        其他匹配方式的字段仍按各自的条件查询"""
+        db_fields = self.model._meta.db_fields
+        return [
+            field.name for field in self.search_fields
+            if not field.related_model and field.name in db_fields and field.operator == 'icontains'
+        ]
+
+    async def get_ngram_index(self) -> Optional[TrigramIndex]:
+        """获取三元组索引, 首次调用时构建; 未开启或超出限制时返回 None"""
+        if not self.ngram_search or self._ngram_disabled or self._ngram_failed:
+            return None
+        if self._ngram_index is not None:
+            return self._ngram_index
+        # 并发的首次搜索共享同一次构建
+        if self._ngram_building is None:
+            self._ngram_building = asyncio.ensure_future(self._build_ngram_index())
+        return await asyncio.shield(self._ngram_building)
+
+    async def _build_ngram_index(self) -> Optional[TrigramIndex]:
+        try:
+            columns = self.get_search_columns()
+            if not columns:
+                self._ngram_disabled = True
+                return None
+            total = await self.model.all().count()
+            if total > self.ngram_max_rows:
+                print(f"Trigram index skipped for {self.model.__name__}: {total} rows > ngram_max_rows")
+                self._ngram_disabled = True
+                return None
+            self._ngram_pending = set()
+            index = TrigramIndex()
+            rows = await self.model.all().values_list(self.model._meta.pk_attr, *columns)
+            for row in rows:
+                index.add(row[0], row[1:])
+            # 构建期间保存/删除的记录重新读取
+            while self._ngram_pending:
+                pending, self._ngram_pending = self._ngram_pending, set()
+                await self._refresh_ngram_rows(index, pending)
+            stats = index.stats()
+            if not self._ngram_within_limits(index, stats['bytes']):
+                self._ngram_disabled = True
+                return None
+            self._ngram_changes = 0
+            print(
+                f"Trigram index built for {self.model.__name__}: {stats['rows']} rows, "
+                f"{stats['trigrams']} trigrams, ~{stats['bytes'] / 1024 / 1024:.1f} MiB"
+            )
+            self._ngram_index = index
+            return index
+        except Exception as e:
+            # 不在每次搜索时重新全表读取, 等到数据变更或 reset_ngram_index 后再重试
+            print(f"Error building trigram index for {self.model.__name__}: {str(e)}")
+            self._ngram_failed = True
+            return None
+        finally:
+            self._ngram_building = None
+
+    def _ngram_within_limits(self, index: TrigramIndex, size: Optional[int] = None) -> bool:
+        """索引的记录数和内存占用是否在限制内, size 为已计算的内存占用"""
+        if len(index) > self.ngram_max_rows:
+            print(f"Trigram index dropped for {self.model.__name__}: {len(index)} rows > ngram_max_rows")
+            return False
+        size = index.memory_usage() if size is None else size
+        if size > self.ngram_max_bytes:
+            print(f"Trigram index dropped for {self.model.__name__}: ~{size} bytes > ngram_max_bytes")
+            return False
+        return True
+
+    def _check_ngram_growth(self):
+        """增量更新后检查限制: 记录数每次检查, 内存占用需要遍历索引, 每 NGRAM_MEMORY_CHECK_INTERVAL 次检查一次"""
+        index = self._ngram_index
+        self._ngram_changes += 1
+        if len(index) > self.ngram_max_rows or self._ngram_changes % NGRAM_MEMORY_CHECK_INTERVAL == 0:
+            if not self._ngram_within_limits(index):
+                self._ngram_index = None
+                self._ngram_disabled = True
+
+    async def _refresh_ngram_rows(self, index: TrigramIndex, pks: set):
+        """从数据库重新读取指定记录更新索引, 已删除的记录从索引中移除"""
+        pk_attr = self.model._meta.pk_attr
+        rows = await self.model.filter(**{f"{pk_attr}__in": list(pks)}).values_list(
+            pk_attr, *self.get_search_columns()
+        )
+        for row in rows:
+            index.add(row[0], row[1:])
+        for pk in pks - {row[0] for row in rows}:
+            index.remove(pk)
+
+    async def _on_ngram_saved(self, sender, instance, *args):
+        self._ngram_failed = False
+        if self._ngram_building is not None:
+            self._ngram_pending.add(instance.pk)
+        elif self._ngram_index is not None:
+            try:
+                if instance._partial:
+                    await self._refresh_ngram_rows(self._ngram_index, {instance.pk})
+                else:
+                    columns = self.get_search_columns()
+                    self._ngram_index.add(instance.pk, [getattr(instance, column) for column in columns])
+                self._check_ngram_growth()
+            except Exception as e:
+                print(f"Error updating trigram index: {str(e)}")
+                self.reset_ngram_index()
+
+    async def _on_ngram_deleted(self, sender, instance, *args):
+        self._ngram_failed = False
+        if self._ngram_building is not None:
+            self._ngram_pending.add(instance.pk)
+        elif self._ngram_index is not None:
+            self._ngram_index.remove(instance.pk)
+
+    def reset_ngram_index(self):
+        """丢弃三元组索引, 下次搜索时重新构建; 用于绕过模型信号批量修改数据之后"""
+        self._ngram_index = None
+        self._ngram_disabled = False
+        self._ngram_failed = False
+
+    def get_ngram_stats(self) -> Optional[Dict[str, int]]:
+        """三元组索引的记录数、三元组数和估算内存, 未构建时返回 None"""
+        return self._ngram_index.stats() if self._ngram_index is not None else None
+
+    async def setup_fulltext_index(self):
+        """开启 fulltext_search 时创建 FTS5 索引和同步触发器, 不支持时使用普通查询"""
+        if not self.fulltext_search:
+            return
+        columns = self.get_search_columns()
+        if not columns:
+            return
+        try:
+            if not SQLiteFullTextIndex.supports(self.model):
+                print(f"Full-text search requires SQLite and an integer primary key, skipped: {self.model.__name__}")
+                return
+            index = SQLiteFullTextIndex(self.model, columns, tokenizer=self.fulltext_tokenizer)
+            await index.ensure()
+            self._fulltext = index
+        except Exception as e:
+            print(f"Error creating full-text index for {self.model.__name__}: {str(e)}")
+            self._fulltext = None
+
+    def uses_fulltext(self, search: str) -> bool:
+        """get_queryset 是否通过全文索引搜索该关键字(此时查询带有 search_rank 相关度)"""
+        return bool(search and self.search_fields and self._fulltext and self._fulltext.can_search(search))
+
+    async def rebuild_fulltext_index(self):
+        """按原表数据重建全文索引, 用于绕过触发器导入数据之后"""
+        if self._fulltext:
+            await self._fulltext.rebuild()
+            self.invalidate_cache()
+
+    def get_index_suggestions(self) -> List[IndexSuggestion]:
+        """
+        列表页查询会用到的索引, 由 AdminSite.advise_indexes 检查是否缺少
+
+        包括可排序列和 default_ordering、可用索引的过滤条件(精确匹配/范围/关联子查询)、
+        关联搜索的外键、date_hierarchy、内联模型的外键, 以及等值过滤 + 默认排序 + 主键
+        的组合索引(游标分页按该顺序读取); icontains 等子串匹配无法使用普通索引, 不在其中
+        """
+        model = self.model
+        pk_column = index_column(model, model._meta.pk_attr)
+        suggestions = []
+
+        def add(target, columns, reason):
+            if columns and all(columns) and columns[0] != index_column(target, target._meta.pk_attr):
+                suggestions.append(IndexSuggestion(target, tuple(dict.fromkeys(columns)), [reason]))
+
+        # 游标分页按 (排序列, 主键) 读取
+        tiebreak = [pk_column] if self.pagination == 'keyset' else []
+        sort_column = pk_column
+        if self.default_ordering:
+            sort_column = index_column(model, self.default_ordering[0].lstrip('-')) or pk_column
+        for name in self.default_ordering:
+            add(model, [index_column(model, name.lstrip('-')), *tiebreak], f"default_ordering {name}")
+        for field in self.table_fields:
+            if field.sortable and not field.related_model:
+                add(model, [index_column(model, field.name), *tiebreak], f"sortable {field.name}")
+
+        # 过滤: 等值条件与排序列组成组合索引, 范围条件只能使用单列索引
+        for field in self.filter_fields:
+            if field.related_model and field.related_key:
+                add(model, [index_column(model, field.related_key)], f"filter {field.name}")
+            elif isinstance(field, (DateRangeFilter, NumberRangeFilter)) or field.operator in (
+                'gt', 'gte', 'lt', 'lte', 'range'
+            ):
+                add(model, [index_column(model, field.name)], f"filter {field.name}")
+            elif (isinstance(field, SelectFilter) and field.distinct_values) or field.operator in ('exact', 'in'):
+                add(model, [index_column(model, field.name), sort_column, *tiebreak], f"filter {field.name}")
+
+        for field in self.search_fields:
+            if field.related_model and field.related_key:
+                add(model, [index_column(model, field.related_key)], f"search {field.name}")
+            elif field.operator in ('exact', 'in'):
+                add(model, [index_column(model, field.name)], f"search {field.name}")
+
+        if self.date_hierarchy:
+            add(model, [index_column(model, self.date_hierarchy)], f"date_hierarchy {self.date_hierarchy}")
+
+        # 内联模型按外键分页
+        for inline in self._inline_instances:
+            inline_model = inline.model
+            columns = [index_column(inline_model, inline.fk_field)]
+            ordering = inline.get_page_ordering()
+            if ordering:
+                columns.append(index_column(inline_model, ordering[0]))
+            columns.append(index_column(inline_model, inline_model._meta.pk_attr))
+            add(inline_model, columns, f"inline {model.__name__}.{inline.fk_field}")
+        return suggestions
+
+    def get_autocomplete_column(self, field_name: str) -> Optional[tuple]:
+        """搜索字段对应的 (模型, 列名), 关联字段使用关联模型的列, 不支持时返回 None"""
+        field = next((f for f in self.search_fields if f.name == field_name), None)
+        if not field:
+            return None
+        model, column = self.model, field.name
+        if field.related_model and field.related_key:
+            model_name = field.related_model.__name__
+            if not field.name.startswith(model_name + '_'):
+                return None
+            model, column = field.related_model, field.name[len(model_name + '_'):]
+        if column not in model._meta.db_fields:
+            return None
+        return model, column
+
+    async def get_autocomplete(self, field_name: str, prefix: str, limit: int = 10) -> Optional[List[str]]:
+        """
+        搜索框输入提示: 返回字段中以 prefix 开头(不区分大小写)的前 limit 个不重复值
+
+        比较小写后的值并按前缀匹配, 可以使用 LOWER(列) 上的索引; 结果按前缀缓存,
+        上一个较短前缀的结果已完整(少于 limit 条)时直接在内存中过滤
+
+        Returns:
+            Optional[List[str]]: 字段不是可搜索的数据库列时返回 None
+        """
+        target = self.get_autocomplete_column(field_name)
+        if target is None:
+            return None
+        folded = prefix.lower()
+        if not folded:
+            return []
+        limit = max(1, min(limit, self.autocomplete_max_results))
+        cache_key = (field_name, folded, limit)
+        if self.autocomplete_cache_ttl:
+            cached = self._autocomplete_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            for length in range(len(folded) - 1, 0, -1):
+                shorter = self._autocomplete_cache.get((field_name, folded[:length], limit))
+                if shorter is not None and len(shorter) < limit:
+                    values = [value for value in shorter if value.lower().startswith(folded)]
+                    self._autocomplete_cache.set(cache_key, values)
+                    return values
+            generation = self._autocomplete_cache.generation
+
+        model, column = target
+        rows = await model.annotate(
+            autocomplete_folded=Lower(column)
+        ).filter(
+            autocomplete_folded__startswith=folded
+        ).distinct().order_by(column).limit(limit).values_list(column, flat=True)
+        values = [str(value) for value in rows if value is not None]
+        if self.autocomplete_cache_ttl:
+            self._autocomplete_cache.set(cache_key, values, generation=generation)
+        return values
+
+    async def get_remote_choice_field(self, field_name: str) -> Optional[FormField]:
+        """编辑或添加表单中使用远程选项的字段"""
+        for form_fields in (await self.get_form_fields(), await self.get_add_form_fields()):
+            for field in form_fields:
+                if field.name == field_name and field.choices_model:
+                    return field
+        return None
+
+    async def get_choices(self, field_name: str, search: str = '', offset: int = 0,
+                          limit: Optional[int] = None, values: Optional[List[str]] = None) -> Optional[dict]:
+        """
+        分页获取远程选项, 只查询值和显示字段
+
+        Args:
+            field_name: 表单字段名
+            search: 按显示字段模糊匹配
+            offset/limit: 分页, limit 默认为字段的 choices_page_size
+            values: 需要回显的已选值, 一次查询取得显示文本
+
+        Returns:
+            Optional[dict]: {"results": [{"value", "label"}], "more": 是否还有下一页,
+            "selected": [{"value", "label"}]}; 字段不存在时返回 None
+        """
+        field = await self.get_remote_choice_field(field_name)
+        if field is None:
+            return None
+        model = field.choices_model
+        value_column, label_column = field.choices_value, field.choices_label
+        limit = max(1, min(limit or field.choices_page_size, self.max_per_page))
+
+        def to_options(rows) -> List[dict]:
+            return [{'value': str(value), 'label': to_wire_value(label)} for value, label in rows]
+
+        selected = []
+        if values:
+            selected = to_options(
+                await model.filter(**{f"{value_column}__in": values}).values_list(value_column, label_column)
+            )
+
+        queryset = model.all()
+        if search:
+            queryset = queryset.filter(**{f"{label_column}__icontains": search})
+        # 多取一条判断是否还有下一页, 不统计总数
+        rows = await queryset.order_by(label_column, value_column).offset(max(offset, 0)).limit(
+            limit + 1
+        ).values_list(value_column, label_column)
+        return {
+            'results': to_options(rows[:limit]),
+            'more': len(rows) > limit,
+            'selected': selected
+        }
+
+    async def get_distinct_values(self, request: Request, field_name: str, search: str = '', offset: int = 0,
+                                  limit: Optional[int] = None) -> Optional[dict]:
+        """
+        过滤字段的不重复值及记录数, 按记录数从多到少分页
+
+        一条 GROUP BY 查询, 多取一条判断是否还有下一页; 只统计 get_queryset 范围内的记录,
+        结果按字段缓存, 模型保存/删除后失效; 结果依赖当前请求(重写了 get_queryset 等)时不缓存
+
+        Returns:
+            Optional[dict]: {"results": [{"value", "label", "count"}], "more": 是否还有下一页};
+            字段不是 distinct_values 下拉过滤器时返回 None
+        """
+        filter_field = next(
+            (f for f in await self.get_filter_fields() if f.name == field_name and f.distinct_values), None
+        )
+        column = self.get_facet_column(filter_field) if filter_field else None
+        if column is None:
+            return None
+        limit = max(1, min(limit or self.distinct_page_size, self.max_per_page))
+        offset = max(offset, 0)
+
+        cache_key = None
+        if self.distinct_cache_ttl and not self.is_request_scoped():
+            cache_key = (field_name, search, offset, limit)
+            cached = self._distinct_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            generation = self._distinct_cache.generation
+
+        queryset = await self.get_queryset(request, {})
+        if search:
+            queryset = queryset.filter(**{f"{column}__icontains": search})
+        rows = await queryset.annotate(
+            value_count=Count(self.model._meta.pk_attr)
+        ).group_by(column).order_by('-value_count', column).offset(offset).limit(
+            limit + 1
+        ).values_list(column, 'value_count')
+
+        results = [
+            {'value': str(value), 'label': to_wire_value(value), 'count': count}
+            for value, count in rows[:limit] if value is not None
+        ]
+        data = {'results': results, 'more': len(rows) > limit}
+        if cache_key is not None:
+            self._distinct_cache.set(cache_key, data, generation=generation)
+        return data
+
+    def get_facet_column(self, filter_field: FilterField) -> Optional[str]:
+        """下拉/布尔过滤字段用于分组统计的 ORM 字段, 关联字段通过 JOIN 分组"""
+        if filter_field.filter_type not in (FilterType.SELECT, FilterType.BOOLEAN):
+            return None
+        if filter_field.related_model and filter_field.related_key:
+            model_name = filter_field.related_model.__name__
+            if not filter_field.name.startswith(model_name + '_'):
+                return None
+            related_field = filter_field.name[len(model_name + '_'):]
+            return get_related_path(self.model, filter_field, related_field)
+        if filter_field.name in self.model._meta.db_fields:
+            return filter_field.name
+        return None
+
+    async def get_facet_counts(self, request: Request, params: dict) -> Dict[str, Dict[Any, int]]:
+        """
+        统计下拉/布尔过滤字段每个选项的记录数
+
+        每个字段一条 GROUP BY 查询, 条件为当前的搜索和其他过滤条件(不含该字段自身),
+        即选择该选项后列表的记录数
+
+        Returns:
+            Dict[str, Dict[Any, int]]: {过滤字段名: {选项值: 数量}}
+        """
+        facets = {}
+        for filter_field in await self.get_filter_fields():
+            column = self.get_facet_column(filter_field)
+            if column and filter_field.choices:
+                facets[filter_field.name] = (filter_field, column)
+
+        async def count_field(filter_field: FilterField, column: str) -> Dict[Any, int]:
+            context = {
+                key: value for key, value in params.items()
+                if key != filter_field.name and key not in self.PAGE_PARAMS
+            }
+            cache_key = None
+            if self.facet_cache_ttl and not self.is_request_scoped():
+                cache_key = (filter_field.name, make_cache_key(context))
+                cached = self._facet_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+                generation = self._facet_cache.generation
+
+            queryset = await self.get_queryset(request, context)
+            rows = await queryset.annotate(
+                facet_count=Count(self.model._meta.pk_attr)
+            ).group_by(column).values_list(column, 'facet_count')
+
+            counts = {key: 0 for key in filter_field.choices}
+            for value, count in rows:
+                for key in filter_field.choices:
+                    if isinstance(key, bool):
+                        matched = value is not None and bool(value) == key
+                    else:
+                        matched = str(key) == str(value)
+                    if matched:
+                        counts[key] += count
+                        break
+            if cache_key is not None:
+                self._facet_cache.set(cache_key, counts, generation=generation)
+            return counts
+
+        results = await self.gather_queries(
+            *(count_field(filter_field, column) for filter_field, column in facets.values())
+        )
+        return dict(zip(facets, results))
+
+    async def validate_filters(self, params: dict):
+        """
+        在查询前校验过滤参数
+
+        Raises:
+            InvalidFilterValue: 过滤值格式错误, 例如无法解析的日期或数字范围
+        """
+        for filter_field in await self.get_filter_fields():
+            filter_value = filter_field.get_filter_value(params)
+            if filter_value:
+                filter_field.validate(unquote(filter_value))
+        if self.date_hierarchy and params.get('date_hierarchy'):
+            parse_date_bucket(unquote(params['date_hierarchy']))
+
+    async def get_list_data(self, request: Request, params: dict) -> dict:
+        """
+        获取列表页数据
+
+        Args:
+            request: Request对象
+            params: 查询参数字典, 同 handle_query, 游标分页时可包含 cursor
+
+        Returns:
+            dict: {"total", "data"}, 游标分页时额外包含 next_cursor/prev_cursor;
+            format=compact 时用 columns/rows/display_columns/display 代替 data;
+            开启内联子记录数时包含 inline_counts
+
+        Raises:
+            InvalidCursor: 游标格式错误
+            InvalidFilterValue: 过滤值格式错误
+        """
+        # 列表页缓存, 结果依赖当前请求时不缓存
+        cache_key = None
+        if self.cache_ttl and not self.is_request_scoped():
+            cache_key = make_cache_key(params)
+            cached = self._page_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            generation = self._page_cache.generation
+
+        await self.validate_filters(params)
+        keyset = self.get_keyset_state(params)
+
+        # 只查询需要显示的列
+        table_fields = self.get_requested_fields(params)
+        columns = self.get_list_columns(table_fields)
+        if columns is not None:
+            if keyset:
+                columns.append(keyset['sort'])
+            columns = list(dict.fromkeys(columns))
+
+        async def fetch(queryset: QuerySet) -> tuple[list, Optional[Dict[str, Dict[Any, Any]]]]:
+            if columns is not None and not self._overrides('get_queryset'):
+                # 不创建模型实例, 直接序列化查询结果
+                return await self.fetch_values(queryset, columns, table_fields)
+            if columns is not None:
+                queryset = queryset.only(*columns)
+            return [obj async for obj in queryset], None
+
+        if self._overrides('handle_query'):
+            queryset, total = await self.handle_query(request, params)
+            objects, related_values = await fetch(queryset)
+        else:
+            # 总数和当前页互不依赖, 数据库支持时并发查询
+            try:
+                queryset, count_queryset = await self.build_list_query(request, params, keyset)
+            except Exception as e:
+                # 查询条件无效时返回空页, 不缓存
+                print(f"Query error: {str(e)}")
+                queryset = cache_key = None
+            if queryset is None:
+                total, objects, related_values = 0, [], {}
+            else:
+                total, (objects, related_values) = await self.gather_queries(
+                    self.get_list_count(count_queryset, params), fetch(queryset)
+                )
+
+        result = {"total": total}
+        if keyset:
+            objects, cursors = self.paginate_keyset(objects, keyset, params['limit'])
+            result.update(cursors)
+
+        if self.wants_inline_counts(params):
+            pk_attr = self.model._meta.pk_attr
+            result["inline_counts"] = await self.get_inline_counts(
+                [getattr(obj, pk_attr) for obj in objects]
+            )
+
+        if params.get('format') == 'compact':
+            result.update(await self.serialize_compact(
+                objects, table_fields=table_fields, related_values=related_values
+            ))
+        else:
+            result["data"] = [
+                {'data': serialized, 'display': serialized}
+                for serialized in await self.serialize_objects(
+                    objects, table_fields=table_fields, related_values=related_values
+                )
+            ]
+
+        if cache_key is not None:
+            self._page_cache.set(cache_key, result, generation=generation, size=estimate_size(result))
+        return result
+
+    def get_detail_columns(self, form_fields: List[FormField]) -> Optional[List[str]]:
+        """详情需要读取的列: 表格列和编辑表单(get_form_fields 的结果)中的数据库列, 无法确定时返回 None"""
+        columns = self.get_list_columns(self.table_fields)
+        if columns is None:
+            return None
+        db_fields = self.model._meta.db_fields
+        return list(dict.fromkeys(
+            columns + [field.name for field in form_fields if field.name in db_fields]
+        ))
+
+    async def get_detail(self, object_id: str, request: Optional[Request] = None) -> Optional[tuple[dict, str]]:
+        """
+        获取单条记录的详情, 用于编辑表单回显
+
+        只查询表格和表单需要的列, 按主键缓存; 重写了 get_object 时使用其返回的对象。
+        结果可能依赖当前请求时(见 is_request_scoped)不缓存, 且只返回 get_queryset 中可见的记录
+
+        Returns:
+            Optional[tuple[dict, str]]: (表格字段和表单字段的值, 额外的 display 为显示值; ETag),
+            记录不存在时返回 None
+        """
+        scoped = self.is_request_scoped()
+        cache_key = str(object_id)
+        if self.detail_cache_ttl and not scoped:
+            cached = self._detail_cache.get(cache_key)
+            if cached is not None:
+                return cached
+            generation = self._detail_cache.generation
+
+        form_fields = await self.get_form_fields()
+        columns = self.get_detail_columns(form_fields)
+        pk_attr = self.model._meta.pk_attr
+        try:
+            if scoped:
+                queryset = await self.get_queryset(request, {})
+                if not await queryset.filter(**{pk_attr: object_id}).exists():
+                    return None
+                obj = await self.get_object(object_id)
+            elif columns is not None and not self._overrides('get_object'):
+                obj = await self.model.filter(**{pk_attr: object_id}).only(*columns).first()
+            else:
+                obj = await self.get_object(object_id)
+        except (DoesNotExist, ValueError, ValidationError):
+            obj = None
+        if obj is None:
+            return None
+
+        item = (await self.serialize_data_display([obj]))[0]
+        row = dict(item['data'])
+        for field in form_fields:
+            if field.name not in row and hasattr(obj, field.name):
+                row[field.name] = to_wire_value(getattr(obj, field.name))
+        data = {**row, 'display': item['display']}
+        result = (data, make_etag(data))
+        if self.detail_cache_ttl and not scoped:
+            self._detail_cache.set(cache_key, result, generation=generation)
+        return result
+
+    def wants_inline_counts(self, params: dict) -> bool:
+        """是否附带内联子记录数, inline_counts 参数优先于 show_inline_counts"""
+        if not self._inline_instances:
+            return False
+        value = params.get('inline_counts')
+        if value:
+            return str(value).lower() in ('1', 'true', 'yes')
+        return self.show_inline_counts
+
+    async def get_inline_counts(self, pks: List[Any]) -> Dict[str, Dict[str, int]]:
+        """
+        当前页每行各内联模型的子记录数, 每个内联模型一条 GROUP BY 外键的查询
+        (内联模型重写了 get_queryset 时按其查询集逐行统计, 见 InlineModelAdmin.count_children)
+
+        Returns:
+            Dict[str, Dict[str, int]]: {内联模型名: {主键: 子记录数}}, 没有子记录的行为 0
+        """
+        if not pks:
+            return {inline.model.__name__: {} for inline in self._inline_instances}
+        counts = await self.gather_queries(*(
+            inline.count_children(pks) for inline in self._inline_instances
+        ))
+        return {
+            inline.model.__name__: {str(pk): inline_counts.get(pk, 0) for pk in pks}
+            for inline, inline_counts in zip(self._inline_instances, counts)
+        }
+
+    async def fetch_values(self, queryset: QuerySet, columns: List[str],
+                           table_fields: List[TableField]) -> tuple[List[ValuesRow], Dict[str, Dict[Any, Any]]]:
+        """
+        用 values_list 查询一页数据, 不创建模型实例
+
+        关联字段通过 JOIN 在同一条查询中取值, 无法 JOIN 的关联字段再按页批量查询
+
+        Returns:
+            tuple[List[ValuesRow], Dict]: (行数据, {表格字段名: {外键值: 关联字段值}})
+        """
+        related_paths = {}
+        for field in table_fields:
+            if field.related_model and field.related_key:
+                path = get_related_path(self.model, field, self.get_related_field_name(field))
+                if path:
+                    related_paths[field.name] = (field.related_key, path)
+
+        paths = list(dict.fromkeys(path for _, path in related_paths.values()))
+        rows = await queryset.values_list(*columns, *paths)
+
+        # (表格字段名, 外键列下标, 关联字段列下标)
+        related_index = [
+            (name, columns.index(related_key), len(columns) + paths.index(path))
+            for name, (related_key, path) in related_paths.items()
+        ]
+        objects = []
+        related_values: Dict[str, Dict[Any, Any]] = {name: {} for name in related_paths}
+        for row in rows:
+            objects.append(ValuesRow(zip(columns, row)))
+            for name, fk_index, value_index in related_index:
+                if row[fk_index]:
+                    related_values[name][row[fk_index]] = row[value_index]
+
+        remaining = [
+            field for field in table_fields
+            if field.related_model and field.related_key and field.name not in related_paths
+        ]
+        if remaining:
+            related_values.update(await load_related_values(
+                objects, remaining, self.get_related_field_name,
+                concurrent=self.can_run_concurrently()
+            ))
+        return objects, related_values
+
     async def handle_query(self, request: Request, params: dict) -> tuple[QuerySet, int]:
         """
         处理数据查询的钩子方法
@@ -611,6 +1883,7 @@ class ModelAdmin:
             params: 查询参数字典,包含:
                 - limit: 每页记录数
                 - offset: 偏移量
+                - cursor: 分页游标(仅 pagination = "keyset" 时使用)
                 - search: 搜索关键字
                 - sort: 排序字段
                 - order: 排序方式(asc/desc)
@@ -620,22 +1893,75 @@ class ModelAdmin:
             tuple[QuerySet, int]: (查询结果集, 总记录数)
         """
         try:
-            # 获取基础查询集
-            queryset = await self.get_queryset(request, params)
+            queryset, count_queryset = await self.build_list_query(request, params)
+            # 获取总记录数
+            total = await self.get_count(count_queryset, params)
+            return queryset, total
             
-            # 处理排序
-            if params.get('sort'):
-                order_by = f"{'-' if params['order'] == 'desc' else ''}{params['sort']}"
+        except Exception as e:
+            print(f"Query error: {str(e)}")
+            return self.model.all(), 0
+
+    async def build_list_query(self, request: Request, params: dict,
+                               keyset: Optional[dict] = _UNSET) -> tuple[QuerySet, QuerySet]:
+        """
+        构建列表查询, 参数同 handle_query
+
+        Args:
+            keyset: 已解析的游标分页状态(get_keyset_state 的结果), 未传入时从 params 解析
+
+        Returns:
+            tuple[QuerySet, QuerySet]: (当前页查询集, 统计总数的查询集)
+        """
+        # 获取基础查询集
+        queryset = await self.get_queryset(request, params)
+        if keyset is _UNSET:
+            keyset = self.get_keyset_state(params)
+
+        # 处理排序(游标分页的排序在 apply_keyset 中处理)
+        if not keyset:
+            sort_field = self.get_sort_field(params['sort']) if params.get('sort') else None
+            if sort_field:
+                order_by = f"{'-' if params['order'] == 'desc' else ''}{sort_field}"
                 queryset = queryset.order_by(order_by)
+            elif self.uses_fulltext(params.get('search', '')):
+                try:
+                    queryset = queryset.order_by('search_rank', self.model._meta.pk_attr)
+                except FieldError:
+                    # 重写的 get_queryset 没有使用默认的搜索
+                    if self.default_ordering:
+                        queryset = queryset.order_by(*self.default_ordering)
             elif self.default_ordering:
                 queryset = queryset.order_by(*self.default_ordering)
-            # 获取总记录数
-            total = await queryset.count()
-            # 分页
+        count_queryset = queryset
+        # 分页
+        if keyset:
+            queryset = self.apply_keyset(queryset, keyset, params['limit'])
+        else:
             queryset = queryset.offset(params['offset']).limit(params['limit'])
-            return queryset, total
-            
+        return queryset, count_queryset
+
+    async def get_list_count(self, queryset: Optional[QuerySet], params: dict) -> int:
+        """获取列表总数, 查询出错时返回 0"""
+        if queryset is None:
+            return 0
+        try:
+            return await self.get_count(queryset, params)
         except Exception as e:
             print(f"Query error: {str(e)}")
-            return self.model.all(), 0
+            return 0
+
+    def can_run_concurrently(self) -> bool:
+        """列表页的查询能否并发执行, SQLite 只有一个连接时按顺序执行"""
+        if self.concurrent_queries is not None:
+            return self.concurrent_queries
+        try:
+            return self.model._meta.db.capabilities.dialect != 'sqlite'
+        except Exception:
+            return False
 
+    async def gather_queries(self, *coros) -> list:
+        """执行互不依赖的查询, 支持时并发执行, 否则按顺序执行"""
+        if self.can_run_concurrently():
+            return list(await asyncio.gather(*coros))
+        return [await coro for coro in coros]
@@ -0,0 +1,97 @@
+from typing import Any, Optional, Hashable, Iterable
+from collections import OrderedDict
+import time
+
+
+class LRUCache:
+    """带过期时间的LRU缓存
+
+    max_entries: 最大缓存条数, 超出后淘汰最久未使用的条目
+
+    ttl: 过期时间(秒)
+
+    stale_ttl: 过期后仍可作为旧值返回的时间(秒), 用于 stale-while-revalidate
+
+    max_bytes: 缓存值总大小上限(字节), 0 表示不限制; 大小由写入时的 size 参数提供
+    """
+
+    def __init__(self, max_entries: int = 128, ttl: float = 60, stale_ttl: float = 0,
+                 max_bytes: int = 0):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        # 每次清空缓存时递增, 用于丢弃清空前发起的查询结果
+        self.generation = 0
+        self._data: "OrderedDict[Hashable, tuple[Any, float, int]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.lookup(key) is not None
+
+    def lookup(self, key: Hashable) -> Optional[tuple[Any, bool]]:
+        """查找缓存
+
+        Returns:
+            Optional[tuple[Any, bool]]: (缓存值, 是否已过期), 不存在或超出旧值窗口时返回 None
+        """
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, stored_at, _ = entry
+        age = time.monotonic() - stored_at
+        if age > self.ttl + self.stale_ttl:
+            self.pop(key)
+            return None
+        self._data.move_to_end(key)
+        return value, age > self.ttl
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """获取未过期的缓存值"""
+        entry = self.lookup(key)
+        if entry is None or entry[1]:
+            return default
+        return entry[0]
+
+    def set(self, key: Hashable, value: Any, generation: Optional[int] = None, size: int = 0):
+        """写入缓存
+
+        generation: 查询开始时的 generation, 若期间缓存已被清空则丢弃该结果
+
+        size: 缓存值的大小(字节), 用于 max_bytes 限制
+        """
+        if generation is not None and generation != self.generation:
+            return
+        if self.max_bytes and size > self.max_bytes:
+            return
+        self.pop(key)
+        self._data[key] = (value, time.monotonic(), size)
+        self.total_bytes += size
+        while len(self._data) > self.max_entries or (self.max_bytes and self.total_bytes > self.max_bytes):
+            _, (_, _, evicted_size) = self._data.popitem(last=False)
+            self.total_bytes -= evicted_size
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._data.pop(key, None)
+        if entry is None:
+            return default
+        self.total_bytes -= entry[2]
+        return entry[0]
+
+    def clear(self):
+        self._data.clear()
+        self.total_bytes = 0
+        self.generation += 1
+
+
+def make_cache_key(params: dict, exclude: Iterable[str] = ()) -> tuple:
+    """将查询参数规范化为缓存键, 忽略空值和以下划线开头的内部参数"""
+    exclude = set(exclude)
+    return tuple(sorted(
+        (str(key), str(value))
+        for key, value in params.items()
+        if key not in exclude and not str(key).startswith('_') and value not in (None, '')
+    ))
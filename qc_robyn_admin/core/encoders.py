@@ -0,0 +1,106 @@
+from abc import ABC, abstractmethod
+from typing import Any, Dict, Optional, Union
+import hashlib
+import json
+
+import orjson
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+JSON_CONTENT_TYPE = "application/json; charset=utf-8"
+MSGPACK_CONTENT_TYPE = "application/msgpack"
+
+
+class JSONBackend(ABC):
+    """JSON 编码后端基类, 子类实现 dumps
+
+    datetime / Decimal / UUID 等类型由后端直接编码, 输出与 str() 相同,
+    序列化时无需先转换为字符串
+    """
+    name: str = None
+    content_type: str = JSON_CONTENT_TYPE
+
+    @abstractmethod
+    def dumps(self, data: Any) -> bytes:
+        """编码为字节串"""
+        pass
+
+    def dumps_str(self, data: Any) -> str:
+        return self.dumps(data).decode('utf-8')
+
+
+class StdlibJSONBackend(JSONBackend):
+    """标准库 json"""
+    name = 'json'
+
+    def dumps(self, data: Any) -> bytes:
+        return json.dumps(data, default=str, ensure_ascii=False).encode('utf-8')
+
+
+class OrjsonBackend(JSONBackend):
+    """orjson, 默认后端"""
+    name = 'orjson'
+    # 日期时间交给 default 处理, 与 str() 的输出保持一致
+    options = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, data: Any) -> bytes:
+        return orjson.dumps(data, default=str, option=self.options)
+
+
+class MsgpackBackend(JSONBackend):
+    """msgpack, 客户端通过 Accept: application/msgpack 请求"""
+    name = 'msgpack'
+    content_type = MSGPACK_CONTENT_TYPE
+
+    def __init__(self):
+        if msgpack is None:
+            raise ImportError("msgpack 未安装, 请先执行 pip install msgpack")
+
+    def dumps(self, data: Any) -> bytes:
+        return msgpack.packb(data, default=str, use_bin_type=True)
+
+
+JSON_BACKENDS: Dict[str, type] = {
+    'json': StdlibJSONBackend,
+    'orjson': OrjsonBackend,
+}
+
+
+def estimate_size(data: Any) -> int:
+    """估算数据编码为 JSON 后的字节数, 用于限制缓存占用的内存"""
+    return len(orjson.dumps(data, default=str, option=OrjsonBackend.options))
+
+
+def make_etag(data: Any) -> str:
+    """根据数据内容生成弱 ETag, 内容不变时值不变"""
+    raw = orjson.dumps(data, default=str, option=OrjsonBackend.options | orjson.OPT_SORT_KEYS)
+    return f'W/"{hashlib.blake2b(raw, digest_size=12).hexdigest()}"'
+
+
+def get_json_backend(backend: Union[str, JSONBackend, None]) -> JSONBackend:
+    """根据名称获取编码后端, 也可以直接传入 JSONBackend 实例"""
+    if isinstance(backend, JSONBackend):
+        return backend
+    backend_class = JSON_BACKENDS.get(backend or 'orjson')
+    if backend_class is None:
+        raise ValueError(f"不支持的 JSON 后端: {backend}, 可选值: {', '.join(JSON_BACKENDS)}")
+    return backend_class()
+
+
+def get_msgpack_backend() -> Optional[JSONBackend]:
+    """msgpack 已安装时返回 msgpack 后端"""
+    return MsgpackBackend() if msgpack is not None else None
+
+
+def accepts_msgpack(accept: Optional[str]) -> bool:
+    """Accept 请求头是否要求 msgpack"""
+    if not accept:
+        return False
+    return any(
+        item.split(';')[0].strip() in ('application/msgpack', 'application/x-msgpack')
+        for item in accept.split(',')
+    )
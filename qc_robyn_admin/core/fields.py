@@ -3,10 +3,7 @@ from typing import Any, Optional, Union, Callable, List, Dict, Type
 from dataclasses import dataclass
 from tortoise import Model
 import asyncio
-from .filters import FilterType
-from tortoise.expressions import Q
-from functools import reduce
-import operator
+from .filters import FilterType, FilterField, build_related_condition
 
 class DisplayType(Enum):
     """显示类型枚举"""
@@ -84,8 +81,12 @@ class TableField:
         if self.actions is None:
             self.actions = []
             
-    async def format_value(self, value: Any, instance: Optional[Model] = None) -> str:
-        """格式化值用于显示"""
+    async def format_value(self, value: Any, instance: Optional[Model] = None,
+                           related_values: Optional[Dict[Any, Any]] = None) -> str:
+        """格式化值用于显示
+
+        related_values: 预先批量查询的关联值 {外键值: 关联字段值}, 提供时不再逐条查询
+        """
         if value is None:
             return ''
             
@@ -96,6 +97,10 @@ class TableField:
                 fk_value = getattr(instance, self.related_key)
                 if not fk_value:
                     return ''
+
+                if related_values is not None:
+                    related_value = related_values.get(fk_value)
+                    return str(related_value) if related_value is not None else ''
                     
                 # 查询关联对象
                 related_obj = await self.related_model.get(id=fk_value)
@@ -149,6 +154,110 @@ class TableField:
             
         return data
     
+def get_related_path(model: Type[Model], field: Union[TableField, FilterField], related_field: str) -> Optional[str]:
+    """关联字段对应的 ORM 查询路径, 例如 user__username
+
+    通过 related_key 找到模型上的外键关系, 查询时由数据库 JOIN 关联表;
+    关联字段不是数据库列或找不到外键关系时返回 None
+    """
+    if not (field.related_model and field.related_key):
+        return None
+    if related_field not in field.related_model._meta.db_fields:
+        return None
+    meta = model._meta
+    for relation in meta.fk_fields | meta.o2o_fields:
+        if meta.fields_map[relation].source_field == field.related_key:
+            return f"{relation}__{related_field}"
+    return None
+
+
+def get_list_columns(model: Type[Model], table_fields: List[TableField]) -> Optional[List[str]]:
+    """列表需要读取的数据库列: 主键、表格字段列和关联字段的外键列
+
+    表格字段不是数据库列(例如模型属性)时返回 None, 表示查询全部列
+    """
+    db_fields = model._meta.db_fields
+    columns = [model._meta.pk_attr]
+    for field in table_fields:
+        column = field.related_key if field.related_model and field.related_key else field.name
+        if column not in db_fields:
+            return None
+        columns.append(column)
+    return list(dict.fromkeys(columns))
+
+
+def get_sort_field(model: Type[Model], field: Optional[TableField], name: str,
+                   get_related_field: Callable[[TableField], str]) -> Optional[str]:
+    """表格字段对应的排序用 ORM 字段
+
+    关联字段转换为外键关系路径(如 user__username), 由数据库 JOIN 关联表排序;
+    无法排序的字段返回 None
+    """
+    if field and field.related_model and field.related_key:
+        return get_related_path(model, field, get_related_field(field))
+    if name in model._meta.fields_map:
+        return name
+    return None
+
+
+async def load_related_values(
+    objects: List[Model],
+    table_fields: List[TableField],
+    get_related_field: Callable[[TableField], str],
+    concurrent: bool = False
+) -> Dict[str, Dict[Any, Any]]:
+    """批量查询一页数据的关联字段值
+
+    每个关联模型只查询一次(id__in), 且只查询需要显示的列
+
+    Args:
+        objects: 当前页的模型实例
+        table_fields: 表格字段配置
+        get_related_field: 根据字段配置返回要显示的关联模型字段名
+        concurrent: 是否并发查询各关联模型(需要数据库支持多连接)
+
+    Returns:
+        Dict[str, Dict[Any, Any]]: {表格字段名: {外键值: 关联字段值}}
+    """
+    # 按关联模型分组, 合并外键值和需要查询的列
+    groups: Dict[Type[Model], Dict[str, Any]] = {}
+    for field in table_fields:
+        if not (field.related_model and field.related_key):
+            continue
+        related_field = get_related_field(field)
+        if related_field not in field.related_model._meta.fields_map:
+            continue
+        group = groups.setdefault(field.related_model, {'ids': set(), 'columns': {}})
+        group['columns'][field.name] = related_field
+        for obj in objects:
+            fk_value = getattr(obj, field.related_key, None)
+            if fk_value:
+                group['ids'].add(fk_value)
+
+    async def load(related_model: Type[Model], group: Dict[str, Any]) -> None:
+        columns = list(dict.fromkeys(group['columns'].values()))
+        try:
+            rows = await related_model.filter(id__in=list(group['ids'])).values_list('id', *columns)
+        except Exception as e:
+            print(f"Error loading related values for {related_model.__name__}: {str(e)}")
+            return
+        for row in rows:
+            row_values = dict(zip(columns, row[1:]))
+            for field_name, related_field in group['columns'].items():
+                result[field_name][row[0]] = row_values[related_field]
+
+    result: Dict[str, Dict[Any, Any]] = {}
+    for group in groups.values():
+        for field_name in group['columns']:
+            result[field_name] = {}
+    loads = [load(related_model, group) for related_model, group in groups.items() if group['ids']]
+    if concurrent:
+        await asyncio.gather(*loads)
+    else:
+        for coro in loads:
+            await coro
+    return result
+
 @dataclass
 class FormField:
     """表单字段配置"""
@@ -169,11 +278,18 @@ class FormField:
     multiple: bool = False  # 是否支持多文件上传
     preview: bool = True  # 是否显示预览
     drag_text: Optional[str] = None  # 拖拽区域提示文本
+    # 远程选项: 下拉框打开或输入时分页加载, 不把所有记录写入页面配置
+    choices_model: Optional[Type[Model]] = None  # 选项来源模型
+    choices_label: Optional[str] = None          # 选项显示字段, 默认与 choices_value 相同
+    choices_value: str = 'id'                    # 选项值字段
+    choices_page_size: int = 20                  # 每次加载的选项数
     
     def __post_init__(self):
         if self.label is None:
             self.label = self.name.replace('_', ' ').title()
         self.validators = self.validators or []
+        if self.choices_model and not self.choices_label:
+            self.choices_label = self.choices_value
     
     def process_value(self, value: Any) -> Any:
         """处理字值"""
@@ -197,7 +313,9 @@ class FormField:
             'max_size': self.max_size,
             'multiple': self.multiple,
             'preview': self.preview,
-            'drag_text': self.drag_text
+            'drag_text': self.drag_text,
+            'remote_choices': self.choices_model is not None,
+            'choices_page_size': self.choices_page_size
         }
     
 @dataclass
@@ -248,22 +366,12 @@ class SearchField:
                 # 获取实际要搜索的字段名
                 related_field = self.name[len(model_name + '_'):]
                 try:
-                    # 先查询关联模型
-                    related_objects = await self.related_model.filter(
-                        **{f"{related_field}__icontains": search_value}
+                    # 关联模型的匹配条件作为子查询
+                    condition = build_related_condition(
+                        self.related_model, self.related_key,
+                        f"{related_field}__icontains", search_value
                     )
-                    if not related_objects:
-                        return {"id": None}   
-                    # 构建 OR 条件列表
-                    conditions = [
-                        Q(**{f"{self.related_key}": str(obj.id)})
-                        for obj in related_objects
-                    ] 
-                    if conditions:
-                        # 返回组合的Q对象
-                        combined_q = reduce(operator.or_, conditions)
-                        return {"_q_object": combined_q}
-                    return {"id": None}
+                    return {"_q_object": condition}
                 except Exception as e:
                     print(f"Error in related search: {str(e)}")
                     return {"id": None}
@@ -1,10 +1,10 @@
 from enum import Enum
-from typing import Optional, Dict, Any, Type
+from typing import Optional, Dict, Any, Type, Tuple
 from dataclasses import dataclass
+from datetime import date, datetime, timedelta
 from tortoise import Model
-from tortoise.expressions import Q
-import operator
-from functools import reduce
+from tortoise.exceptions import FieldError
+from tortoise.expressions import Q, Subquery
 
 class FilterType(Enum):
     """过滤器类型"""
@@ -14,6 +14,81 @@ class FilterType(Enum):
     NUMBER_RANGE = 'number_range'
     BOOLEAN = 'boolean'
 
+class InvalidFilterValue(ValueError):
+    """过滤值格式错误"""
+
+def split_range(filter_value: str) -> Tuple[str, str]:
+    """拆分 "start,end" 格式的范围值, 不含逗号时上下限相同"""
+    if ',' in filter_value:
+        start, end = filter_value.split(',', 1)
+    else:
+        start = end = filter_value
+    return start.strip(), end.strip()
+
+def build_related_condition(related_model: Type[Model], related_key: str, lookup: str, value: Any) -> Q:
+    """构建关联字段条件: related_key IN (SELECT id FROM related_model WHERE lookup)
+
+    由数据库执行子查询, 不再把匹配的关联记录加载到内存; 子查询在执行时才解析,
+    关联字段不存在时在这里抛出 FieldError, 由调用方跳过该条件
+    """
+    field_name = lookup.split('__', 1)[0]
+    if field_name not in related_model._meta.fields_map:
+        raise FieldError(f"Unknown field '{field_name}' of {related_model.__name__}")
+    subquery = Subquery(related_model.filter(**{lookup: value}).values('id'))
+    return Q(**{f"{related_key}__in": subquery})
+
+# 日期层级: 年 -> 月 -> 日
+DATE_LEVELS = ('year', 'month', 'day')
+
+# 各数据库按层级截取日期的 SQL, {column} 为带表名的列
+DATE_BUCKET_SQL = {
+    'sqlite': {
+        'year': "strftime('%Y', {column})",
+        'month': "strftime('%Y-%m', {column})",
+        'day': "strftime('%Y-%m-%d', {column})",
+    },
+    'postgres': {
+        'year': "to_char({column}, 'YYYY')",
+        'month': "to_char({column}, 'YYYY-MM')",
+        'day': "to_char({column}, 'YYYY-MM-DD')",
+    },
+}
+# 其他数据库截取日期字符串的前几位
+DATE_BUCKET_LENGTH = {'year': 4, 'month': 7, 'day': 10}
+
+def date_bucket_sql(dialect: str, level: str, column: str, utc: bool = False) -> str:
+    """按层级截取日期的 SQL 表达式, 结果格式为 2024 / 2024-05 / 2024-05-17
+
+    utc: 列为带时区的日期时间, 按 UTC 划分(PostgreSQL 的 to_char 默认使用会话时区)
+    """
+    if utc and dialect == 'postgres':
+        column = f"({column} AT TIME ZONE 'UTC')"
+    if dialect in DATE_BUCKET_SQL:
+        return DATE_BUCKET_SQL[dialect][level].format(column=column)
+    return f"SUBSTRING(CAST({column} AS CHAR(32)), 1, {DATE_BUCKET_LENGTH[level]})"
+
+def parse_date_bucket(value: str) -> Tuple[date, date, str]:
+    """解析日期层级的选中值 "2024" / "2024-05" / "2024-05-17"
+
+    Returns:
+        Tuple[date, date, str]: (开始日期, 结束日期(不含), 层级)
+    """
+    try:
+        parts = [int(part) for part in value.split('-')]
+        if len(parts) == 1:
+            start = date(parts[0], 1, 1)
+            return start, date(parts[0] + 1, 1, 1), 'year'
+        if len(parts) == 2:
+            year, month = parts
+            start = date(year, month, 1)
+            return start, date(year + month // 12, month % 12 + 1, 1), 'month'
+        if len(parts) == 3:
+            start = date(*parts)
+            return start, start + timedelta(days=1), 'day'
+    except (ValueError, OverflowError):
+        pass
+    raise InvalidFilterValue(f"无效的日期层级: {value}")
+
 @dataclass
 class FilterField:
     """过滤字段基类"""
@@ -28,13 +103,19 @@ class FilterField:
     # 添加关联字段支持，与 SearchField 保持一致
     related_model: Optional[Type[Model]] = None  # 关联的模型
     related_key: Optional[str] = None           # 外键字段名
+
+    # 下拉选项取自字段的不重复值(按记录数排序, 分页加载), 不需要手写 choices
+    distinct_values: bool = False
     
     def __post_init__(self):
         if self.label is None:
             self.label = self.name.replace('_', ' ').title()
             
-    def to_dict(self) -> dict:
-        """转换为字典，用于JSON序列化"""
+    def to_dict(self, counts: Optional[Dict[Any, int]] = None) -> dict:
+        """转换为字典，用于JSON序列化
+
+        counts: 各选项对应的记录数 {选项值: 数量}, 见 ModelAdmin.get_facet_counts
+        """
         data = {
             'name': self.name,
             'label': self.label,
@@ -42,13 +123,17 @@ class FilterField:
             'choices': self.choices,
             'placeholder': self.placeholder,
             'multiple': self.multiple,
-            'operator': self.operator
+            'operator': self.operator,
+            'distinct_values': self.distinct_values
         }
         
         if self.related_model:
             data.update({
                 'related_model': self.related_model.__name__
             })
+
+        if counts is not None:
+            data['counts'] = counts
             
         return data
 
@@ -64,25 +149,12 @@ class FilterField:
                 # 获取实际要过滤的字段名
                 related_field = self.name[len(model_name + '_'):]
                 try:
-                    # 先查询关联模型
-                    related_objects = await self.related_model.filter(
-                        **{f"{related_field}__icontains": filter_value}
+                    # 关联模型的匹配条件作为子查询
+                    condition = build_related_condition(
+                        self.related_model, self.related_key,
+                        f"{related_field}__icontains", filter_value
                     )
-                    if not related_objects:
-                        return {"id": None}
-                        
-                    # 构建 OR 条件列表
-                    conditions = [
-                        Q(**{f"{self.related_key}": str(obj.id)})
-                        for obj in related_objects
-                    ]
-                    
-                    if conditions:
-                        # 返回组合的Q对象
-                        combined_q = reduce(operator.or_, conditions)
-                        return {"_q_object": combined_q}
-                    return {"id": None}
-                    
+                    return {"_q_object": condition}
                 except Exception as e:
                     print(f"Error in related filter: {str(e)}")
                     return {"id": None}
@@ -90,6 +162,14 @@ class FilterField:
             # 直接过滤当前字段
             return {f"{self.name}__{self.operator}": filter_value}
 
+    def get_filter_value(self, params: dict) -> Optional[str]:
+        """从查询参数中获取过滤值"""
+        return params.get(self.name)
+
+    def validate(self, filter_value: str):
+        """校验过滤值, 格式错误时抛出 InvalidFilterValue"""
+        pass
+
 class InputFilter(FilterField):
     """输入框过滤器"""
     def __init__(self, name: str, label: Optional[str] = None, placeholder: Optional[str] = None,
@@ -106,10 +186,16 @@ class InputFilter(FilterField):
         )
 
 class SelectFilter(FilterField):
-    """下拉框过滤器"""
-    def __init__(self, name: str, choices: Dict[Any, str], label: Optional[str] = None,
+    """下拉框过滤器
+
+    distinct_values=True 时不需要 choices, 选项由 /distinct 接口按字段的不重复值分页提供,
+    当前模型字段和关联字段都按值精确匹配
+    """
+    def __init__(self, name: str, choices: Optional[Dict[Any, str]] = None, label: Optional[str] = None,
                  multiple: bool = False, related_model: Optional[Type[Model]] = None,
-                 related_key: Optional[str] = None):
+                 related_key: Optional[str] = None, distinct_values: bool = False):
+        if choices is None and not distinct_values:
+            raise ValueError(f"SelectFilter {name} 需要 choices 或 distinct_values=True")
         super().__init__(
             name=name,
             label=label,
@@ -117,11 +203,34 @@ class SelectFilter(FilterField):
             choices=choices,
             multiple=multiple,
             related_model=related_model,
-            related_key=related_key
+            related_key=related_key,
+            distinct_values=distinct_values
         )
 
+    async def build_filter_query(self, filter_value: str) -> dict:
+        if filter_value and self.distinct_values:
+            # 选项就是字段的实际值, 精确匹配
+            if not self.related_model:
+                return {self.name: filter_value}
+            model_name = self.related_model.__name__
+            if self.related_key and self.name.startswith(model_name + '_'):
+                related_field = self.name[len(model_name + '_'):]
+                try:
+                    condition = build_related_condition(
+                        self.related_model, self.related_key, related_field, filter_value
+                    )
+                    return {"_q_object": condition}
+                except Exception as e:
+                    print(f"Error in related filter: {str(e)}")
+                    return {"id": None}
+        return await super().build_filter_query(filter_value)
+
 class DateRangeFilter(FilterField):
-    """日期范围过滤器"""
+    """日期范围过滤器
+
+    过滤值格式为 "start,end", 任意一端可为空; 也支持过滤面板提交的
+    {name}_start / {name}_end 两个参数。只有日期的结束值包含当天全天。
+    """
     def __init__(self, name: str, label: Optional[str] = None):
         super().__init__(
             name=name,
@@ -129,8 +238,64 @@ class DateRangeFilter(FilterField):
             filter_type=FilterType.DATE_RANGE
         )
 
+    def get_filter_value(self, params: dict) -> Optional[str]:
+        if params.get(self.name):
+            return params[self.name]
+        start = params.get(f"{self.name}_start", '')
+        end = params.get(f"{self.name}_end", '')
+        if start or end:
+            return f"{start},{end}"
+        return None
+
+    @staticmethod
+    def _parse_bound(value: str):
+        """解析为 date 或 datetime, 返回 (值, 是否只有日期)"""
+        try:
+            if len(value) == 10:
+                return date.fromisoformat(value), True
+            return datetime.fromisoformat(value), False
+        except ValueError:
+            raise InvalidFilterValue(f"无效的日期: {value}")
+
+    def parse_range(self, filter_value: str) -> dict:
+        """将范围值解析为 __gte/__lt/__lte 条件"""
+        start, end = split_range(filter_value)
+        query = {}
+        start_value = end_value = None
+        if start:
+            start_value, _ = self._parse_bound(start)
+            query[f"{self.name}__gte"] = start_value
+        if end:
+            end_value, date_only = self._parse_bound(end)
+            if date_only:
+                # 只有日期时包含结束日期当天
+                query[f"{self.name}__lt"] = end_value + timedelta(days=1)
+            else:
+                query[f"{self.name}__lte"] = end_value
+        if start_value is not None and end_value is not None:
+            as_datetime = lambda v: v if isinstance(v, datetime) else datetime.combine(v, datetime.min.time())
+            try:
+                reversed_range = as_datetime(start_value) > as_datetime(end_value)
+            except TypeError:
+                reversed_range = False  # 带时区与不带时区的值无法比较, 交给数据库处理
+            if reversed_range:
+                raise InvalidFilterValue(f"开始日期不能晚于结束日期: {filter_value}")
+        return query
+
+    def validate(self, filter_value: str):
+        self.parse_range(filter_value)
+
+    async def build_filter_query(self, filter_value: str) -> dict:
+        if not filter_value:
+            return {}
+        return self.parse_range(filter_value)
+
 class NumberRangeFilter(FilterField):
-    """数字范围过滤器"""
+    """数字范围过滤器
+
+    过滤值格式为 "min,max", 任意一端可为空; 也支持过滤面板提交的
+    {name}_min / {name}_max 两个参数
+    """
     def __init__(self, name: str, label: Optional[str] = None):
         super().__init__(
             name=name,
@@ -138,6 +303,46 @@ class NumberRangeFilter(FilterField):
             filter_type=FilterType.NUMBER_RANGE
         )
 
+    def get_filter_value(self, params: dict) -> Optional[str]:
+        if params.get(self.name):
+            return params[self.name]
+        low = params.get(f"{self.name}_min", '')
+        high = params.get(f"{self.name}_max", '')
+        if low or high:
+            return f"{low},{high}"
+        return None
+
+    @staticmethod
+    def _parse_bound(value: str):
+        try:
+            return int(value)
+        except ValueError:
+            pass
+        try:
+            return float(value)
+        except ValueError:
+            raise InvalidFilterValue(f"无效的数字: {value}")
+
+    def parse_range(self, filter_value: str) -> dict:
+        """将范围值解析为 __gte/__lte 条件"""
+        low, high = split_range(filter_value)
+        query = {}
+        if low:
+            query[f"{self.name}__gte"] = self._parse_bound(low)
+        if high:
+            query[f"{self.name}__lte"] = self._parse_bound(high)
+        if low and high and query[f"{self.name}__gte"] > query[f"{self.name}__lte"]:
+            raise InvalidFilterValue(f"最小值不能大于最大值: {filter_value}")
+        return query
+
+    def validate(self, filter_value: str):
+        self.parse_range(filter_value)
+
+    async def build_filter_query(self, filter_value: str) -> dict:
+        if not filter_value:
+            return {}
+        return self.parse_range(filter_value)
+
 class BooleanFilter(FilterField):
     """布尔过滤器"""
     def __init__(self, name: str, label: Optional[str] = None):
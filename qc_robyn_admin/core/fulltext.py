@@ -0,0 +1,160 @@
+from typing import List, Optional, Tuple, Type
+from tortoise import Model, fields
+from tortoise.expressions import Expression, ResolveResult
+from pypika_tortoise import Table
+from pypika_tortoise.functions import Coalesce
+from pypika_tortoise.terms import LiteralValue, Term, ValueWrapper
+import argparse
+import sqlite3
+
+
+def quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def quote_literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+class JoinedTerm(Expression):
+    """引用 JOIN 表中列的注解表达式
+
+    多个注解使用同一个 join 对象时, 查询中只 JOIN 一次
+    """
+
+    def __init__(self, join: tuple, term: Term):
+        self.join = join  # (表或派生表, ON 条件)
+        self.term = term
+
+    def resolve(self, resolve_context) -> ResolveResult:
+        return ResolveResult(term=self.term, joins=[self.join])
+
+
+class SQLiteFullTextIndex:
+    """search_fields 的 SQLite FTS5 全文索引
+
+    影子表 {表名}_fts 使用外部内容模式(content=原表), 只保存索引不重复保存数据;
+    原表的插入、更新、删除由触发器同步, 批量更新/删除同样生效。
+
+    tokenizer: trigram(默认, 支持任意位置的子串匹配, 关键字至少 3 个字符)
+    或 unicode61(按词匹配, 关键字作为前缀)
+    """
+
+    def __init__(self, model: Type[Model], columns: List[str], tokenizer: str = 'trigram'):
+        self.model = model
+        self.columns = columns  # 模型字段名
+        self.tokenizer = tokenizer
+        meta = model._meta
+        self.table = meta.db_table
+        self.fts_table = f"{self.table}_fts"
+        self.pk_column = meta.fields_map[meta.pk_attr].source_field or meta.pk_attr
+        self.db_columns = [meta.fields_map[name].source_field or name for name in columns]
+
+    @staticmethod
+    def supports(model: Type[Model]) -> bool:
+        """SQLite 数据库且主键为整数时才能建立 FTS5 外部内容索引"""
+        meta = model._meta
+        pk_field = meta.fields_map.get(meta.pk_attr)
+        return (
+            meta.db.capabilities.dialect == 'sqlite'
+            and isinstance(pk_field, (fields.IntField, fields.BigIntField, fields.SmallIntField))
+        )
+
+    @property
+    def _db(self):
+        return self.model._meta.db
+
+    def _create_sql(self) -> str:
+        fts = quote_identifier(self.fts_table)
+        columns = ', '.join(quote_identifier(column) for column in self.db_columns)
+        new_values = ', '.join(f"new.{quote_identifier(column)}" for column in self.db_columns)
+        old_values = ', '.join(f"old.{quote_identifier(column)}" for column in self.db_columns)
+        pk = quote_identifier(self.pk_column)
+        table = quote_identifier(self.table)
+        trigger = lambda suffix: quote_identifier(f"{self.fts_table}_{suffix}")
+        return f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+            {columns}, content={quote_literal(self.table)}, content_rowid={quote_literal(self.pk_column)},
+            tokenize={quote_literal(self.tokenizer)}
+        );
+        CREATE TRIGGER IF NOT EXISTS {trigger('ai')} AFTER INSERT ON {table} BEGIN
+            INSERT INTO {fts}(rowid, {columns}) VALUES (new.{pk}, {new_values});
+        END;
+        CREATE TRIGGER IF NOT EXISTS {trigger('ad')} AFTER DELETE ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.{pk}, {old_values});
+        END;
+        CREATE TRIGGER IF NOT EXISTS {trigger('au')} AFTER UPDATE ON {table} BEGIN
+            INSERT INTO {fts}({fts}, rowid, {columns}) VALUES ('delete', old.{pk}, {old_values});
+            INSERT INTO {fts}(rowid, {columns}) VALUES (new.{pk}, {new_values});
+        END;
+        """
+
+    async def exists(self) -> bool:
+        _, rows = await self._db.execute_query(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name = ?", [self.fts_table]
+        )
+        return bool(rows)
+
+    async def ensure(self) -> bool:
+        """创建影子表和触发器, 新建时为已有数据建立索引; 返回是否新建"""
+        created = not await self.exists()
+        await self._db.execute_script(self._create_sql())
+        if created:
+            await self.rebuild()
+        return created
+
+    async def rebuild(self):
+        """按原表数据重建索引"""
+        fts = quote_identifier(self.fts_table)
+        await self._db.execute_script(f"INSERT INTO {fts}({fts}) VALUES ('rebuild');")
+
+    def can_search(self, search: str) -> bool:
+        """trigram 分词至少需要 3 个字符, 更短的关键字使用普通查询"""
+        return len(search.strip()) >= 3 if self.tokenizer == 'trigram' else bool(search.strip())
+
+    def _match_literal(self, search: str) -> str:
+        # 关键字作为一个短语, 避免被解析为 FTS5 查询语法
+        query = '"' + search.strip().replace('\x00', '').replace('"', '""') + '"'
+        if self.tokenizer != 'trigram':
+            query += '*'
+        return quote_literal(query)
+
+    def search_terms(self, search: str) -> Tuple[JoinedTerm, JoinedTerm]:
+        """匹配关键字的 (匹配标记, 相关度) 注解表达式
+
+        FTS5 的匹配结果作为派生表 LEFT JOIN 原表一次, 未匹配的行匹配标记为 NULL;
+        相关度为 bm25(越小越相关), 未匹配的行为 0, 排在匹配的行之后
+        """
+        fts = quote_identifier(self.fts_table)
+        matched = self.model._meta.db.query_class.from_(Table(self.fts_table)).select(
+            LiteralValue('rowid').as_('rowid'), LiteralValue('rank').as_('rank')
+        ).where(LiteralValue(f"{fts} MATCH {self._match_literal(search)}")).as_('search_fts')
+        join = (matched, matched.rowid == self.model._meta.basetable[self.pk_column])
+        return JoinedTerm(join, matched.rowid), JoinedTerm(join, Coalesce(matched.rank, ValueWrapper(0)))
+
+def rebuild_database(db_path: str, tables: Optional[List[str]] = None) -> List[str]:
+    """重建 SQLite 数据库中的 FTS5 索引, 未指定表名时重建所有 *_fts 表"""
+    conn = sqlite3.connect(db_path)
+    try:
+        if not tables:
+            rows = conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' "
+                "AND name LIKE '%\\_fts' ESCAPE '\\' AND sql LIKE '%fts5%'"
+            ).fetchall()
+            tables = [row[0] for row in rows]
+        for table in tables:
+            fts = quote_identifier(table)
+            conn.execute(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')")
+        conn.commit()
+    finally:
+        conn.close()
+    return tables
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="重建 QC Robyn Admin 的 SQLite 全文索引")
+    parser.add_argument('db_path', help="SQLite 数据库文件路径")
+    parser.add_argument('tables', nargs='*', help="FTS5 表名, 默认所有 *_fts 表")
+    args = parser.parse_args()
+    for table in rebuild_database(args.db_path.replace('sqlite://', ''), args.tables):
+        print(f"Rebuilt {table}")
@@ -0,0 +1,250 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Tuple, Type
+from tortoise import Model, fields
+import hashlib
+
+
+# 估算影响时使用的记录数阈值
+HIGH_IMPACT_ROWS = 100000
+MEDIUM_IMPACT_ROWS = 10000
+
+
+def index_column(model: Type[Model], name: str) -> Optional[str]:
+    """字段名对应的数据库列名, 外键字段使用外键列; 不是当前表的列时返回 None"""
+    meta = model._meta
+    field_object = meta.fields_map.get(name)
+    if field_object is None:
+        return None
+    if name in meta.fk_fields or name in meta.o2o_fields:
+        name = field_object.source_field
+    return meta.fields_db_projection.get(name)
+
+
+def _quote(model: Type[Model], name: str) -> str:
+    quote_char = model._meta.db.query_class.SQL_CONTEXT.quote_char or '"'
+    return quote_char + name.replace(quote_char, quote_char * 2) + quote_char
+
+
+def _literal(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+@dataclass
+class IndexSuggestion:
+    """建议在 model 的表上建立的索引, columns 为数据库列名(按索引顺序)"""
+    model: Type[Model]
+    columns: Tuple[str, ...]
+    reasons: List[str] = field(default_factory=list)
+    rows: Optional[int] = None  # 表的估算记录数
+
+    @property
+    def table(self) -> str:
+        return self.model._meta.db_table
+
+    @property
+    def dialect(self) -> str:
+        return self.model._meta.db.capabilities.dialect
+
+    @property
+    def name(self) -> str:
+        # 索引名长度 PostgreSQL 限制 63, MySQL 限制 64
+        name = f"idx_{self.table}_{'_'.join(self.columns)}".replace('.', '_')
+        if len(name) > 60:
+            digest = hashlib.blake2b(name.encode('utf-8'), digest_size=4).hexdigest()
+            name = f"{name[:51]}_{digest}"
+        return name
+
+    @property
+    def impact(self) -> str:
+        """按表的记录数估算缺少索引的影响: 每次查询都要扫描全表"""
+        if self.rows is None:
+            return 'unknown'
+        if self.rows >= HIGH_IMPACT_ROWS:
+            return 'high'
+        if self.rows >= MEDIUM_IMPACT_ROWS:
+            return 'medium'
+        return 'low'
+
+    def create_sql(self) -> str:
+        columns = ', '.join(_quote(self.model, column) for column in self.columns)
+        # MySQL 不支持 IF NOT EXISTS, 创建前已确认索引不存在
+        if_not_exists = '' if self.dialect == 'mysql' else 'IF NOT EXISTS '
+        return (
+            f"CREATE INDEX {if_not_exists}{_quote(self.model, self.name)} "
+            f"ON {_quote(self.model, self.table)} ({columns})"
+        )
+
+    def covers(self, other: 'IndexSuggestion') -> bool:
+        """当前索引的前缀列与 other 相同, other 不需要单独建立"""
+        return self.model is other.model and self.columns[:len(other.columns)] == other.columns
+
+    def to_dict(self) -> dict:
+        return {
+            'table': self.table,
+            'columns': list(self.columns),
+            'name': self.name,
+            'reasons': self.reasons,
+            'rows': self.rows,
+            'impact': self.impact,
+            'sql': self.create_sql(),
+        }
+
+
+def merge_suggestions(suggestions: List[IndexSuggestion]) -> List[IndexSuggestion]:
+    """合并相同的索引, 去掉被其他组合索引前缀覆盖的索引"""
+    merged: Dict[tuple, IndexSuggestion] = {}
+    for suggestion in suggestions:
+        key = (suggestion.model, suggestion.columns)
+        if key in merged:
+            merged[key].reasons.extend(r for r in suggestion.reasons if r not in merged[key].reasons)
+        else:
+            merged[key] = IndexSuggestion(suggestion.model, suggestion.columns, list(suggestion.reasons))
+    result = []
+    for suggestion in merged.values():
+        # 并入覆盖它的最宽的索引
+        wider = max((
+            other for other in merged.values()
+            if len(other.columns) > len(suggestion.columns) and other.covers(suggestion)
+        ), key=lambda other: len(other.columns), default=None)
+        if wider:
+            wider.reasons.extend(r for r in suggestion.reasons if r not in wider.reasons)
+        else:
+            result.append(suggestion)
+    return result
+
+
+async def get_existing_indexes(model: Type[Model]) -> Optional[List[Tuple[str, ...]]]:
+    """读取表上已有索引的列(按索引顺序), 表达式列为 None; 不支持的数据库返回 None"""
+    meta = model._meta
+    db = meta.db
+    dialect = db.capabilities.dialect
+    table = meta.db_table
+    indexes: Dict[str, Dict[int, Optional[str]]] = {}
+    if dialect == 'sqlite':
+        _, rows = await db.execute_query(f"PRAGMA index_list({_quote(model, table)})")
+        for row in rows:
+            _, columns = await db.execute_query(f"PRAGMA index_info({_quote(model, row['name'])})")
+            indexes[row['name']] = {column['seqno']: column['name'] for column in columns}
+    elif dialect == 'postgres':
+        _, rows = await db.execute_query(
+            "SELECT i.relname AS index_name, k.ord, a.attname AS column_name "
+            "FROM pg_index x "
+            "JOIN pg_class t ON t.oid = x.indrelid "
+            "JOIN pg_class i ON i.oid = x.indexrelid "
+            "CROSS JOIN LATERAL unnest(x.indkey) WITH ORDINALITY AS k(attnum, ord) "
+            "LEFT JOIN pg_attribute a ON a.attrelid = t.oid AND a.attnum = k.attnum "
+            f"WHERE t.relname = {_literal(table)} AND pg_table_is_visible(t.oid)"
+        )
+        for row in rows:
+            indexes.setdefault(row['index_name'], {})[row['ord']] = row['column_name']
+    elif dialect == 'mysql':
+        _, rows = await db.execute_query(f"SHOW INDEX FROM {_quote(model, table)}")
+        for row in rows:
+            indexes.setdefault(row['Key_name'], {})[row['Seq_in_index']] = row['Column_name']
+    else:
+        return None
+    return [tuple(columns[seq] for seq in sorted(columns)) for columns in indexes.values()]
+
+
+async def estimate_rows(model: Type[Model]) -> Optional[int]:
+    """表的估算记录数, PostgreSQL/MySQL 使用统计信息, 其他数据库使用 COUNT"""
+    meta = model._meta
+    db = meta.db
+    dialect = db.capabilities.dialect
+    try:
+        if dialect == 'postgres':
+            _, rows = await db.execute_query(
+                "SELECT reltuples::bigint AS estimate FROM pg_class "
+                f"WHERE relname = {_literal(meta.db_table)} AND pg_table_is_visible(oid)"
+            )
+            if rows and rows[0]['estimate'] >= 0:
+                return rows[0]['estimate']
+        elif dialect == 'mysql':
+            _, rows = await db.execute_query(
+                "SELECT TABLE_ROWS AS estimate FROM information_schema.TABLES "
+                f"WHERE TABLE_SCHEMA = DATABASE() AND TABLE_NAME = {_literal(meta.db_table)}"
+            )
+            if rows and rows[0]['estimate'] is not None:
+                return int(rows[0]['estimate'])
+        return await model.all().count()
+    except Exception as e:
+        print(f"Error estimating rows of {meta.db_table}: {str(e)}")
+        return None
+
+
+def _pk_is_implicit(model: Type[Model]) -> bool:
+    """二级索引是否隐含主键列: MySQL InnoDB, 以及整数主键(rowid)的 SQLite 表"""
+    meta = model._meta
+    dialect = meta.db.capabilities.dialect
+    if dialect == 'mysql':
+        return True
+    return dialect == 'sqlite' and isinstance(
+        meta.fields_map.get(meta.pk_attr), (fields.IntField, fields.BigIntField, fields.SmallIntField)
+    )
+
+
+def strip_implicit_pk(suggestion: IndexSuggestion) -> IndexSuggestion:
+    """二级索引已隐含主键时, 去掉组合索引末尾的主键列"""
+    model = suggestion.model
+    columns = suggestion.columns
+    if len(columns) > 1 and columns[-1] == index_column(model, model._meta.pk_attr) and _pk_is_implicit(model):
+        return IndexSuggestion(model, columns[:-1], list(suggestion.reasons))
+    return suggestion
+
+
+def is_covered(suggestion: IndexSuggestion, existing: List[Tuple[str, ...]]) -> bool:
+    """已有索引的前缀列与建议的索引相同"""
+    columns = suggestion.columns
+    return any(index[:len(columns)] == columns for index in existing)
+
+
+async def find_missing_indexes(suggestions: List[IndexSuggestion]) -> List[IndexSuggestion]:
+    """检查数据库中已有的索引, 返回缺少的索引, 按表的记录数从多到少排列"""
+    missing = []
+    existing_cache: Dict[type, Optional[List[Tuple[str, ...]]]] = {}
+    rows_cache: Dict[type, Optional[int]] = {}
+    for suggestion in merge_suggestions([strip_implicit_pk(s) for s in suggestions]):
+        model = suggestion.model
+        try:
+            if model not in existing_cache:
+                existing_cache[model] = await get_existing_indexes(model)
+                if existing_cache[model] is None:
+                    print(f"Index advisor does not support {model._meta.db.capabilities.dialect}, skipped: {model.__name__}")
+            existing = existing_cache[model]
+            if existing is None or is_covered(suggestion, existing):
+                continue
+            if model not in rows_cache:
+                rows_cache[model] = await estimate_rows(model)
+            suggestion.rows = rows_cache[model]
+            missing.append(suggestion)
+        except Exception as e:
+            print(f"Error checking indexes of {model.__name__}: {str(e)}")
+    missing.sort(key=lambda s: s.rows or 0, reverse=True)
+    return missing
+
+
+async def create_indexes(suggestions: List[IndexSuggestion]) -> List[IndexSuggestion]:
+    """创建建议的索引, 返回创建成功的索引"""
+    created = []
+    for suggestion in suggestions:
+        try:
+            await suggestion.model._meta.db.execute_script(suggestion.create_sql())
+            created.append(suggestion)
+        except Exception as e:
+            print(f"Error creating index {suggestion.name}: {str(e)}")
+    return created
+
+
+def format_report(suggestions: List[IndexSuggestion]) -> str:
+    """缺少索引的文本报告"""
+    if not suggestions:
+        return "Index advisor: no missing indexes"
+    lines = [f"Index advisor: {len(suggestions)} missing index(es)"]
+    for suggestion in suggestions:
+        rows = '?' if suggestion.rows is None else suggestion.rows
+        lines.append(
+            f"  [{suggestion.impact}] {suggestion.table}({', '.join(suggestion.columns)}) "
+            f"~{rows} rows - {'; '.join(suggestion.reasons)}"
+        )
+        lines.append(f"    {suggestion.create_sql()};")
+    return '\n'.join(lines)
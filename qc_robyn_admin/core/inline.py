@@ -1,7 +1,15 @@
-from typing import Type, List, Optional
-from tortoise import Model
-from .fields import TableField, FormField
+from typing import Type, List, Optional, Dict, Any
+from tortoise import Model, fields
+from .fields import (
+    TableField, FormField, load_related_values, get_list_columns, get_related_path, get_sort_field
+)
+from .serializer import RowSerializer, serialize_with_display, to_compact, to_wire_value
+from .pagination import encode_cursor, decode_cursor, keyset_condition, nulls_sort_first
+from tortoise.expressions import Q, RawSQL
+from tortoise.functions import Count
 import asyncio
+import operator
+from functools import reduce
 from dataclasses import dataclass
 
 class InlineModelAdmin:
@@ -19,6 +27,10 @@ class InlineModelAdmin:
     
     # 默认排序字段列表
     default_ordering: List[str] = None  # 如 ['-created_at', 'name']
+
+    # 分页
+    per_page: int = 50         # 每页条数
+    max_per_page: int = 500    # 单页最大条数
     
     def __init__(self, parent_model: Type[Model]):
         if not self.model:
@@ -37,6 +49,7 @@ class InlineModelAdmin:
         if self.default_ordering is None:
             self.default_ordering = []
         self.is_inline = True  # 设置为内联模型
+        self._serializer: Optional[RowSerializer] = None  # 预编译的行序列化器
 
     async def get_queryset(self, parent_instance):
         """获取关联的查询集"""
@@ -48,6 +61,11 @@ class InlineModelAdmin:
         
         # 获取基础查询集
         queryset = self.model.filter(**filter_kwargs)
+
+        # 只查询需要显示的列
+        columns = self.get_list_columns()
+        if columns is not None:
+            queryset = queryset.only(*columns)
         
         # 应用默认排序
         if self.default_ordering:
@@ -55,6 +73,220 @@ class InlineModelAdmin:
             
         return queryset
         
+    def _overrides(self, method_name: str) -> bool:
+        """子类是否重写了指定方法"""
+        return getattr(type(self), method_name) is not getattr(InlineModelAdmin, method_name)
+
+    def get_list_columns(self) -> Optional[List[str]]:
+        """
+        内联列表需要读取的数据库列, 无法确定时(重写了 serialize_object
+        或表格字段不是数据库列)返回 None 表示查询全部列
+        """
+        if self._overrides('serialize_object'):
+            return None
+        columns = get_list_columns(self.model, self.table_fields)
+        if columns is None:
+            return None
+        # 游标分页需要读取排序列
+        db_fields = self.model._meta.db_fields
+        columns.extend(
+            name.lstrip('-') for name in self.default_ordering or [] if name.lstrip('-') in db_fields
+        )
+        return list(dict.fromkeys(columns))
+
+    def get_page_ordering(self, sort_field: str = '', sort_order: str = 'asc') -> Optional[tuple]:
+        """
+        游标分页使用的 (排序列, 是否降序), 未指定排序时使用 default_ordering 的第一项或主键;
+        排序字段不是当前模型的列(如关联字段)时返回 None, 改用 offset 分页
+        """
+        pk_attr = self.model._meta.pk_attr
+        column = self.get_sort_field(sort_field) if sort_field else None
+        desc = sort_order == 'desc'
+        if column is None:
+            if not self.default_ordering:
+                return pk_attr, False
+            column = self.default_ordering[0].lstrip('-')
+            desc = self.default_ordering[0].startswith('-')
+        if column == pk_attr or column in self.model._meta.db_fields:
+            return column, desc
+        return None
+
+    def get_search_query(self, search: str) -> Optional[Q]:
+        """
+        内联表格的搜索条件: 各表格字段(文本列或可 JOIN 的关联字段)包含关键字(不区分大小写)
+        任意一个即匹配; 没有可搜索的字段时返回 None
+        """
+        meta = self.model._meta
+        paths = []
+        for field in self.table_fields:
+            if field.related_model and field.related_key:
+                path = get_related_path(self.model, field, self.get_related_field_name(field))
+                if path:
+                    paths.append(path)
+            elif field.name in meta.db_fields and isinstance(
+                meta.fields_map[field.name], (fields.CharField, fields.TextField)
+            ):
+                paths.append(field.name)
+        if not paths:
+            return None
+        return reduce(operator.or_, [Q(**{f"{path}__icontains": search}) for path in paths])
+
+    def clamp_limit(self, limit: Optional[int]) -> int:
+        return max(1, min(limit or self.per_page, self.max_per_page))
+
+    async def get_page(self, parent_instance, sort_field: str = '', sort_order: str = 'asc',
+                       limit: Optional[int] = None, cursor: str = '', offset: int = 0,
+                       search: str = '') -> dict:
+        """
+        获取一页子记录
+
+        按排序列 + 主键的游标分页, 关联字段排序时按 offset 分页; search 为搜索关键字(见 get_search_query)
+
+        Returns:
+            dict: {"objects", "total", "next_cursor", "next_offset"}, 没有下一页时
+            next_cursor / next_offset 为 None
+
+        Raises:
+            InvalidCursor: 游标格式错误
+        """
+        limit = self.clamp_limit(limit)
+        pk_attr = self.model._meta.pk_attr
+        queryset = await self.get_queryset(parent_instance)
+        if search:
+            condition = self.get_search_query(search)
+            if condition is not None:
+                queryset = queryset.filter(condition)
+        total = await queryset.count()
+
+        ordering = self.get_page_ordering(sort_field, sort_order)
+        state = decode_cursor(cursor) if ordering else None
+        if ordering:
+            column, desc = ordering
+            order = 'desc' if desc else 'asc'
+            # 排序方式改变后旧游标失效
+            if state and (state['sort'] != column or state['order'] != order):
+                state = None
+            if state:
+                queryset = queryset.filter(keyset_condition(
+                    column, pk_attr, state['value'], state['pk'], 'lt' if desc else 'gt',
+                    nulls_sort_first(self.model)
+                ))
+            prefix = '-' if desc else ''
+            queryset = queryset.order_by(*dict.fromkeys([f"{prefix}{column}", f"{prefix}{pk_attr}"]))
+        elif sort_field:
+            queryset = queryset.order_by(
+                f"{'-' if sort_order == 'desc' else ''}{self.get_sort_field(sort_field)}"
+            )
+        if not state and offset:
+            queryset = queryset.offset(offset)
+
+        # 多取一条判断是否还有下一页
+        objects = list(await queryset.limit(limit + 1))
+        has_more = len(objects) > limit
+        objects = objects[:limit]
+        next_cursor = next_offset = None
+        if has_more:
+            next_offset = offset + len(objects) if not state else None
+            if ordering:
+                last = objects[-1]
+                next_cursor = encode_cursor(column, order, getattr(last, column), getattr(last, pk_attr))
+        return {"objects": objects, "total": total, "next_cursor": next_cursor, "next_offset": next_offset}
+
+    async def count_children(self, parent_ids: List[Any]) -> Dict[Any, int]:
+        """
+        多个父记录各自的子记录数, 一次 GROUP BY 外键的查询, 没有子记录的父记录不出现在结果中;
+        重写了 get_queryset 时按各父记录的查询集逐个统计
+        """
+        if not parent_ids:
+            return {}
+        if self._overrides('get_queryset'):
+            parent_pk = self.parent_model._meta.pk_attr
+            counts = {}
+            for parent_instance in await self.parent_model.filter(**{f"{parent_pk}__in": parent_ids}):
+                counts[parent_instance.pk] = await (await self.get_queryset(parent_instance)).count()
+            return counts
+        fk_column = f"{self.fk_field}_id"
+        return dict(await self.model.filter(**{f"{fk_column}__in": parent_ids}).annotate(
+            inline_total=Count(self.model._meta.pk_attr)
+        ).group_by(fk_column).values_list(fk_column, 'inline_total'))
+
+    async def get_first_pages(self, parent_ids: List[Any], limit: Optional[int] = None) -> Dict[str, dict]:
+        """
+        批量获取多个父记录各自的第一页子记录
+
+        一次 fk_field__in 查询, 由窗口函数 ROW_NUMBER() 按父记录截取每页条数, 另一次
+        GROUP BY 查询统计总数; 重写了 get_queryset、排序不是当前模型的列或数据库不支持
+        窗口函数时, 逐个父记录查询
+
+        Returns:
+            Dict[str, dict]: {父记录ID: get_page 的返回值}
+        """
+        limit = self.clamp_limit(limit)
+        ordering = self.get_page_ordering()
+        if not self._overrides('get_queryset') and ordering:
+            try:
+                return await self._get_first_pages_windowed(parent_ids, limit, ordering)
+            except Exception as e:
+                print(f"Batch inline query failed, loading parents one by one: {str(e)}")
+
+        pages = {}
+        parent_pk = self.parent_model._meta.pk_attr
+        for parent_id in parent_ids:
+            parent_instance = await self.parent_model.get_or_none(**{parent_pk: parent_id})
+            if parent_instance:
+                pages[str(parent_id)] = await self.get_page(parent_instance, limit=limit)
+        return pages
+
+    async def _get_first_pages_windowed(self, parent_ids: List[Any], limit: int, ordering: tuple) -> Dict[str, dict]:
+        meta = self.model._meta
+        pk_attr = meta.pk_attr
+        fk_column = f"{self.fk_field}_id"
+        column, desc = ordering
+        quote_char = meta.db.query_class.SQL_CONTEXT.quote_char or '"'
+        quote = lambda name: f"{quote_char}{meta.fields_map[name].source_field or name}{quote_char}"
+        direction = 'DESC' if desc else 'ASC'
+        order_sql = ', '.join(
+            dict.fromkeys([f"{quote(column)} {direction}", f"{quote(pk_attr)} {direction}"])
+        )
+
+        base = self.model.filter(**{f"{fk_column}__in": parent_ids})
+        totals = await self.count_children(parent_ids)
+
+        # 每个父记录按排序取前 limit + 1 条, 多出的一条用于判断是否还有下一页
+        ranked = base.annotate(
+            inline_row=RawSQL(f"ROW_NUMBER() OVER (PARTITION BY {quote(fk_column)} ORDER BY {order_sql})")
+        ).values(pk_attr, 'inline_row').sql(params_inline=True)
+        queryset = self.model.filter(**{f"{pk_attr}__in": RawSQL(
+            f"(SELECT {quote(pk_attr)} FROM ({ranked}) inline_ranked WHERE inline_row <= {limit + 1})"
+        )})
+        columns = self.get_list_columns()
+        if columns is not None:
+            queryset = queryset.only(*columns, fk_column)
+        prefix = '-' if desc else ''
+        objects = await queryset.order_by(*dict.fromkeys([f"{prefix}{column}", f"{prefix}{pk_attr}"]))
+
+        grouped: Dict[Any, list] = {}
+        for obj in objects:
+            grouped.setdefault(getattr(obj, fk_column), []).append(obj)
+        order = 'desc' if desc else 'asc'
+        pages = {}
+        for parent_id, total in totals.items():
+            rows = grouped.get(parent_id, [])
+            has_more = len(rows) > limit
+            rows = rows[:limit]
+            last = rows[-1] if rows else None
+            pages[str(parent_id)] = {
+                "objects": rows,
+                "total": total,
+                "next_cursor": encode_cursor(column, order, getattr(last, column), getattr(last, pk_attr))
+                if has_more else None,
+                "next_offset": len(rows) if has_more else None,
+            }
+        # 没有子记录的父记录
+        for parent_id in parent_ids:
+            pages.setdefault(str(parent_id), {"objects": [], "total": 0, "next_cursor": None, "next_offset": None})
+        return pages
+
     def get_formset(self):
         """获取表单集配置"""
         # 从table_fields中获取可排序字段
@@ -77,6 +309,76 @@ class InlineModelAdmin:
             'ordering_fields': ordering_fields  # 使用从table_fields获取的可排序字段
         }
         
+    def get_related_field_name(self, field: TableField) -> str:
+        """获取字段名最后一部分作为关联字段名"""
+        return field.name.split('_')[-1]
+
+    def get_sort_field(self, name: str) -> Optional[str]:
+        """将可排序的表格字段名转换为排序用的 ORM 字段, 关联字段通过 JOIN 排序"""
+        field = next((f for f in self.table_fields if f.name == name and f.sortable), None)
+        if not field:
+            return None
+        return get_sort_field(self.model, field, name, self.get_related_field_name)
+
+    def compile_serializer(self) -> Optional[RowSerializer]:
+        """预编译行序列化器, 子类重写了 serialize_object 时返回 None"""
+        if self._overrides('serialize_object'):
+            self._serializer = None
+        else:
+            self._serializer = RowSerializer(self.table_fields, self.get_related_field_name, inline=True)
+        return self._serializer
+
+    async def serialize_objects(self, objects: List[Model], for_display: bool = True) -> List[dict]:
+        """批量序列化, 关联字段按页批量查询"""
+        serializer = self._serializer or self.compile_serializer()
+        if serializer is not None:
+            related_values = await load_related_values(objects, self.table_fields, self.get_related_field_name)
+            return await serializer.serialize_many(objects, related_values, for_display)
+
+        data = []
+        for obj in objects:
+            try:
+                data.append(await self.serialize_object(obj, for_display=for_display))
+            except Exception as e:
+                print(f"Error serializing object: {str(e)}")
+                continue
+        return data
+
+    async def serialize_compact(self, objects: List[Model]) -> dict:
+        """以紧凑的列式格式序列化, 只有设置了格式化函数的非关联列额外输出显示值; 每行只序列化一次"""
+        columns = list(dict.fromkeys(['id'] + [field.name for field in self.table_fields]))
+        display_fields = [
+            field for field in self.table_fields
+            if field.formatter and not (field.related_model and field.related_key)
+        ]
+        display_columns = [field.name for field in display_fields]
+        display_serializer = (
+            RowSerializer(display_fields, self.get_related_field_name, inline=True) if display_fields else None
+        )
+
+        serializer = self._serializer or self.compile_serializer()
+        if serializer is not None:
+            related_values = await load_related_values(objects, self.table_fields, self.get_related_field_name)
+            rows, display_rows = await serialize_with_display(
+                objects, serializer, display_serializer, related_values
+            )
+            return to_compact(columns, rows, display_columns, display_rows)
+
+        rows, display_rows = [], []
+        for obj in objects:
+            try:
+                row = await self.serialize_object(obj, for_display=False)
+                display_row = (
+                    await display_serializer.serialize_one(obj, {}, for_display=True)
+                    if display_serializer else {}
+                )
+            except Exception as e:
+                print(f"Error serializing object: {str(e)}")
+                continue
+            rows.append(row)
+            display_rows.append(display_row)
+        return to_compact(columns, rows, display_columns, display_rows)
+
     async def serialize_object(self, obj: Model, for_display: bool = True) -> dict:
         """序列化对象"""
         result = {'id': str(getattr(obj, 'id', ''))}
@@ -91,9 +393,9 @@ class InlineModelAdmin:
                             related_obj = await field.related_model.get(id=fk_value)
                             if related_obj:
                                 # 获取关联字段的值
-                                related_field = field.name.split('_')[-1]  # 获取最后一部分作为字段名
+                                related_field = self.get_related_field_name(field)  # 获取最后一部分作为字段名
                                 related_value = getattr(related_obj, related_field)
-                                result[field.name] = str(related_value) if related_value is not None else ''
+                                result[field.name] = to_wire_value(related_value)
                                 continue
                         except Exception as e:
                             print(f"Error getting related object: {str(e)}")
@@ -111,7 +413,7 @@ class InlineModelAdmin:
                             print(f"Error formatting field {field.name}: {str(e)}")
                             result[field.name] = str(value) if value is not None else ''
                     else:
-                        result[field.name] = str(value) if value is not None else ''
+                        result[field.name] = to_wire_value(value)
             except Exception as e:
                 print(f"Error processing field {field.name}: {str(e)}")
                 result[field.name] = ''
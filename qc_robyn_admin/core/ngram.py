@@ -0,0 +1,87 @@
+from typing import Any, Dict, Hashable, Iterable, Set, Tuple
+import sys
+
+
+def trigrams(text: str) -> Set[str]:
+    """文本的三元组集合, 不足 3 个字符时为空"""
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class TrigramIndex:
+    """进程内的三元组倒排索引, 用于子串搜索(不区分大小写)
+
+    每条记录保存各列的小写文本和三元组到主键的倒排表; 查询时取关键字各三元组
+    倒排表的交集, 再用原文校验, 结果与 icontains 相同
+    """
+
+    def __init__(self):
+        self._docs: Dict[Hashable, Tuple[str, ...]] = {}
+        self._postings: Dict[str, Set[Hashable]] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    @staticmethod
+    def _normalize(values: Iterable[Any]) -> Tuple[str, ...]:
+        return tuple(str(value).lower() for value in values if value is not None)
+
+    def add(self, pk: Hashable, values: Iterable[Any]):
+        """添加或更新记录"""
+        texts = self._normalize(values)
+        old_texts = self._docs.get(pk)
+        if old_texts == texts:
+            return
+        old_grams = set().union(*map(trigrams, old_texts)) if old_texts else set()
+        new_grams = set().union(*map(trigrams, texts)) if texts else set()
+        for gram in old_grams - new_grams:
+            self._discard(gram, pk)
+        for gram in new_grams - old_grams:
+            self._postings.setdefault(gram, set()).add(pk)
+        self._docs[pk] = texts
+
+    def remove(self, pk: Hashable):
+        """删除记录"""
+        texts = self._docs.pop(pk, None)
+        if texts:
+            for gram in set().union(*map(trigrams, texts)):
+                self._discard(gram, pk)
+
+    def _discard(self, gram: str, pk: Hashable):
+        posting = self._postings.get(gram)
+        if posting is not None:
+            posting.discard(pk)
+            if not posting:
+                del self._postings[gram]
+
+    def search(self, query: str) -> Set[Hashable]:
+        """包含关键字的记录主键"""
+        query = query.lower()
+        grams = trigrams(query)
+        if not grams:
+            # 关键字不足 3 个字符, 直接扫描内存中的文本
+            return {pk for pk, texts in self._docs.items() if any(query in text for text in texts)}
+        postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates &= posting
+        # 三元组都出现不代表连续出现, 用原文校验
+        docs = self._docs
+        return {pk for pk in candidates if any(query in text for text in docs[pk])}
+
+    def memory_usage(self) -> int:
+        """估算占用的内存(字节)"""
+        size = sys.getsizeof(self._docs) + sys.getsizeof(self._postings)
+        for pk, texts in self._docs.items():
+            size += sys.getsizeof(pk) + sys.getsizeof(texts) + sum(sys.getsizeof(text) for text in texts)
+        for gram, posting in self._postings.items():
+            size += sys.getsizeof(gram) + sys.getsizeof(posting)
+        return size
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'rows': len(self._docs),
+            'trigrams': len(self._postings),
+            'bytes': self.memory_usage(),
+        }
@@ -0,0 +1,107 @@
+from typing import Any, Optional
+from datetime import datetime, date
+from decimal import Decimal
+import base64
+import json
+
+from tortoise.expressions import Q
+
+# 升序时 NULL 排在最后的数据库, 其余(SQLite/MySQL/MSSQL)升序时 NULL 在最前
+NULLS_LAST_DIALECTS = ('postgres', 'oracle')
+
+
+class InvalidCursor(ValueError):
+    """游标无法解析"""
+
+
+def _encode_value(value: Any) -> Any:
+    """将排序字段的值转换为可JSON序列化的形式，保留类型信息"""
+    if isinstance(value, datetime):
+        return {"$dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"$d": value.isoformat()}
+    if isinstance(value, Decimal):
+        return {"$dec": str(value)}
+    if value is None or isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+
+def _decode_value(value: Any) -> Any:
+    """还原 _encode_value 编码的值"""
+    if isinstance(value, dict):
+        if "$dt" in value:
+            return datetime.fromisoformat(value["$dt"])
+        if "$d" in value:
+            return date.fromisoformat(value["$d"])
+        if "$dec" in value:
+            return Decimal(value["$dec"])
+        raise InvalidCursor("unknown cursor value type")
+    return value
+
+
+def encode_cursor(sort: str, order: str, value: Any, pk: Any, direction: str = "next") -> str:
+    """生成不透明的分页游标
+
+    sort/order 记录生成游标时的排序方式，排序改变后旧游标失效
+    """
+    payload = {
+        "s": sort,
+        "o": order,
+        "v": _encode_value(value),
+        "pk": _encode_value(pk),
+        "d": direction,
+    }
+    raw = json.dumps(payload, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> Optional[dict]:
+    """解析分页游标, 空游标返回 None, 格式错误抛出 InvalidCursor"""
+    if not cursor:
+        return None
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+        if payload.get("d") not in ("next", "prev"):
+            raise InvalidCursor("invalid cursor direction")
+        return {
+            "sort": payload["s"],
+            "order": payload["o"],
+            "value": _decode_value(payload["v"]),
+            "pk": _decode_value(payload["pk"]),
+            "direction": payload["d"],
+        }
+    except InvalidCursor:
+        raise
+    except Exception as e:
+        raise InvalidCursor(f"invalid cursor: {str(e)}")
+
+
+def nulls_sort_first(model) -> bool:
+    """升序排序时 NULL 是否排在非 NULL 值之前"""
+    return model._meta.db.capabilities.dialect not in NULLS_LAST_DIALECTS
+
+
+def keyset_condition(column: str, pk_attr: str, value: Any, pk: Any,
+                     op: str, nulls_first: bool = True) -> Q:
+    """
+    游标之后的记录条件
+
+    结果按 column, pk_attr 排序, op 为 "gt" 表示升序遍历, "lt" 表示降序遍历;
+    nulls_first 为升序时 NULL 是否排在最前 (见 nulls_sort_first)。
+    排序列可为空时 NULL 值所在的一端也要包含在条件内, 否则会漏掉记录。
+    """
+    if column == pk_attr:
+        return Q(**{f"{pk_attr}__{op}": pk})
+    # 按遍历方向 NULL 是否排在非 NULL 值之后
+    nulls_after = (op == 'lt') == nulls_first
+    if value is None:
+        condition = Q(**{f"{column}__isnull": True, f"{pk_attr}__{op}": pk})
+        if not nulls_after:
+            condition |= Q(**{f"{column}__isnull": False})
+        return condition
+    condition = Q(**{f"{column}__{op}": value}) | Q(**{column: value, f"{pk_attr}__{op}": pk})
+    if nulls_after:
+        condition |= Q(**{f"{column}__isnull": True})
+    return condition
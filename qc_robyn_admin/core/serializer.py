@@ -0,0 +1,204 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from tortoise import Model
+from datetime import date, time
+from decimal import Decimal
+from uuid import UUID
+import asyncio
+
+from .fields import DisplayType, TableField
+
+
+# JSON 后端可以直接编码的类型, 编码结果与 str() 相同
+NATIVE_TYPES = (date, time, Decimal, UUID)
+
+
+def to_wire_value(value: Any) -> Any:
+    """转换为响应中的值: None 为空字符串, 日期/Decimal/UUID 交给 JSON 后端编码, 其余转为字符串"""
+    if value is None:
+        return ''
+    if isinstance(value, NATIVE_TYPES):
+        return value
+    return str(value)
+
+
+def to_compact(columns: List[str], rows: List[dict],
+               display_columns: List[str], display_rows: List[dict]) -> dict:
+    """转换为紧凑的列式格式
+
+    {"columns": [...], "rows": [[...], ...]}, 有格式化函数的列另外输出
+    "display_columns" 和对应的 "display" 行数组
+    """
+    result = {
+        "columns": columns,
+        "rows": [[row.get(name, '') for name in columns] for row in rows],
+    }
+    if display_columns:
+        result["display_columns"] = display_columns
+        result["display"] = [[row.get(name, '') for name in display_columns] for row in display_rows]
+    return result
+
+
+class ValuesRow(dict):
+    """values_list 查询结果的一行, 可以像模型实例一样按属性取值"""
+    __slots__ = ()
+
+    def __getattr__(self, name: str) -> Any:
+        try:
+            return self[name]
+        except KeyError:
+            raise AttributeError(name)
+
+
+class RowSerializer:
+    """预编译的行序列化器
+
+    注册模型时根据 table_fields 为每个字段生成一个取值函数, 格式化函数是否为
+    协程、关联字段能否批量查询等判断只做一次。所有字段都是同步取值时整页
+    数据不经过 await 直接序列化。
+
+    输出与 ModelAdmin.serialize_object / InlineModelAdmin.serialize_object
+    保持一致, inline=True 时使用内联模型的规则(首列为 id, 不处理 SWITCH,
+    外键为空时输出空字符串)。
+    """
+
+    def __init__(self, table_fields: List[TableField],
+                 get_related_field: Callable[[TableField], str], inline: bool = False):
+        self.inline = inline
+        # (字段名, 取值函数, 是否为协程)
+        self.cells: List[Tuple[str, Callable, bool]] = [
+            self._compile_field(field, get_related_field) for field in table_fields
+        ]
+        self.is_sync = not any(is_async for _, _, is_async in self.cells)
+
+    def _compile_field(self, field: TableField, get_related_field: Callable[[TableField], str]):
+        name = field.name
+        formatter = field.formatter
+
+        # 普通字段
+        if formatter is None:
+            def plain(obj, related_values, for_display):
+                return to_wire_value(getattr(obj, name, None))
+        elif asyncio.iscoroutinefunction(formatter):
+            async def plain(obj, related_values, for_display):
+                value = getattr(obj, name, None)
+                if not for_display or value is None:
+                    return to_wire_value(value)
+                try:
+                    return await formatter(value)
+                except Exception as e:
+                    print(f"Error formatting field {name}: {str(e)}")
+                    return str(value)
+        else:
+            def plain(obj, related_values, for_display):
+                value = getattr(obj, name, None)
+                if not for_display or value is None:
+                    return to_wire_value(value)
+                try:
+                    return formatter(value)
+                except Exception as e:
+                    print(f"Error formatting field {name}: {str(e)}")
+                    return str(value)
+        plain_is_async = asyncio.iscoroutinefunction(plain)
+
+        if field.display_type == DisplayType.SWITCH and not self.inline:
+            return name, lambda obj, related_values, for_display: getattr(obj, name, None), False
+
+        if not (field.related_model and field.related_key):
+            return name, plain, plain_is_async
+
+        related_model = field.related_model
+        related_key = field.related_key
+        related_field = get_related_field(field)
+        # 外键为空时: ModelAdmin 按普通字段处理, 内联模型输出空字符串
+        empty = (lambda obj, related_values, for_display: '') if self.inline else plain
+
+        if related_field in related_model._meta.fields_map:
+            # 值由 load_related_values 按页批量查询
+            if plain_is_async and not self.inline:
+                async def related(obj, related_values, for_display):
+                    fk_value = getattr(obj, related_key)
+                    if fk_value:
+                        return to_wire_value(related_values[name].get(fk_value))
+                    return await empty(obj, related_values, for_display)
+                return name, related, True
+
+            def related(obj, related_values, for_display):
+                fk_value = getattr(obj, related_key)
+                if fk_value:
+                    return to_wire_value(related_values[name].get(fk_value))
+                return empty(obj, related_values, for_display)
+            return name, related, False
+
+        # 关联字段不是数据库列(例如模型属性), 只能逐条查询
+        async def related_lookup(obj, related_values, for_display):
+            fk_value = getattr(obj, related_key)
+            if fk_value:
+                try:
+                    related_obj = await related_model.get(id=fk_value)
+                    return to_wire_value(getattr(related_obj, related_field))
+                except Exception:
+                    if self.inline:
+                        return ''
+                    raise
+            result = empty(obj, related_values, for_display)
+            return await result if plain_is_async and not self.inline else result
+        return name, related_lookup, True
+
+    def _row_start(self, obj: Model) -> dict:
+        return {'id': str(getattr(obj, 'id', ''))} if self.inline else {}
+
+    def _serialize_safe(self, obj: Model, related_values: Dict, for_display: bool) -> dict:
+        """逐个字段序列化, 出错的字段输出空字符串"""
+        result = self._row_start(obj)
+        for name, cell, _ in self.cells:
+            try:
+                result[name] = cell(obj, related_values, for_display)
+            except Exception as e:
+                print(f"Error serializing field {name}: {str(e)}")
+                result[name] = ''
+        return result
+
+    def serialize_sync(self, obj: Model, related_values: Dict, for_display: bool = True) -> dict:
+        """同步序列化一行, 仅在 is_sync 为 True 时可用"""
+        try:
+            result = self._row_start(obj)
+            for name, cell, _ in self.cells:
+                result[name] = cell(obj, related_values, for_display)
+            return result
+        except Exception:
+            return self._serialize_safe(obj, related_values, for_display)
+
+    async def serialize(self, obj: Model, related_values: Dict, for_display: bool = True) -> dict:
+        """序列化一行, 支持协程格式化函数和逐条查询的关联字段"""
+        result = self._row_start(obj)
+        for name, cell, is_async in self.cells:
+            try:
+                value = cell(obj, related_values, for_display)
+                result[name] = await value if is_async else value
+            except Exception as e:
+                print(f"Error serializing field {name}: {str(e)}")
+                result[name] = ''
+        return result
+
+    async def serialize_many(self, objects: List[Model], related_values: Dict,
+                             for_display: bool = True) -> List[dict]:
+        if self.is_sync:
+            return [self.serialize_sync(obj, related_values, for_display) for obj in objects]
+        return [await self.serialize(obj, related_values, for_display) for obj in objects]
+
+    async def serialize_one(self, obj: Model, related_values: Dict, for_display: bool = True) -> dict:
+        if self.is_sync:
+            return self.serialize_sync(obj, related_values, for_display)
+        return await self.serialize(obj, related_values, for_display)
+
+
+async def serialize_with_display(objects: List[Model], serializer: RowSerializer,
+                                 display_serializer: Optional[RowSerializer],
+                                 related_values: Dict) -> Tuple[List[dict], List[dict]]:
+    """一次遍历同时生成未格式化的行和格式化函数列的显示值行(见 to_compact)"""
+    rows, display_rows = [], []
+    for obj in objects:
+        rows.append(await serializer.serialize_one(obj, related_values, for_display=False))
+        if display_serializer is not None:
+            display_rows.append(await display_serializer.serialize_one(obj, related_values, for_display=True))
+    return rows, display_rows
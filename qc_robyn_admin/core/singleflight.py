@@ -0,0 +1,32 @@
+from typing import Any, Awaitable, Callable, Dict, Hashable
+import asyncio
+
+
+class SingleFlight:
+    """合并相同键的并发调用
+
+    同一个键同一时刻只执行一次, 期间到达的调用等待并共享该次结果(包括异常)。
+    调用在独立的任务中执行, 发起调用的请求被取消时不影响其他等待者。
+    """
+
+    def __init__(self):
+        self._calls: Dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        return len(self._calls)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """执行 fn 或等待相同键正在执行的调用"""
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._calls[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+        return await asyncio.shield(task)
+
+    def _forget(self, key: Hashable, task: asyncio.Task):
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        # 所有等待者都已取消时, 避免 "exception was never retrieved" 警告
+        if not task.cancelled():
+            task.exception()
@@ -1,7 +1,7 @@
 from typing import Type, Optional, Dict, List, Union
 from types import ModuleType
 from tortoise import Model, Tortoise
-from robyn import Robyn, Request, Response, jsonify
+from robyn import Robyn, Request, Response
 from robyn.templating import JinjaTemplate
 from pathlib import Path
 import os
@@ -19,6 +19,12 @@ from ..auth_admin import AdminUserAdmin, RoleAdmin, UserRoleAdmin
 from ..auth_models import AdminUser, Role, UserRole
 from .admin import ModelAdmin
 from .menu import MenuManager, MenuItem
+from .pagination import InvalidCursor
+from .filters import InvalidFilterValue
+from .encoders import JSONBackend, get_json_backend, get_msgpack_backend, accepts_msgpack
+from .singleflight import SingleFlight
+from .indexes import IndexSuggestion, find_missing_indexes, create_indexes, format_report
+from .cache import make_cache_key
 from ..models import AdminUser
 from ..i18n.translations import get_text
 from typing import Callable
@@ -37,7 +43,10 @@ class AdminSite:
         modules: Optional[Dict[str, List[Union[str, ModuleType]]]] = None,
         generate_schemas: bool = True,
         default_language: str = 'en_US',
-        startup_function: Optional[Callable] = None
+        startup_function: Optional[Callable] = None,
+        json_backend: Union[str, JSONBackend] = 'orjson',
+        check_indexes: bool = False,
+        create_indexes: bool = False
     ):
         """
         初始化Admin站点
@@ -49,6 +58,10 @@ class AdminSite:
         :param modules: 模型模块配置,如果为None则尝试复用已有配置
         :param generate_schemas: 是否自动生成数据库表结构
         :param default_language: 默认语言 zh_CN, en_US
+        :param json_backend: JSON 编码后端 json, orjson 或 JSONBackend 实例;
+            安装 msgpack 后客户端可通过 Accept: application/msgpack 获取 msgpack 响应
+        :param check_indexes: 启动时检查已注册模型的排序/过滤/内联外键等列是否缺少索引并输出报告
+        :param create_indexes: 启动时自动创建缺少的索引(包含 check_indexes)
         """
         self.app = app
         self.title = title          # 后台名称
@@ -59,6 +72,10 @@ class AdminSite:
         self.menu_manager = MenuManager()
         self.copyright = copyright   # 添加版权属性
         self.startup_function = startup_function
+        self.json_backend = get_json_backend(json_backend)
+        self.msgpack_backend = get_msgpack_backend()
+        # 合并相同的并发列表查询
+        self._list_flights = SingleFlight()
         # 设置模板
         self._setup_templates()
         
@@ -66,6 +83,8 @@ class AdminSite:
         self.db_url = db_url
         self.modules = modules
         self.generate_schemas = generate_schemas
+        self.check_indexes = check_indexes or create_indexes
+        self.create_indexes = create_indexes
         # 确保数据库文件路径存在
         if db_url and db_url.startswith('sqlite'):
             db_path = db_url.replace('sqlite://', '')
@@ -106,6 +125,23 @@ class AdminSite:
         self.jinja_template.env.globals.update({
             'get_text': self.get_text
         })
+        # 模板中的 tojson 过滤器使用站点的 JSON 后端
+        self.jinja_template.env.policies['json.dumps_function'] = (
+            lambda obj, **kwargs: self.json_backend.dumps_str(obj)
+        )
+        self.jinja_template.env.policies['json.dumps_kwargs'] = {}
+
+    def _json_response(self, request: Request, data, status_code: int = 200,
+                       headers: Optional[dict] = None) -> Response:
+        """使用站点的 JSON 后端编码响应, Accept 要求 msgpack 且已安装时返回 msgpack"""
+        backend = self.json_backend
+        if self.msgpack_backend and accepts_msgpack(request.headers.get('Accept')):
+            backend = self.msgpack_backend
+        return Response(
+            status_code=status_code,
+            description=backend.dumps(data),
+            headers={"Content-Type": backend.content_type, **(headers or {})}
+        )
 
     def _cleanup_db(self):
         """清理数据库连接"""
@@ -206,6 +242,10 @@ class AdminSite:
                     )
                     print("Database initialized successfully")
 
+                # 数据库初始化后外键列才完整, 重新编译已注册模型的行序列化器
+                for model_admin in self.models.values():
+                    model_admin.compile_serializers()
+
                 # 注册内部模型
                 self.init_register_auth_models()
 
@@ -215,6 +255,14 @@ class AdminSite:
                     await Tortoise.generate_schemas()
                     print("Database schemas generated successfully")
 
+                # 为开启 fulltext_search 的模型创建全文索引
+                for model_admin in self.models.values():
+                    await model_admin.setup_fulltext_index()
+
+                # 检查缺少的索引
+                if self.check_indexes:
+                    await self.advise_indexes(create=self.create_indexes)
+
                 # 触发信号来创建管理员账号
                 try:
                     # 检查是否已存在管理员账号
@@ -385,6 +433,9 @@ class AdminSite:
                     description="模型不存在",
                     headers={"Content-Type": "application/json"}
                 )
+
+            if not await self.check_permission(request, route_id, 'view'):
+                return self._json_response(request, {"error": "没有权限访问此页面"}, status_code=403)
             
             # 获取索参数， 同时还要进url解码
             search_values = {
@@ -396,17 +447,72 @@ class AdminSite:
             queryset = await model_admin.get_queryset(request, search_values)
             objects = await queryset.limit(model_admin.per_page)
             
-            # 序列化结果
-            result = {
-                "data": [
-                    {
-                        'display': model_admin.serialize_object(obj, for_display=True),
-                        'data': model_admin.serialize_object(obj, for_display=False)
-                    }
-                    for obj in objects
-                ]
-            }
-            return jsonify(result)
+            # 序列化结果, 未格式化值和显示值一次生成
+            result = {"data": await model_admin.serialize_data_display(objects)}
+            return self._json_response(request, result)
+
+        @self.app.get(f"/{self.prefix}/:route_id/choices")
+        async def model_choices(request: Request):
+            """表单远程选项, 参数: field 字段名, q 搜索, offset/limit 分页, value 已选值(逗号分隔)"""
+            try:
+                route_id: str = request.path_params.get("route_id")
+                model_admin = self.get_model_admin(route_id)
+                if not model_admin:
+                    return self._json_response(request, {"error": "Model not found"}, status_code=404)
+
+                if not await self.check_permission(request, route_id, 'view'):
+                    return self._json_response(request, {"error": "没有权限访问此页面"}, status_code=403)
+
+                field_name = request.query_params.get("field", "")
+                search = unquote(request.query_params.get("q", ""))
+                value = unquote(request.query_params.get("value", ""))
+                try:
+                    offset = int(request.query_params.get("offset", 0))
+                    limit = int(request.query_params.get("limit", 0)) or None
+                except ValueError:
+                    return self._json_response(request, {"error": "Invalid offset or limit"}, status_code=400)
+
+                choices = await model_admin.get_choices(
+                    field_name, search=search, offset=offset, limit=limit,
+                    values=[item for item in value.split(',') if item]
+                )
+                if choices is None:
+                    return self._json_response(request, {"error": f"Invalid choices field: {field_name}"}, status_code=400)
+                return self._json_response(request, choices)
+
+            except Exception as e:
+                print(f"Error in model_choices: {str(e)}")
+                return self._json_response(request, {"error": str(e)}, status_code=500)
+
+        @self.app.get(f"/{self.prefix}/:route_id/autocomplete")
+        async def model_autocomplete(request: Request):
+            """搜索框输入提示, 参数: field 搜索字段名, q 前缀, limit 条数"""
+            try:
+                route_id: str = request.path_params.get("route_id")
+                model_admin = self.get_model_admin(route_id)
+                if not model_admin:
+                    return self._json_response(request, {"error": "Model not found"}, status_code=404)
+
+                if not await self.check_permission(request, route_id, 'view'):
+                    return self._json_response(request, {"error": "没有权限访问此页面"}, status_code=403)
+
+                field_name = request.query_params.get("field", "")
+                if not field_name and model_admin.search_fields:
+                    field_name = model_admin.search_fields[0].name
+                prefix = unquote(request.query_params.get("q", ""))
+                try:
+                    limit = int(request.query_params.get("limit", 10))
+                except ValueError:
+                    limit = 10
+
+                values = await model_admin.get_autocomplete(field_name, prefix, limit)
+                if values is None:
+                    return self._json_response(request, {"error": f"Invalid search field: {field_name}"}, status_code=400)
+                return self._json_response(request, {"field": field_name, "values": values})
+
+            except Exception as e:
+                print(f"Error in model_autocomplete: {str(e)}")
+                return self._json_response(request, {"error": str(e)}, status_code=500)
 
 
         @self.app.get(f"/{self.prefix}/:route_id")
@@ -438,7 +544,11 @@ class AdminSite:
                         description="model not found"
                     )
                 
-                frontend_config = await model_admin.get_frontend_config()
+                frontend_config = await model_admin.get_frontend_config(request)
+                # 内联模型注册的管理类路由, 编辑和删除内联记录时使用
+                for inline_config in frontend_config.get("inlines", []):
+                    inline_admins = self.model_registry.get(inline_config["model"], [])
+                    inline_config["route_id"] = inline_admins[0].route_id if inline_admins else None
                 
                 # 确保语言设置确传递
                 frontend_config["language"] = language
@@ -501,6 +611,7 @@ class AdminSite:
                 success, message = await model_admin.handle_add(request, form_data)
                 
                 if success:
+                    self.invalidate_model_cache(model_admin.model)
                     return Response(
                         status_code=200,
                         description=message,
@@ -559,6 +670,7 @@ class AdminSite:
                 success, message = await model_admin.handle_edit(request, object_id, form_data)
                 
                 if success:
+                    self.invalidate_model_cache(model_admin.model)
                     return Response(
                         status_code=200,
                         description=message,
@@ -601,6 +713,7 @@ class AdminSite:
                 success, message = await model_admin.handle_delete(request, object_id)
                 
                 if success:
+                    self.invalidate_model_cache(model_admin.model)
                     return Response(
                         status_code=200,
                         description=message,
@@ -628,48 +741,139 @@ class AdminSite:
                 route_id: str = request.path_params.get("route_id")
                 model_admin = self.get_model_admin(route_id)
                 if not model_admin:
-                    return jsonify({"error": "Model not found"})
+                    return self._json_response(request, {"error": "Model not found"})
+
+                allowed = await self.check_permission(request, route_id, 'view')
+                if not allowed:
+                    return self._json_response(request, {"error": "没有权限访问此页面"}, status_code=403)
                     
                 # 解析查询参数
                 params: dict = request.query_params.to_dict()
+                # limit 由服务端限制在 [1, max_per_page] 范围内
+                limit = int(params.get('limit', ['10'])[0])
                 query_params = {
-                    'limit': int(params.get('limit', ['10'])[0]),
-                    'offset': int(params.get('offset', ['0'])[0]),
+                    'limit': min(max(limit, 1), model_admin.max_per_page),
+                    'offset': max(int(params.get('offset', ['0'])[0]), 0),
+                    'cursor': params.get('cursor', [''])[0],
                     'search': params.get('search', [''])[0],
                     'sort': params.get('sort', [''])[0],
                     'order': params.get('order', ['asc'])[0],
+                    'format': params.get('format', [''])[0],
                 }
-                
+
                 # 添加其他过滤参数
                 for key, value in params.items():
-                    if key not in ['limit', 'offset', 'search', 'sort', 'order', '_']:
+                    if key not in ['limit', 'offset', 'cursor', 'search', 'sort', 'order', 'format', '_']:
                         query_params[key] = value[0]
-                        
-                # 调用模型管理类的处理方法
-                queryset, total = await model_admin.handle_query(request, query_params)
-                
-                # 序列化数据
-                data = []
-                async for obj in queryset:
-                    try:
-                        serialized = await model_admin.serialize_object(obj)
-                        data.append({
-                            'data': serialized,
-                            'display': serialized
-                        })
-                    except Exception as e:
-                        print(f"Error serializing object: {str(e)}")
-                        continue
-                
-                return jsonify({
-                    "total": total,
-                    "data": data
-                })
-                
+
+                # 调用模型管理类的处理方法, 相同的并发请求共享一次查询
+                # (已通过权限检查); 查询依赖请求(重写了 get_queryset 等)时按登录用户区分
+                flight_key = (route_id, make_cache_key(query_params))
+                if model_admin.is_request_scoped():
+                    flight_key += (self._get_session_user_id(request),)
+                try:
+                    result = await self._list_flights.do(
+                        flight_key, lambda: model_admin.get_list_data(request, query_params)
+                    )
+                except (InvalidCursor, InvalidFilterValue) as e:
+                    return self._json_response(request, {"error": str(e)}, status_code=400)
+
+                return self._json_response(request, result)
+
             except Exception as e:
                 print(f"Error in model_data: {str(e)}")
-                return jsonify({"error": str(e)})
+                return self._json_response(request, {"error": str(e)})
         
+        @self.app.get(f"/{self.prefix}/:route_id/facets")
+        async def model_facets(request: Request):
+            """获取过滤选项的记录数"""
+            try:
+                route_id: str = request.path_params.get("route_id")
+                model_admin = self.get_model_admin(route_id)
+                if not model_admin:
+                    return self._json_response(request, {"error": "Model not found"}, status_code=404)
+
+                if not await self.check_permission(request, route_id, 'view'):
+                    return self._json_response(request, {"error": "没有权限访问此页面"}, status_code=403)
+
+                # 搜索和过滤参数, 与 model_data 相同
+                params: dict = request.query_params.to_dict()
+                query_params = {
+                    key: value[0] for key, value in params.items()
+                    if key != '_' and key not in model_admin.PAGE_PARAMS
+                }
+
+                try:
+                    await model_admin.validate_filters(query_params)
+                except InvalidFilterValue as e:
+                    return self._json_response(request, {"error": str(e)}, status_code=400)
+
+                facets = await model_admin.get_facet_counts(request, query_params)
+                return self._json_response(request, {"facets": facets})
+
+            except Exception as e:
+                print(f"Error in model_facets: {str(e)}")
+                return self._json_response(request, {"error": str(e)})
+
+        @self.app.get(f"/{self.prefix}/:route_id/distinct")
+        async def model_distinct_values(request: Request):
+            """过滤字段的不重复值, 参数: field 过滤字段名, q 搜索, offset/limit 分页"""
+            try:
+                route_id: str = request.path_params.get("route_id")
+                model_admin = self.get_model_admin(route_id)
+                if not model_admin:
+                    return self._json_response(request, {"error": "Model not found"}, status_code=404)
+
+                if not await self.check_permission(request, route_id, 'view'):
+                    return self._json_response(request, {"error": "没有权限访问此页面"}, status_code=403)
+
+                field_name = request.query_params.get("field", "")
+                search = unquote(request.query_params.get("q", ""))
+                try:
+                    offset = int(request.query_params.get("offset", 0))
+                    limit = int(request.query_params.get("limit", 0)) or None
+                except ValueError:
+                    return self._json_response(request, {"error": "Invalid offset or limit"}, status_code=400)
+
+                values = await model_admin.get_distinct_values(
+                    request, field_name, search=search, offset=offset, limit=limit
+                )
+                if values is None:
+                    return self._json_response(request, {"error": f"Invalid distinct filter: {field_name}"}, status_code=400)
+                return self._json_response(request, values)
+
+            except Exception as e:
+                print(f"Error in model_distinct_values: {str(e)}")
+                return self._json_response(request, {"error": str(e)}, status_code=500)
+
+        @self.app.get(f"/{self.prefix}/:route_id/date_hierarchy")
+        async def model_date_hierarchy(request: Request):
+            """获取日期层级的区间及记录数"""
+            try:
+                route_id: str = request.path_params.get("route_id")
+                model_admin = self.get_model_admin(route_id)
+                if not model_admin or not model_admin.date_hierarchy:
+                    return self._json_response(request, {"error": "Model not found"}, status_code=404)
+
+                if not await self.check_permission(request, route_id, 'view'):
+                    return self._json_response(request, {"error": "没有权限访问此页面"}, status_code=403)
+
+                params: dict = request.query_params.to_dict()
+                query_params = {
+                    key: value[0] for key, value in params.items()
+                    if key != '_' and key not in model_admin.PAGE_PARAMS
+                }
+                try:
+                    await model_admin.validate_filters(query_params)
+                    result = await model_admin.get_date_hierarchy(request, query_params)
+                except InvalidFilterValue as e:
+                    return self._json_response(request, {"error": str(e)}, status_code=400)
+                return self._json_response(request, result)
+
+            except Exception as e:
+                print(f"Error in model_date_hierarchy: {str(e)}")
+                return self._json_response(request, {"error": str(e)})
+
         @self.app.post(f"/{self.prefix}/:route_id/batch_delete")
         async def model_batch_delete(request: Request):
             """批量删除记录"""
@@ -697,8 +901,10 @@ class AdminSite:
                 
                 # 调用模型管理类的处理方法
                 success, message, deleted_count = await model_admin.handle_batch_delete(request, ids)
+                if deleted_count:
+                    self.invalidate_model_cache(model_admin.model)
                 
-                return jsonify({
+                return self._json_response(request, {
                     "code": 200 if success else 500,
                     "message": message,
                     "success": success,
@@ -707,7 +913,7 @@ class AdminSite:
                 
             except Exception as e:
                 print(f"Batch delete error: {str(e)}")
-                return jsonify({
+                return self._json_response(request, {
                     "code": 500,
                     "message": f"批量删除失败: {str(e)}",
                     "success": False
@@ -720,7 +926,7 @@ class AdminSite:
                 # 验证用户登录
                 user = await self._get_current_user(request)
                 if not user:
-                    return jsonify({
+                    return self._json_response(request, {
                         "code": 401,
                         "message": "未登录",
                         "success": False
@@ -729,7 +935,7 @@ class AdminSite:
                 # 获取上传的文件
                 files = request.files
                 if not files:
-                    return jsonify({
+                    return self._json_response(request, {
                         "code": 400,
                         "message": "没上传文件",
                         "success": False
@@ -741,7 +947,7 @@ class AdminSite:
                 for file_name, file_bytes in files.items():
                     # 证文件类型
                     if not file_name.lower().endswith(('.jpg', '.jpeg', '.png', '.gif', '.sql', '.xlsx', '.csv', '.xls')):
-                        return jsonify({
+                        return self._json_response(request, {
                             "code": 400,
                             "message": "不支持文件类型",
                             "success": False
@@ -768,7 +974,7 @@ class AdminSite:
                     })
                 
                 # 返回成功响应
-                return jsonify({
+                return self._json_response(request, {
                     "code": 200,
                     "message": "上传成功",
                     "success": True,
@@ -778,7 +984,7 @@ class AdminSite:
             except Exception as e:
                 print(f"文件上传失败: {str(e)}")
                 traceback.print_exc()
-                return jsonify({
+                return self._json_response(request, {
                     "code": 500,
                     "message": f"文件上传失败: {str(e)}",
                     "success": False
@@ -824,13 +1030,43 @@ class AdminSite:
                 print(f"Set language failed: {str(e)}")
                 return Response(status_code=500, description="Set language failed")
         
+        async def serialize_inline_page(inline, page: dict, compact: bool) -> dict:
+            """序列化一页内联数据"""
+            if compact:
+                data = await inline.serialize_compact(page['objects'])
+            else:
+                data = {"data": [
+                    {'data': serialized, 'display': serialized}
+                    for serialized in await inline.serialize_objects(page['objects'])
+                ]}
+            return {
+                **data,
+                "total": page['total'],
+                "next_cursor": page['next_cursor'],
+                "next_offset": page['next_offset']
+            }
+
+        def get_inline_fields_config(inline) -> list:
+            """内联表格的字段配置"""
+            return [
+                {
+                    'name': field.name,
+                    'label': field.label,
+                    'display_type': field.display_type.value if field.display_type else 'text',
+                    'sortable': field.sortable,
+                    'width': field.width,
+                    'is_link': field.is_link  # 确保is_link也被传递到前端
+                }
+                for field in inline.table_fields
+            ]
+
         @self.app.get(f"/{self.prefix}/:route_id/inline_data")
         async def get_inline_data(request: Request):
             try:
                 route_id = request.path_params['route_id']
                 model_admin = self.get_model_admin(route_id)
                 if not model_admin:
-                    return jsonify({"error": "Model not found"}, status_code=404)
+                    return self._json_response(request, {"error": "Model not found"}, status_code=404)
                 
                 params: dict = request.query_params.to_dict()
                 parent_id = params.get('parent_id', [''])[0]
@@ -839,76 +1075,123 @@ class AdminSite:
                 # 获取排序参数
                 sort_field = params.get('sort', [''])[0]
                 sort_order = params.get('order', ['asc'])[0]
+                compact = params.get('format', [''])[0] == 'compact'
+                search = unquote(params.get('q', [''])[0])
+                # 分页参数: limit 每页条数, cursor 为上一页的 next_cursor, 也支持 offset
+                cursor = params.get('cursor', [''])[0]
+                try:
+                    limit = int(params.get('limit', ['0'])[0] or 0) or None
+                    offset = int(params.get('offset', ['0'])[0] or 0)
+                except ValueError:
+                    return self._json_response(request, {"error": "Invalid limit or offset"}, status_code=400)
                                 
                 if not parent_id or not inline_model:
-                    return jsonify({"error": "Missing parameters"})
+                    return self._json_response(request, {"error": "Missing parameters"})
                 
                 # 找到对应的内联实例
                 inline = next((i for i in model_admin._inline_instances if i.model.__name__ == inline_model), None)
                 if not inline:
-                    return jsonify({"error": "Inline model not found"})
+                    return self._json_response(request, {"error": "Inline model not found"})
                     
                 # 获取父实例
                 parent_instance = await model_admin.get_object(parent_id)
                 if not parent_instance:
-                    return jsonify({"error": "Parent object not found"})
+                    return self._json_response(request, {"error": "Parent object not found"})
                     
-                # 获取查询集
-                queryset = await inline.get_queryset(parent_instance)
-                
-                # 应用排序
-                if sort_field:
-                    # 检查字段是否可排序
-                    sortable_field = next((field for field in inline.table_fields 
-                                          if field.name == sort_field and field.sortable), None)
-                    if sortable_field:
-                        order_by = f"{'-' if sort_order == 'desc' else ''}{sort_field}"
-                        queryset = queryset.order_by(order_by)
-                
-                # 获取数据
-                data = []
-                async for obj in queryset:
-                    try:
-                        serialized = await inline.serialize_object(obj)
-                        data.append({
-                            'data': serialized,
-                            'display': serialized
-                        })
-                    except Exception as e:
-                        print(f"Error serializing object: {str(e)}")
-                        continue
-                
-                # 添加字段配置信息
-                fields_config = [
-                    {
-                        'name': field.name,
-                        'label': field.label,
-                        'display_type': field.display_type.value if field.display_type else 'text',
-                        'sortable': field.sortable,
-                        'width': field.width,
-                        'is_link': field.is_link  # 确保is_link也被传递到前端
-                    }
-                    for field in inline.table_fields
-                ]
-                return Response(
-                    status_code=200,
-                    headers={"Content-Type": "application/json; charset=utf-8"},
-                    description=json.dumps({
-                        "success": True,
-                        "data": data,
-                        "total": len(data),
-                        "fields": fields_config
-                    }),
-                )
+                # 获取一页数据
+                try:
+                    page = await inline.get_page(
+                        parent_instance, sort_field=sort_field, sort_order=sort_order,
+                        limit=limit, cursor=cursor, offset=offset, search=search
+                    )
+                except InvalidCursor as e:
+                    return self._json_response(request, {"error": str(e)}, status_code=400)
+
+                return self._json_response(request, {
+                    "success": True,
+                    **await serialize_inline_page(inline, page, compact),
+                    "fields": get_inline_fields_config(inline)
+                })
                 
             except Exception as e:
                 print(f"Error in get_inline_data: {str(e)}")
                 traceback.print_exc()
-                return jsonify(
-                    {"error": str(e)}, 
-                    # headers={"Content-Type": "application/json; charset=utf-8"}
-                )
+                return self._json_response(request, {"error": str(e)})
+
+        @self.app.get(f"/{self.prefix}/:route_id/inline_batch")
+        async def get_inline_batch(request: Request):
+            """批量获取多个父记录的第一页内联数据, 参数: inline_model, parent_ids(逗号分隔), limit"""
+            try:
+                route_id = request.path_params['route_id']
+                model_admin = self.get_model_admin(route_id)
+                if not model_admin:
+                    return self._json_response(request, {"error": "Model not found"}, status_code=404)
+
+                if not await self.check_permission(request, route_id, 'view'):
+                    return self._json_response(request, {"error": "没有权限访问此页面"}, status_code=403)
+
+                params: dict = request.query_params.to_dict()
+                inline_model = params.get('inline_model', [''])[0]
+                parent_ids = [item for item in unquote(params.get('parent_ids', [''])[0]).split(',') if item]
+                compact = params.get('format', [''])[0] == 'compact'
+                try:
+                    limit = int(params.get('limit', ['0'])[0] or 0) or None
+                except ValueError:
+                    return self._json_response(request, {"error": "Invalid limit"}, status_code=400)
+
+                if not parent_ids or not inline_model:
+                    return self._json_response(request, {"error": "Missing parameters"}, status_code=400)
+                if len(parent_ids) > model_admin.max_per_page:
+                    return self._json_response(request, {"error": "Too many parent_ids"}, status_code=400)
+
+                inline = next((i for i in model_admin._inline_instances if i.model.__name__ == inline_model), None)
+                if not inline:
+                    return self._json_response(request, {"error": "Inline model not found"}, status_code=404)
+
+                pages = await inline.get_first_pages(parent_ids, limit=limit)
+                return self._json_response(request, {
+                    "success": True,
+                    "pages": {
+                        parent_id: await serialize_inline_page(inline, page, compact)
+                        for parent_id, page in pages.items()
+                    },
+                    "fields": get_inline_fields_config(inline)
+                })
+
+            except Exception as e:
+                print(f"Error in get_inline_batch: {str(e)}")
+                traceback.print_exc()
+                return self._json_response(request, {"error": str(e)}, status_code=500)
         
+        @self.app.get(f"/{self.prefix}/:route_id/:id")
+        async def model_detail(request: Request):
+            """单条记录详情, 支持 If-None-Match 条件请求"""
+            try:
+                route_id: str = request.path_params.get("route_id")
+                object_id: str = unquote(request.path_params.get("id"))
+                model_admin = self.get_model_admin(route_id)
+                if not model_admin:
+                    return self._json_response(request, {"error": "Model not found"}, status_code=404)
+
+                if not await self.check_permission(request, route_id, 'view'):
+                    return self._json_response(request, {"error": "没有权限访问此页面"}, status_code=403)
+
+                detail = await model_admin.get_detail(object_id, request)
+                if detail is None:
+                    return self._json_response(request, {"error": "Object not found"}, status_code=404)
+
+                data, etag = detail
+                # 按会话区分缓存, 修改后 ETag 变化
+                headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+                if_none_match = request.headers.get("If-None-Match") or ''
+                if etag in [tag.strip() for tag in if_none_match.split(',')]:
+                    return Response(status_code=304, description="", headers=headers)
+                return self._json_response(request, data, headers=headers)
+
+            except Exception as e:
+                print(f"Error in model_detail: {str(e)}")
+                return self._json_response(request, {"error": str(e)}, status_code=500)
+
         @self.app.post(f"/{self.prefix}/:route_id/import")
         async def handle_import(request: Request):
             """处理数据导入"""
@@ -917,7 +1200,7 @@ class AdminSite:
                 model_admin = self.get_model_admin(route_id)
                 
                 if not model_admin or not model_admin.allow_import:
-                    return jsonify({
+                    return self._json_response(request, {
                         "success": False,
                         "message": "不支持导入功能"
                     })
@@ -926,7 +1209,7 @@ class AdminSite:
                 files = request.files
                 filename = list(files.keys())[0]
                 if not files:
-                    return jsonify({
+                    return self._json_response(request, {
                         "success": False,
                         "message": "未上传文件"
                     })
@@ -935,7 +1218,7 @@ class AdminSite:
                 
                 # 检查文件类型
                 if not any(filename.endswith(ext) for ext in ['.xlsx', '.xls', '.csv']):
-                    return jsonify({
+                    return self._json_response(request, {
                         "success": False,
                         "message": "仅支持 Excel 或 CSV 文件"
                     })
@@ -953,7 +1236,7 @@ class AdminSite:
                 # 验证字段
                 missing_fields = [f for f in model_admin.import_fields if f not in df.columns]
                 if missing_fields:
-                    return jsonify({
+                    return self._json_response(request, {
                         "success": False,
                         "message": f"缺少必需字段: {', '.join(missing_fields)}"
                     })
@@ -971,8 +1254,10 @@ class AdminSite:
                     except Exception as e:
                         error_count += 1
                         errors.append(str(e))
+                if success_count:
+                    self.invalidate_model_cache(model_admin.model)
                         
-                return jsonify({
+                return self._json_response(request, {
                     "success": True,
                     "message": f"导入完成: 成功 {success_count} 条, 失败 {error_count} 条",
                     "errors": errors if errors else None
@@ -980,7 +1265,7 @@ class AdminSite:
                 
             except Exception as e:
                 print(f"Import error: {str(e)}")
-                return jsonify({
+                return self._json_response(request, {
                     "success": False,
                     "message": f"导入失败: {str(e)}"
                 })
@@ -1005,6 +1290,11 @@ class AdminSite:
             
         # 存储路由标识符到实例中，用于后续路由生成
         instance.route_id = route_id
+
+        # 预编译行序列化器
+        instance.compile_serializers()
+        # 开启缓存时通过模型信号自动失效
+        instance.connect_cache_signals()
         
         print(f"\n=== Registering Model ===")
         print(f"Model: {model.__name__}")
@@ -1063,6 +1353,19 @@ class AdminSite:
             print(f"Session verification error: {str(e)}")
             return False, None
 
+    def _get_session_user_id(self, request: Request) -> Optional[int]:
+        """从会话令牌中解析登录用户ID, 不查询数据库; 未登录或令牌无效时返回 None"""
+        cookies = {}
+        for item in (request.headers.get('Cookie') or '').split(";"):
+            if "=" in item:
+                key, value = item.split("=", 1)
+                cookies[key.strip()] = value.strip()
+        token = cookies.get("session_token")
+        if not token:
+            return None
+        valid, user_id = self._verify_session_token(token)
+        return user_id if valid else None
+
     async def _get_current_user(self, request: Request) -> Optional[AdminUser]:
         """获取当前登录用户"""
         try:
@@ -1145,6 +1448,36 @@ class AdminSite:
         """注册菜项"""
         self.menu_manager.register_menu(menu_item)  # 使用 menu_manager 注册菜单
 
+    def invalidate_model_cache(self, model: Type[Model]):
+        """清空注册了该模型的所有管理类的缓存"""
+        for model_admin in self.model_registry.get(model.__name__, []):
+            model_admin.invalidate_cache()
+
+    async def rebuild_fulltext_indexes(self):
+        """重建所有模型的全文索引"""
+        for model_admin in self.models.values():
+            await model_admin.rebuild_fulltext_index()
+
+    async def advise_indexes(self, create: bool = False) -> List[IndexSuggestion]:
+        """
+        检查已注册模型的列表查询缺少的索引并输出报告, create=True 时创建这些索引
+
+        Returns:
+            List[IndexSuggestion]: 缺少的索引, 按表的记录数从多到少排列
+        """
+        suggestions = []
+        for model_admin in self.models.values():
+            try:
+                suggestions.extend(model_admin.get_index_suggestions())
+            except Exception as e:
+                print(f"Error collecting index suggestions for {model_admin.model.__name__}: {str(e)}")
+        missing = await find_missing_indexes(suggestions)
+        print(format_report(missing))
+        if create and missing:
+            created = await create_indexes(missing)
+            print(f"Index advisor: created {len(created)} index(es)")
+        return missing
+
     def get_model_admin(self, route_id: str) -> Optional[ModelAdmin]:
         """根据路由ID获取模型管理器"""
         return self.models.get(route_id)
@@ -95,6 +95,13 @@ TRANSLATIONS = {
         'choose_file': '选择文件',
         'no_file_chosen': '未选择文件',
         'please_select_file': '请选择文件',
+
+        # 分页加载相关
+        'load_more': '加载更多...',
+        'load_data_failed': '加载数据失败',
+        'unknown_error': '未知错误',
+        'search_field': '搜索{field}',
+        'inline_admin_not_registered': '内联模型未注册管理类',
     },
     'en_US': {
         # Common
@@ -192,6 +199,13 @@ TRANSLATIONS = {
         'choose_file': 'Choose File',
         'no_file_chosen': 'No file chosen',
         'please_select_file': 'Please select a file',
+
+        # Paged loading
+        'load_more': 'Load more...',
+        'load_data_failed': 'Failed to load data',
+        'unknown_error': 'Unknown error',
+        'search_field': 'Search {field}',
+        'inline_admin_not_registered': 'No admin is registered for this inline model',
     }
 }
 
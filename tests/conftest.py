@@ -0,0 +1,106 @@
+import asyncio
+
+import pytest
+from tortoise import Tortoise
+from tortoise.backends.sqlite.client import SqliteClient
+from robyn import HttpMethod, Robyn
+from tortoise.models import Model
+
+from qc_robyn_admin.core.site import AdminSite
+from qc_robyn_admin.models import AdminUser
+from tests.models import Item, Note
+
+MODULES = {"models": ["qc_robyn_admin.models", "qc_robyn_admin.auth_models", "tests.models"]}
+
+
+class FakeRequest:
+    """只提供 headers 和路径参数的请求对象"""
+
+    def __init__(self, headers=None, path_params=None):
+        self.headers = headers or {}
+        self.path_params = path_params or {}
+
+
+def list_params(**kwargs) -> dict:
+    """get_list_data 的查询参数, 与 /data 接口解析后的参数相同"""
+    params = {'limit': 10, 'offset': 0, 'cursor': '', 'search': '', 'sort': '', 'order': 'asc', 'format': ''}
+    params.update(kwargs)
+    return params
+
+
+async def create_items(count: int = 12, notes: int = 0) -> list:
+    """创建 count 条 Item, 分属两个用户, 每条带 notes 条 Note"""
+    users = [
+        await AdminUser.create(username=f"user{i}", password="x", email=f"user{i}@example.com")
+        for i in range(2)
+    ]
+    items = []
+    for i in range(count):
+        item = await Item.create(
+            name=f"item{i:03d}", score=i % 5, price=i * 1.5, active=i % 2 == 0,
+            payload=f"payload {i}", owner=users[i % 2]
+        )
+        for j in range(notes):
+            await Note.create(item=item, text=f"note{i}-{j}")
+        items.append(item)
+    return items
+
+
+@pytest.fixture
+def run_db():
+    """在新建的内存 SQLite 数据库中运行协程函数, 返回其结果"""
+    def run(test):
+        async def main():
+            await Tortoise.init(db_url="sqlite://:memory:", modules=MODULES)
+            await Tortoise.generate_schemas()
+            # 模型信号的监听器注册在模型类上, 测试结束后恢复为模块导入时注册的监听器
+            saved = {
+                signal: {model: list(receivers) for model, receivers in listeners.items()}
+                for signal, listeners in Model._listeners.items()
+            }
+            try:
+                return await test()
+            finally:
+                await Tortoise.close_connections()
+                for signal, listeners in Model._listeners.items():
+                    listeners.clear()
+                    listeners.update(saved[signal])
+        return asyncio.run(main())
+    return run
+
+
+@pytest.fixture
+def queries(monkeypatch):
+    """记录执行的 SQL 语句"""
+    executed = []
+    execute_query = SqliteClient.execute_query
+
+    async def record(self, query, values=None):
+        executed.append(query)
+        return await execute_query(self, query, values)
+
+    monkeypatch.setattr(SqliteClient, 'execute_query', record)
+    return executed
+
+
+@pytest.fixture
+def admin_site():
+    """未启动的 AdminSite, 数据库由 run_db 提供"""
+    return AdminSite(Robyn(__file__))
+
+
+def route_handler(site: AdminSite, method: str, path: str):
+    """获取站点注册的路由处理函数"""
+    for route in site.app.router.get_routes():
+        if route.route_type == getattr(HttpMethod, method) and route.route == f"/{site.prefix}{path}":
+            return route.function.handler
+    raise KeyError(f"{method} {path}")
+
+
+async def login(site: AdminSite, superuser: bool = True) -> dict:
+    """创建用户并返回带会话 Cookie 的请求头"""
+    user = await AdminUser.create(
+        username=f"login{superuser:d}", password="x", email=f"login{superuser:d}@example.com",
+        is_superuser=superuser
+    )
+    return {'Cookie': f"session_token={site._generate_session_token(user.id)}"}
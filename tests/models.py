@@ -0,0 +1,21 @@
+from tortoise import fields, models
+
+
+class Item(models.Model):
+    """测试用的列表模型"""
+    id = fields.IntField(pk=True)
+    name = fields.CharField(max_length=100)
+    score = fields.IntField(default=0)
+    price = fields.DecimalField(max_digits=10, decimal_places=2, default=0)
+    active = fields.BooleanField(default=True)
+    payload = fields.TextField(default="")
+    created_at = fields.DatetimeField(auto_now_add=True)
+    owner = fields.ForeignKeyField('models.AdminUser', related_name='items', null=True)
+
+
+class Note(models.Model):
+    """测试用的内联模型"""
+    id = fields.IntField(pk=True)
+    item = fields.ForeignKeyField('models.Item', related_name='notes')
+    text = fields.CharField(max_length=100)
+    rank = fields.IntField(null=True)
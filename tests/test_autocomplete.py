@@ -0,0 +1,86 @@
+from qc_robyn_admin.core.admin import ModelAdmin
+from qc_robyn_admin.core.fields import SearchField, TableField
+from qc_robyn_admin.models import AdminUser
+from tests.conftest import create_items
+from tests.models import Item
+
+
+class SuggestItemAdmin(ModelAdmin):
+    autocomplete_max_results = 5
+    table_fields = [TableField('id'), TableField('name')]
+    search_fields = [
+        SearchField('name'),
+        SearchField('AdminUser_username', related_model=AdminUser, related_key='owner_id'),
+        SearchField('Other_username', related_model=AdminUser, related_key='owner_id'),
+    ]
+
+
+def test_prefix_matches_are_distinct_and_sorted(run_db, queries):
+    async def test():
+        await create_items(12)
+        await Item.create(name='ITEM001')
+        await Item.create(name='item001')
+        admin = SuggestItemAdmin(Item)
+        queries.clear()
+        assert await admin.get_autocomplete('name', 'Item00', limit=3) == ['ITEM001', 'item000', 'item001']
+        assert len(queries) == 1
+        assert 'LOWER' in queries[0] and 'DISTINCT' in queries[0]
+        # 关联搜索字段取关联模型的值
+        assert await admin.get_autocomplete('AdminUser_username', 'USER') == ['user0', 'user1']
+        assert await admin.get_autocomplete('name', 'zzz') == []
+        assert await admin.get_autocomplete('name', '') == []
+    run_db(test)
+
+
+def test_limit_capped_by_max_results(run_db):
+    async def test():
+        await create_items(12)
+        admin = SuggestItemAdmin(Item)
+        assert len(await admin.get_autocomplete('name', 'item', limit=100)) == 5
+        assert len(await admin.get_autocomplete('name', 'item', limit=0)) == 1
+    run_db(test)
+
+
+def test_invalid_field_returns_none(run_db):
+    async def test():
+        admin = SuggestItemAdmin(Item)
+        assert await admin.get_autocomplete('price', 'a') is None
+        assert await admin.get_autocomplete('Other_username', 'a') is None
+        assert admin.get_autocomplete_column('name') == (Item, 'name')
+    run_db(test)
+
+
+def test_hot_prefixes_cached(run_db, queries):
+    async def test():
+        await create_items(3)
+        admin = SuggestItemAdmin(Item)
+        admin.connect_cache_signals()
+        assert await admin.get_autocomplete('name', 'item') == ['item000', 'item001', 'item002']
+        queries.clear()
+        assert await admin.get_autocomplete('name', 'ITEM') == ['item000', 'item001', 'item002']
+        # 较短前缀的结果已完整, 在内存中过滤
+        assert await admin.get_autocomplete('name', 'item00') == ['item000', 'item001', 'item002']
+        assert await admin.get_autocomplete('name', 'item002') == ['item002']
+        assert queries == []
+
+        # 数据变更后失效
+        await Item.create(name='item003')
+        assert await admin.get_autocomplete('name', 'item00') == ['item000', 'item001', 'item002', 'item003']
+        # 关联模型变更后也失效
+        user = await AdminUser.get(username='user0')
+        user.username = 'owner0'
+        await user.save()
+        assert await admin.get_autocomplete('AdminUser_username', 'owner') == ['owner0']
+    run_db(test)
+
+
+def test_truncated_shorter_prefix_queries_again(run_db, queries):
+    async def test():
+        await create_items(12)
+        admin = SuggestItemAdmin(Item)
+        assert len(await admin.get_autocomplete('name', 'item', limit=2)) == 2
+        queries.clear()
+        # 较短前缀的结果被 limit 截断, 不能用于过滤
+        assert await admin.get_autocomplete('name', 'item01', limit=2) == ['item010', 'item011']
+        assert len(queries) == 1
+    run_db(test)
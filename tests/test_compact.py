@@ -0,0 +1,86 @@
+from qc_robyn_admin.core.admin import ModelAdmin
+from qc_robyn_admin.core.fields import DisplayType, TableField
+from qc_robyn_admin.core.inline import InlineModelAdmin
+from qc_robyn_admin.core.serializer import to_compact
+from qc_robyn_admin.models import AdminUser
+from tests.conftest import FakeRequest, create_items, list_params
+from tests.models import Item, Note
+
+
+class CompactItemAdmin(ModelAdmin):
+    table_fields = [
+        TableField('id'),
+        TableField('name', formatter=lambda value: f"<{value}>"),
+        TableField('active', display_type=DisplayType.SWITCH),
+        TableField('AdminUser_username', related_model=AdminUser, related_key='owner_id'),
+    ]
+
+
+class NoteInline(InlineModelAdmin):
+    model = Note
+    fk_field = 'item'
+    table_fields = [TableField('text', formatter=str.upper)]
+
+
+def test_to_compact_layout():
+    rows = [{'a': 1, 'b': 2}, {'a': 3}]
+    assert to_compact(['a', 'b'], rows, [], []) == {'columns': ['a', 'b'], 'rows': [[1, 2], [3, '']]}
+    assert to_compact(['a'], rows, ['a'], [{'a': 'x'}, {'a': 'y'}])['display'] == [['x'], ['y']]
+
+
+def test_compact_matches_default_format(run_db):
+    async def test():
+        await create_items(4)
+        admin = CompactItemAdmin(Item)
+        default = await admin.get_list_data(FakeRequest(), list_params())
+        compact = await admin.get_list_data(FakeRequest(), list_params(format='compact'))
+        assert 'data' not in compact and compact['total'] == default['total']
+        assert compact['columns'] == ['id', 'name', 'active', 'AdminUser_username']
+        assert compact['display_columns'] == ['name']
+
+        rows = [dict(zip(compact['columns'], row)) for row in compact['rows']]
+        displays = [dict(zip(compact['display_columns'], row)) for row in compact['display']]
+        for row, display, expected in zip(rows, displays, default['data']):
+            # 默认格式的值经过格式化函数, 紧凑格式的 rows 为原值, 显示值另外输出
+            assert {**row, **display} == expected['data']
+        assert rows[0]['name'] == 'item000' and rows[0]['active'] is True
+    run_db(test)
+
+
+def test_compact_sparse_fieldset(run_db):
+    async def test():
+        await create_items(2)
+        compact = await CompactItemAdmin(Item).get_list_data(
+            FakeRequest(), list_params(format='compact', fields='AdminUser_username')
+        )
+        assert compact['columns'] == ['id', 'AdminUser_username']
+        assert 'display_columns' not in compact
+        assert [row[1] for row in compact['rows']] == ['user0', 'user1']
+    run_db(test)
+
+
+def test_inline_compact(run_db):
+    async def test():
+        items = await create_items(1, notes=2)
+        inline = NoteInline(Item)
+        notes = await Note.filter(item=items[0]).order_by('id')
+        compact = await inline.serialize_compact(notes)
+        assert compact['columns'] == ['id', 'text']
+        assert compact['rows'] == [[str(note.id), note.text] for note in notes]
+        assert compact['display'] == [[note.text.upper()] for note in notes]
+    run_db(test)
+
+
+def test_compact_with_overridden_serialize_object_skips_failed_rows(run_db):
+    class CustomItemAdmin(CompactItemAdmin):
+        async def serialize_object(self, obj, for_display=True):
+            if obj.name == 'item001':
+                raise ValueError('cannot serialize')
+            return {'id': str(obj.id), 'name': obj.name, 'active': obj.active, 'AdminUser_username': ''}
+
+    async def test():
+        await create_items(3)
+        compact = await CustomItemAdmin(Item).get_list_data(FakeRequest(), list_params(format='compact'))
+        assert [row[1] for row in compact['rows']] == ['item000', 'item002']
+        assert compact['display'] == [['<item000>'], ['<item002>']]
+    run_db(test)
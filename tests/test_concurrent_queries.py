@@ -0,0 +1,72 @@
+import asyncio
+
+from qc_robyn_admin.core.admin import ModelAdmin
+from qc_robyn_admin.core.fields import TableField
+from tests.conftest import FakeRequest, create_items, list_params
+from tests.models import Item
+
+
+class ItemAdmin(ModelAdmin):
+    table_fields = [TableField('id'), TableField('name')]
+
+
+class ConcurrentItemAdmin(ItemAdmin):
+    concurrent_queries = True
+
+
+async def record(events, name):
+    events.append(f"{name} start")
+    await asyncio.sleep(0)
+    events.append(f"{name} end")
+    return name
+
+
+def test_sqlite_runs_sequentially(run_db):
+    async def test():
+        admin = ItemAdmin(Item)
+        assert not admin.can_run_concurrently()
+        events = []
+        assert await admin.gather_queries(record(events, 'a'), record(events, 'b')) == ['a', 'b']
+        assert events == ['a start', 'a end', 'b start', 'b end']
+    run_db(test)
+
+
+def test_concurrent_queries_option(run_db):
+    async def test():
+        admin = ConcurrentItemAdmin(Item)
+        assert admin.can_run_concurrently()
+        events = []
+        assert await admin.gather_queries(record(events, 'a'), record(events, 'b')) == ['a', 'b']
+        assert events == ['a start', 'b start', 'a end', 'b end']
+
+        await create_items(12)
+        result = await admin.get_list_data(FakeRequest(), list_params(limit=5))
+        assert result['total'] == 12 and len(result['data']) == 5
+    run_db(test)
+
+
+def test_broken_query_returns_empty_page(run_db):
+    class BrokenItemAdmin(ItemAdmin):
+        cache_ttl = 60
+
+        async def build_list_query(self, request, params, keyset=None):
+            raise RuntimeError('query failed')
+
+    async def test():
+        await create_items(3)
+        admin = BrokenItemAdmin(Item)
+        assert await admin.get_list_data(FakeRequest(), list_params()) == {'total': 0, 'data': []}
+        assert len(admin._page_cache) == 0
+    run_db(test)
+
+
+def test_failed_count_returns_zero(run_db):
+    class BrokenCount:
+        async def count(self):
+            raise RuntimeError('count failed')
+
+    async def test():
+        admin = ItemAdmin(Item)
+        assert await admin.get_list_count(BrokenCount(), list_params()) == 0
+        assert await admin.get_list_count(None, list_params()) == 0
+    run_db(test)
@@ -0,0 +1,134 @@
+import asyncio
+
+import pytest
+
+from qc_robyn_admin.core import cache as cache_module
+from qc_robyn_admin.core.admin import ModelAdmin
+from qc_robyn_admin.core.cache import LRUCache, make_cache_key
+from qc_robyn_admin.core.fields import SearchField, TableField
+from tests.conftest import FakeRequest, create_items, list_params
+from tests.models import Item
+
+
+class CountedItemAdmin(ModelAdmin):
+    count_cache_ttl = 60
+    table_fields = [TableField('id'), TableField('name')]
+    search_fields = [SearchField('name')]
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """可手动推进的 time.monotonic"""
+    now = [1000.0]
+    monkeypatch.setattr(cache_module.time, 'monotonic', lambda: now[0])
+    return now
+
+
+def test_cache_expires_after_ttl(clock):
+    cache = LRUCache(ttl=10)
+    cache.set('a', 1)
+    clock[0] += 9
+    assert cache.get('a') == 1
+    clock[0] += 2
+    assert cache.get('a') is None
+    assert len(cache) == 0
+
+
+def test_cache_returns_stale_value_inside_window(clock):
+    cache = LRUCache(ttl=10, stale_ttl=5)
+    cache.set('a', 1)
+    clock[0] += 12
+    assert cache.get('a') is None
+    assert cache.lookup('a') == (1, True)
+    clock[0] += 5
+    assert cache.lookup('a') is None
+
+
+def test_cache_evicts_least_recently_used():
+    cache = LRUCache(max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert 'a' in cache and 'c' in cache and 'b' not in cache
+
+
+def test_cache_max_bytes():
+    cache = LRUCache(max_bytes=10)
+    cache.set('big', 1, size=11)
+    assert 'big' not in cache
+    cache.set('a', 1, size=6)
+    cache.set('b', 2, size=6)
+    assert 'a' not in cache and cache.total_bytes == 6
+
+
+def test_cache_drops_results_started_before_clear():
+    cache = LRUCache()
+    generation = cache.generation
+    cache.clear()
+    cache.set('a', 1, generation=generation)
+    assert 'a' not in cache
+    cache.set('a', 1, generation=cache.generation)
+    assert cache.get('a') == 1
+
+
+def test_cache_key_ignores_empty_and_internal_params():
+    assert make_cache_key({'b': '2', 'a': 1, 'c': '', '_': 'x'}) == (('a', '1'), ('b', '2'))
+    assert make_cache_key({'a': 1, 'limit': 10}, exclude=['limit']) == (('a', '1'),)
+
+
+def test_count_is_cached_per_filter(run_db):
+    async def test():
+        await create_items(6)
+        admin = CountedItemAdmin(Item)
+        assert (await admin.get_list_data(FakeRequest(), list_params()))['total'] == 6
+        # 没有连接模型信号, 新增记录不会使缓存失效
+        await Item.create(name='extra')
+        assert (await admin.get_list_data(FakeRequest(), list_params(offset=5)))['total'] == 6
+        assert (await admin.get_list_data(FakeRequest(), list_params(search='item001')))['total'] == 1
+    run_db(test)
+
+
+def test_count_cache_cleared_on_save_and_delete(run_db):
+    async def test():
+        await create_items(6)
+        admin = CountedItemAdmin(Item)
+        admin.connect_cache_signals()
+        assert (await admin.get_list_data(FakeRequest(), list_params()))['total'] == 6
+        item = await Item.create(name='extra')
+        assert (await admin.get_list_data(FakeRequest(), list_params()))['total'] == 7
+        await item.delete()
+        assert (await admin.get_list_data(FakeRequest(), list_params()))['total'] == 6
+    run_db(test)
+
+
+def test_stale_count_refreshed_in_background(run_db, clock):
+    class StaleItemAdmin(CountedItemAdmin):
+        count_cache_stale_ttl = 60
+
+    async def test():
+        await create_items(6)
+        admin = StaleItemAdmin(Item)
+        assert (await admin.get_list_data(FakeRequest(), list_params()))['total'] == 6
+        await Item.create(name='extra')
+        clock[0] += 61
+        # 过期后先返回旧值, 后台刷新完成后返回新值
+        assert (await admin.get_list_data(FakeRequest(), list_params()))['total'] == 6
+        await asyncio.gather(*admin._count_refreshing.values())
+        assert (await admin.get_list_data(FakeRequest(), list_params()))['total'] == 7
+    run_db(test)
+
+
+def test_request_scoped_count_not_cached(run_db):
+    class OwnItemAdmin(CountedItemAdmin):
+        async def get_queryset(self, request, params):
+            return (await super().get_queryset(request, params)).filter(active=True)
+
+    async def test():
+        await create_items(6)
+        admin = OwnItemAdmin(Item)
+        assert (await admin.get_list_data(FakeRequest(), list_params()))['total'] == 3
+        await Item.create(name='extra')
+        assert (await admin.get_list_data(FakeRequest(), list_params()))['total'] == 4
+        assert len(admin._count_cache) == 0
+    run_db(test)
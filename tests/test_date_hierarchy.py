@@ -0,0 +1,114 @@
+from datetime import date, datetime, timezone
+
+import pytest
+
+from qc_robyn_admin.core.admin import ModelAdmin
+from qc_robyn_admin.core.fields import TableField
+from qc_robyn_admin.core.filters import InvalidFilterValue, date_bucket_sql, parse_date_bucket
+from tests.conftest import FakeRequest, create_items, list_params
+from tests.models import Item
+
+UTC = timezone.utc
+DATES = [
+    datetime(2023, 12, 31, 23, 0, tzinfo=UTC), datetime(2024, 1, 5, 8, 0, tzinfo=UTC),
+    datetime(2024, 1, 5, 20, 0, tzinfo=UTC), datetime(2024, 2, 1, 0, 0, tzinfo=UTC),
+    datetime(2024, 2, 29, 12, 0, tzinfo=UTC),
+]
+
+
+class DatedItemAdmin(ModelAdmin):
+    date_hierarchy = 'created_at'
+    table_fields = [TableField('id'), TableField('name')]
+
+
+async def create_dated_items() -> list:
+    items = await create_items(len(DATES))
+    for item, created_at in zip(items, DATES):
+        await Item.filter(id=item.id).update(created_at=created_at)
+    return items
+
+
+def test_parse_date_bucket():
+    assert parse_date_bucket('2024') == (date(2024, 1, 1), date(2025, 1, 1), 'year')
+    assert parse_date_bucket('2024-12') == (date(2024, 12, 1), date(2025, 1, 1), 'month')
+    assert parse_date_bucket('2024-02-29') == (date(2024, 2, 29), date(2024, 3, 1), 'day')
+
+
+@pytest.mark.parametrize('value', ['abc', '2024-13', '2023-02-29', '2024-01-01-01', ''])
+def test_parse_invalid_date_bucket(value):
+    with pytest.raises(InvalidFilterValue):
+        parse_date_bucket(value)
+
+
+def test_date_bucket_sql():
+    assert date_bucket_sql('sqlite', 'month', '"t"."c"') == "strftime('%Y-%m', \"t\".\"c\")"
+    assert date_bucket_sql('postgres', 'year', '"t"."c"', utc=True) == \
+        "to_char((\"t\".\"c\" AT TIME ZONE 'UTC'), 'YYYY')"
+    assert date_bucket_sql('mysql', 'day', '`t`.`c`') == "SUBSTRING(CAST(`t`.`c` AS CHAR(32)), 1, 10)"
+
+
+def test_date_hierarchy_requires_date_field(run_db):
+    class BadAdmin(ModelAdmin):
+        date_hierarchy = 'name'
+
+    async def test():
+        with pytest.raises(ValueError):
+            BadAdmin(Item)
+    run_db(test)
+
+
+def test_bucket_counts_per_level(run_db, queries):
+    async def test():
+        await create_dated_items()
+        admin = DatedItemAdmin(Item)
+        queries.clear()
+        years = await admin.get_date_hierarchy(FakeRequest(), list_params())
+        assert years['level'] == 'year' and years['parents'] == []
+        assert years['buckets'] == [{'value': '2023', 'count': 1}, {'value': '2024', 'count': 4}]
+        assert len(queries) == 1 and 'GROUP BY' in queries[0]
+
+        months = await admin.get_date_hierarchy(FakeRequest(), list_params(date_hierarchy='2024'))
+        assert months['level'] == 'month' and months['parents'] == ['2024']
+        assert months['buckets'] == [{'value': '2024-01', 'count': 2}, {'value': '2024-02', 'count': 2}]
+
+        days = await admin.get_date_hierarchy(FakeRequest(), list_params(date_hierarchy='2024-01'))
+        assert days['buckets'] == [{'value': '2024-01-05', 'count': 2}]
+
+        # 已选中日期时没有下一级
+        leaf = await admin.get_date_hierarchy(FakeRequest(), list_params(date_hierarchy='2024-01-05'))
+        assert leaf['level'] is None and leaf['buckets'] == []
+        assert leaf['parents'] == ['2024', '2024-01', '2024-01-05']
+    run_db(test)
+
+
+def test_selected_bucket_filters_list_by_range(run_db, queries):
+    async def test():
+        items = await create_dated_items()
+        admin = DatedItemAdmin(Item)
+        queries.clear()
+        result = await admin.get_list_data(FakeRequest(), list_params(date_hierarchy='2024-02'))
+        assert [int(row['data']['id']) for row in result['data']] == [items[3].id, items[4].id]
+        # 范围条件, 不对列使用函数
+        assert not any('strftime' in sql for sql in queries)
+
+        with pytest.raises(InvalidFilterValue):
+            await admin.get_list_data(FakeRequest(), list_params(date_hierarchy='2024-02-30'))
+        with pytest.raises(InvalidFilterValue):
+            await admin.get_date_hierarchy(FakeRequest(), list_params(date_hierarchy='x'))
+    run_db(test)
+
+
+def test_buckets_cached_until_write(run_db):
+    async def test():
+        await create_dated_items()
+        admin = DatedItemAdmin(Item)
+        await admin.get_date_hierarchy(FakeRequest(), list_params())
+        await Item.create(name='new')
+        cached = await admin.get_date_hierarchy(FakeRequest(), list_params())
+        assert sum(bucket['count'] for bucket in cached['buckets']) == 5
+
+        admin.connect_cache_signals()
+        await Item.create(name='newer')
+        fresh = await admin.get_date_hierarchy(FakeRequest(), list_params())
+        assert sum(bucket['count'] for bucket in fresh['buckets']) == 7
+    run_db(test)
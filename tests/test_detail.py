@@ -0,0 +1,129 @@
+import json
+
+from qc_robyn_admin.auth_admin import UserRoleAdmin
+from qc_robyn_admin.auth_models import Role, UserRole
+from qc_robyn_admin.core.admin import ModelAdmin
+from qc_robyn_admin.core.encoders import make_etag
+from qc_robyn_admin.core.fields import FormField, TableField
+from qc_robyn_admin.models import AdminUser
+from tests.conftest import FakeRequest, create_items, login, route_handler
+from tests.models import Item
+
+
+class DetailItemAdmin(ModelAdmin):
+    table_fields = [
+        TableField('id'),
+        TableField('name', formatter=str.upper),
+        TableField('AdminUser_username', related_model=AdminUser, related_key='owner_id'),
+    ]
+    form_fields = [FormField('name'), FormField('score')]
+
+
+class ActiveItemAdmin(DetailItemAdmin):
+    async def get_queryset(self, request, params):
+        return (await super().get_queryset(request, params)).filter(active=True)
+
+
+def test_make_etag_is_weak_and_stable():
+    etag = make_etag({'b': 1, 'a': 2})
+    assert etag.startswith('W/"') and etag == make_etag({'a': 2, 'b': 1})
+    assert etag != make_etag({'a': 2, 'b': 2})
+
+
+def test_detail_reads_table_and_form_columns(run_db, queries):
+    async def test():
+        items = await create_items(2)
+        admin = DetailItemAdmin(Item)
+        queries.clear()
+        data, etag = await admin.get_detail(str(items[1].id))
+        assert data['name'] == 'item001' and data['score'] == '1'
+        assert data['AdminUser_username'] == 'user1'
+        assert data['display']['name'] == 'ITEM001'
+        assert etag == make_etag(data)
+        # 不读取表格和表单以外的列
+        assert not any('"payload"' in sql for sql in queries)
+
+        # 再次打开时不查询数据库
+        queries.clear()
+        assert await admin.get_detail(str(items[1].id)) == (data, etag)
+        assert queries == []
+    run_db(test)
+
+
+def test_detail_uses_form_fields_hook(run_db):
+    async def test():
+        user = await AdminUser.create(username='someone', password='x', email='someone@example.com')
+        role = await Role.create(name='editor')
+        user_role = await UserRole.create(user=user, role=role)
+        # UserRoleAdmin 通过 get_form_fields 返回表单字段
+        data, _ = await UserRoleAdmin(UserRole).get_detail(str(user_role.id))
+        assert data['user_id'] == str(user.id) and data['role_id'] == str(role.id)
+        assert data['AdminUser_username'] == 'someone' and data['Role_name'] == 'editor'
+    run_db(test)
+
+
+def test_etag_changes_after_update(run_db):
+    async def test():
+        items = await create_items(1)
+        admin = DetailItemAdmin(Item)
+        admin.connect_cache_signals()
+        _, etag = await admin.get_detail(str(items[0].id))
+        items[0].score = 4
+        await items[0].save()
+        data, new_etag = await admin.get_detail(str(items[0].id))
+        assert data['score'] == '4' and new_etag != etag
+    run_db(test)
+
+
+def test_missing_or_invalid_id_returns_none(run_db):
+    async def test():
+        admin = DetailItemAdmin(Item)
+        assert await admin.get_detail('9999') is None
+        assert await admin.get_detail('abc') is None
+    run_db(test)
+
+
+def test_scoped_detail_hides_records_outside_queryset(run_db):
+    async def test():
+        items = await create_items(2)
+        admin = ActiveItemAdmin(Item)
+        assert (await admin.get_detail(str(items[0].id), FakeRequest()))[0]['name'] == 'item000'
+        assert await admin.get_detail(str(items[1].id), FakeRequest()) is None
+        assert len(admin._detail_cache) == 0
+    run_db(test)
+
+
+def test_detail_route_supports_if_none_match(run_db, admin_site):
+    async def test():
+        items = await create_items(1)
+        admin_site.register_model(Item, DetailItemAdmin)
+        handler = route_handler(admin_site, 'GET', '/:route_id/:id')
+        headers = await login(admin_site)
+        path_params = {'route_id': 'DetailItemAdmin', 'id': str(items[0].id)}
+
+        response = await handler(FakeRequest(headers, path_params))
+        assert response.status_code == 200
+        etag = response.headers.get('ETag')
+        assert json.loads(response.description)['name'] == 'item000'
+
+        cached = await handler(FakeRequest({**headers, 'If-None-Match': f'W/"other", {etag}'}, path_params))
+        assert cached.status_code == 304 and cached.headers.get('ETag') == etag
+
+        missing = await handler(FakeRequest(headers, {**path_params, 'id': '9999'}))
+        assert missing.status_code == 404
+        unknown = await handler(FakeRequest(headers, {**path_params, 'route_id': 'Nope'}))
+        assert unknown.status_code == 404
+    run_db(test)
+
+
+def test_detail_route_requires_permission(run_db, admin_site):
+    async def test():
+        items = await create_items(1)
+        admin_site.register_model(Item, DetailItemAdmin)
+        handler = route_handler(admin_site, 'GET', '/:route_id/:id')
+        path_params = {'route_id': 'DetailItemAdmin', 'id': str(items[0].id)}
+        response = await handler(FakeRequest(await login(admin_site, superuser=False), path_params))
+        assert response.status_code == 403
+        response = await handler(FakeRequest(path_params=path_params))
+        assert response.status_code == 403
+    run_db(test)
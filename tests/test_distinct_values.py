@@ -0,0 +1,105 @@
+import pytest
+
+from qc_robyn_admin.core.admin import ModelAdmin
+from qc_robyn_admin.core.fields import TableField
+from qc_robyn_admin.core.filters import InputFilter, SelectFilter
+from qc_robyn_admin.models import AdminUser
+from tests.conftest import FakeRequest, create_items, list_params
+from tests.models import Item
+
+
+class DistinctItemAdmin(ModelAdmin):
+    table_fields = [TableField('id'), TableField('name')]
+    filter_fields = [
+        SelectFilter('score', distinct_values=True),
+        SelectFilter('AdminUser_username', related_model=AdminUser, related_key='owner_id', distinct_values=True),
+        SelectFilter('active', choices={True: 'yes'}),
+        InputFilter('name'),
+    ]
+
+
+def test_select_filter_needs_choices_or_distinct_values():
+    with pytest.raises(ValueError):
+        SelectFilter('score')
+    assert SelectFilter('score', distinct_values=True).to_dict()['distinct_values'] is True
+
+
+def test_values_ordered_by_count(run_db, queries):
+    async def test():
+        await create_items(12)
+        admin = DistinctItemAdmin(Item)
+        queries.clear()
+        page = await admin.get_distinct_values(FakeRequest(), 'score', limit=3)
+        assert page == {
+            'results': [
+                {'value': '0', 'label': '0', 'count': 3},
+                {'value': '1', 'label': '1', 'count': 3},
+                {'value': '2', 'label': '2', 'count': 2},
+            ],
+            'more': True,
+        }
+        assert len(queries) == 1 and 'GROUP BY' in queries[0]
+
+        rest = await admin.get_distinct_values(FakeRequest(), 'score', offset=3, limit=3)
+        assert [row['value'] for row in rest['results']] == ['3', '4'] and rest['more'] is False
+
+        owners = await admin.get_distinct_values(FakeRequest(), 'AdminUser_username', search='USER1')
+        assert owners['results'] == [{'value': 'user1', 'label': 'user1', 'count': 6}]
+    run_db(test)
+
+
+def test_invalid_field_returns_none(run_db):
+    async def test():
+        admin = DistinctItemAdmin(Item)
+        assert await admin.get_distinct_values(FakeRequest(), 'missing') is None
+        # 只有 distinct_values 的下拉过滤器提供不重复值
+        assert await admin.get_distinct_values(FakeRequest(), 'active') is None
+        assert await admin.get_distinct_values(FakeRequest(), 'name') is None
+    run_db(test)
+
+
+def test_values_cached_until_write(run_db, queries):
+    async def test():
+        await create_items(4)
+        admin = DistinctItemAdmin(Item)
+        admin.connect_cache_signals()
+        first = await admin.get_distinct_values(FakeRequest(), 'AdminUser_username')
+        queries.clear()
+        assert await admin.get_distinct_values(FakeRequest(), 'AdminUser_username') is first
+        assert queries == []
+
+        # 关联模型变更后失效
+        user = await AdminUser.get(username='user0')
+        user.username = 'owner0'
+        await user.save()
+        page = await admin.get_distinct_values(FakeRequest(), 'AdminUser_username')
+        assert {row['value'] for row in page['results']} == {'owner0', 'user1'}
+    run_db(test)
+
+
+def test_scoped_values_follow_get_queryset(run_db):
+    class OwnItemAdmin(DistinctItemAdmin):
+        async def get_queryset(self, request, params):
+            return (await super().get_queryset(request, params)).filter(active=True)
+
+    async def test():
+        await create_items(6)
+        admin = OwnItemAdmin(Item)
+        page = await admin.get_distinct_values(FakeRequest(), 'AdminUser_username')
+        # 只统计 get_queryset 范围内的记录, 不缓存
+        assert page['results'] == [{'value': 'user0', 'label': 'user0', 'count': 3}]
+        assert len(admin._distinct_cache) == 0
+    run_db(test)
+
+
+def test_selected_value_matches_exactly(run_db):
+    async def test():
+        await create_items(4)
+        other = await AdminUser.create(username='user10', password='x', email='user10@example.com')
+        await Item.create(name='other', score=1, owner=other)
+        admin = DistinctItemAdmin(Item)
+        result = await admin.get_list_data(FakeRequest(), list_params(AdminUser_username='user1'))
+        assert [row['data']['name'] for row in result['data']] == ['item001', 'item003']
+        result = await admin.get_list_data(FakeRequest(), list_params(score='1'))
+        assert [row['data']['name'] for row in result['data']] == ['item001', 'other']
+    run_db(test)
@@ -0,0 +1,100 @@
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from types import SimpleNamespace
+from uuid import UUID
+
+import pytest
+
+from qc_robyn_admin.core import encoders
+from qc_robyn_admin.core.encoders import (
+    JSONBackend, MsgpackBackend, OrjsonBackend, StdlibJSONBackend,
+    accepts_msgpack, get_json_backend
+)
+from qc_robyn_admin.core.site import AdminSite
+from tests.conftest import FakeRequest
+
+ROW = {
+    'name': '名称',
+    'created_at': datetime(2024, 5, 17, 8, 30, 15),
+    'day': date(2024, 5, 17),
+    'price': Decimal('12.50'),
+    'uuid': UUID('12345678-1234-5678-1234-567812345678'),
+    'empty': None,
+}
+
+
+@pytest.mark.parametrize('backend', [StdlibJSONBackend(), OrjsonBackend()])
+def test_backends_encode_like_str(backend):
+    decoded = json.loads(backend.dumps(ROW))
+    assert decoded == {
+        'name': '名称',
+        'created_at': '2024-05-17 08:30:15',
+        'day': '2024-05-17',
+        'price': '12.50',
+        'uuid': '12345678-1234-5678-1234-567812345678',
+        'empty': None,
+    }
+    assert backend.dumps_str({'a': 1}).replace(' ', '') == '{"a":1}'
+
+
+def test_get_json_backend():
+    assert isinstance(get_json_backend(None), OrjsonBackend)
+    assert isinstance(get_json_backend('json'), StdlibJSONBackend)
+    backend = StdlibJSONBackend()
+    assert get_json_backend(backend) is backend
+    with pytest.raises(ValueError):
+        get_json_backend('yaml')
+
+
+@pytest.mark.parametrize('accept, expected', [
+    ('application/msgpack', True),
+    ('text/html, application/x-msgpack;q=0.9', True),
+    ('application/json', False),
+    (None, False),
+])
+def test_accepts_msgpack(accept, expected):
+    assert accepts_msgpack(accept) is expected
+
+
+def test_msgpack_backend_requires_msgpack(monkeypatch):
+    monkeypatch.setattr(encoders, 'msgpack', None)
+    with pytest.raises(ImportError):
+        MsgpackBackend()
+    assert encoders.get_msgpack_backend() is None
+
+
+class FakeMsgpackBackend(JSONBackend):
+    name = 'msgpack'
+    content_type = encoders.MSGPACK_CONTENT_TYPE
+
+    def dumps(self, data):
+        return b'packed'
+
+
+def test_backend_must_implement_dumps():
+    class IncompleteBackend(JSONBackend):
+        name = 'incomplete'
+
+    with pytest.raises(TypeError):
+        IncompleteBackend()
+    assert FakeMsgpackBackend().dumps_str({}) == 'packed'
+
+
+def test_json_response_uses_site_backend():
+    site = SimpleNamespace(json_backend=StdlibJSONBackend(), msgpack_backend=FakeMsgpackBackend())
+    response = AdminSite._json_response(site, FakeRequest(), {'price': Decimal('1.50')},
+                                        status_code=201, headers={'ETag': 'W/"1"'})
+    assert response.status_code == 201
+    assert json.loads(response.description) == {'price': '1.50'}
+    assert response.headers.get('Content-Type') == encoders.JSON_CONTENT_TYPE
+    assert response.headers.get('ETag') == 'W/"1"'
+
+    packed = AdminSite._json_response(site, FakeRequest({'Accept': 'application/msgpack'}), {})
+    assert packed.description == b'packed'
+    assert packed.headers.get('Content-Type') == encoders.MSGPACK_CONTENT_TYPE
+
+    # 未安装 msgpack 时忽略 Accept
+    site.msgpack_backend = None
+    plain = AdminSite._json_response(site, FakeRequest({'Accept': 'application/msgpack'}), {})
+    assert plain.headers.get('Content-Type') == encoders.JSON_CONTENT_TYPE
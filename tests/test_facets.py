@@ -0,0 +1,115 @@
+from qc_robyn_admin.core.admin import ModelAdmin
+from qc_robyn_admin.core.fields import SearchField, TableField
+from qc_robyn_admin.core.filters import BooleanFilter, InputFilter, SelectFilter
+from qc_robyn_admin.models import AdminUser
+from tests.conftest import FakeRequest, create_items, list_params
+from tests.models import Item
+
+
+class FacetItemAdmin(ModelAdmin):
+    show_facet_counts = True
+    table_fields = [TableField('id'), TableField('name')]
+    search_fields = [SearchField('name')]
+    filter_fields = [
+        BooleanFilter('active'),
+        SelectFilter('score', choices={0: 'zero', 1: 'one', 4: 'four', 9: 'nine'}),
+        SelectFilter('AdminUser_username', choices={'user0': 'user0', 'user1': 'user1'},
+                     related_model=AdminUser, related_key='owner_id'),
+        InputFilter('name'),
+    ]
+
+
+def test_facet_counts_per_choice(run_db, queries):
+    async def test():
+        await create_items(10)
+        admin = FacetItemAdmin(Item)
+        queries.clear()
+        facets = await admin.get_facet_counts(FakeRequest(), list_params())
+        assert facets == {
+            'active': {True: 5, False: 5},
+            'score': {0: 2, 1: 2, 4: 2, 9: 0},
+            'AdminUser_username': {'user0': 5, 'user1': 5},
+        }
+        # 每个字段一条分组查询, 输入框过滤器不统计
+        assert len(queries) == 3
+        assert all('GROUP BY' in sql for sql in queries)
+    run_db(test)
+
+
+def test_facet_counts_use_search_and_other_filters(run_db):
+    async def test():
+        await create_items(10)
+        admin = FacetItemAdmin(Item)
+        facets = await admin.get_facet_counts(
+            FakeRequest(), list_params(name='item00', score='1', limit=1, offset=5)
+        )
+        # 统计某个字段时不含该字段自身的过滤条件
+        assert facets['score'] == {0: 2, 1: 2, 4: 2, 9: 0}
+        assert facets['AdminUser_username'] == {'user0': 1, 'user1': 1}
+        assert facets['active'] == {True: 1, False: 1}
+
+        facets = await admin.get_facet_counts(FakeRequest(), list_params(search='item001'))
+        assert facets['active'] == {True: 0, False: 1}
+    run_db(test)
+
+
+def test_facet_counts_cached_until_write(run_db):
+    class CachedFacetItemAdmin(FacetItemAdmin):
+        facet_cache_ttl = 60
+
+    async def test():
+        await create_items(4)
+        admin = CachedFacetItemAdmin(Item)
+        assert (await admin.get_facet_counts(FakeRequest(), list_params()))['active'] == {True: 2, False: 2}
+        await Item.create(name='extra', active=True)
+        assert (await admin.get_facet_counts(FakeRequest(), list_params()))['active'] == {True: 2, False: 2}
+
+        admin.connect_cache_signals()
+        await Item.create(name='extra2', active=True)
+        assert (await admin.get_facet_counts(FakeRequest(), list_params()))['active'] == {True: 4, False: 2}
+    run_db(test)
+
+
+def test_facet_counts_skip_unusable_fields(run_db):
+    class BadFacetItemAdmin(ModelAdmin):
+        show_facet_counts = True
+        filter_fields = [
+            # 名称与关联模型不匹配, 不是数据库列
+            SelectFilter('Other_username', choices={'a': 'a'}, related_model=AdminUser, related_key='owner_id'),
+            SelectFilter('missing', choices={'a': 'a'}),
+            SelectFilter('owner_id', distinct_values=True),
+        ]
+
+    async def test():
+        await create_items(2)
+        assert await BadFacetItemAdmin(Item).get_facet_counts(FakeRequest(), list_params()) == {}
+    run_db(test)
+
+
+def test_filter_field_to_dict_counts():
+    data = BooleanFilter('active').to_dict()
+    assert data['choices'] == {True: '是', False: '否'}
+    assert 'counts' not in data
+    assert BooleanFilter('active').to_dict({True: 3, False: 1})['counts'] == {True: 3, False: 1}
+
+
+def test_frontend_config_includes_initial_counts(run_db, admin_site):
+    class PlainItemAdmin(FacetItemAdmin):
+        show_facet_counts = False
+
+    async def test():
+        await create_items(10)
+        admin_site.register_model(Item, FacetItemAdmin)
+        admin_site.register_model(Item, PlainItemAdmin)
+        admin = admin_site.get_model_admin('FacetItemAdmin')
+        config = await admin.get_frontend_config(FakeRequest())
+        fields = {field['name']: field for field in config['filterFields']}
+        assert fields['active']['counts'] == {True: 5, False: 5}
+        assert fields['score']['counts'] == {0: 2, 1: 2, 4: 2, 9: 0}
+        assert 'counts' not in fields['name']
+
+        # 未开启 show_facet_counts 或没有请求时不统计
+        for config in (await admin_site.get_model_admin('PlainItemAdmin').get_frontend_config(FakeRequest()),
+                       await admin.get_frontend_config()):
+            assert not any('counts' in field for field in config['filterFields'])
+    run_db(test)
@@ -0,0 +1,156 @@
+from qc_robyn_admin.core.admin import ModelAdmin
+from qc_robyn_admin.core.fields import SearchField, TableField
+from qc_robyn_admin.core.filters import InputFilter, NumberRangeFilter, SelectFilter
+from qc_robyn_admin.core.indexes import (
+    IndexSuggestion, create_indexes, find_missing_indexes, format_report,
+    get_existing_indexes, merge_suggestions
+)
+from qc_robyn_admin.core.inline import InlineModelAdmin
+from qc_robyn_admin.models import AdminUser
+from tests.conftest import create_items
+from tests.models import Item, Note
+
+
+class NoteInline(InlineModelAdmin):
+    model = Note
+    fk_field = 'item'
+    table_fields = [TableField('text')]
+
+
+class IndexedItemAdmin(ModelAdmin):
+    pagination = 'keyset'
+    default_ordering = ['-created_at']
+    date_hierarchy = 'created_at'
+    table_fields = [
+        TableField('id', sortable=True),
+        TableField('name', sortable=True),
+        TableField('payload'),
+    ]
+    filter_fields = [
+        SelectFilter('score', distinct_values=True),
+        NumberRangeFilter('price'),
+        InputFilter('payload'),
+    ]
+    search_fields = [
+        SearchField('name'),
+        SearchField('AdminUser_username', related_model=AdminUser, related_key='owner_id'),
+    ]
+    inlines = [NoteInline]
+
+
+def columns_of(suggestions) -> set:
+    return {(s.model, s.columns) for s in suggestions}
+
+
+def test_suggestions_from_admin_options(run_db):
+    async def test():
+        suggestions = IndexedItemAdmin(Item).get_index_suggestions()
+        assert columns_of(suggestions) == {
+            (Item, ('created_at', 'id')),
+            (Item, ('name', 'id')),
+            (Item, ('score', 'created_at', 'id')),
+            (Item, ('price',)),
+            (Item, ('owner_id',)),
+            (Item, ('created_at',)),
+            (Note, ('item_id', 'id')),
+        }
+        # 子串匹配的过滤和搜索不能使用普通索引, 主键不需要索引
+        assert not any('payload' in s.columns for s in suggestions)
+        assert not any(s.columns[0] == 'id' for s in suggestions)
+    run_db(test)
+
+
+def test_merge_folds_prefixes_into_wider_index(run_db):
+    async def test():
+        merged = merge_suggestions([
+            IndexSuggestion(Item, ('score',), ['a']),
+            IndexSuggestion(Item, ('score', 'created_at'), ['b']),
+            IndexSuggestion(Item, ('score', 'created_at'), ['c']),
+            IndexSuggestion(Note, ('score',), ['d']),
+        ])
+        assert [(s.model, s.columns, s.reasons) for s in merged] == [
+            (Item, ('score', 'created_at'), ['b', 'c', 'a']),
+            (Note, ('score',), ['d']),
+        ]
+    run_db(test)
+
+
+def test_missing_indexes_on_sqlite(run_db):
+    async def test():
+        await create_items(3, notes=1)
+        # 已有索引的前缀覆盖建议的索引
+        await Item._meta.db.execute_script('CREATE INDEX idx_item_name_score ON item (name, score);')
+        assert ('name', 'score') in await get_existing_indexes(Item)
+
+        missing = await find_missing_indexes(IndexedItemAdmin(Item).get_index_suggestions())
+        # 整数主键的 SQLite 表, 二级索引隐含主键
+        assert columns_of(missing) == {
+            (Item, ('created_at',)),
+            (Item, ('score', 'created_at')),
+            (Item, ('price',)),
+            (Item, ('owner_id',)),
+            (Note, ('item_id',)),
+        }
+        created_at = next(s for s in missing if s.columns == ('created_at',))
+        assert created_at.reasons == ['default_ordering -created_at', 'date_hierarchy created_at']
+        assert all(s.rows == 3 and s.impact == 'low' for s in missing)
+
+        assert len(await create_indexes(missing)) == 5
+        assert await find_missing_indexes(IndexedItemAdmin(Item).get_index_suggestions()) == []
+    run_db(test)
+
+
+def test_failed_index_creation_skipped(run_db):
+    async def test():
+        await Note._meta.db.execute_script('DROP TABLE note;')
+        bad = IndexSuggestion(Note, ('text',), ['bad'])
+        good = IndexSuggestion(Item, ('price',), ['good'])
+        assert await create_indexes([bad, good]) == [good]
+        assert ('price',) in await get_existing_indexes(Item)
+    run_db(test)
+
+
+def test_index_name_and_sql(run_db):
+    async def test():
+        suggestion = IndexSuggestion(Item, ('score', 'created_at'), ['filter score'], rows=20000)
+        assert suggestion.name == 'idx_item_score_created_at'
+        assert suggestion.create_sql() == \
+            'CREATE INDEX IF NOT EXISTS "idx_item_score_created_at" ON "item" ("score", "created_at")'
+        assert suggestion.impact == 'medium'
+        assert IndexSuggestion(Item, ('price',), rows=None).impact == 'unknown'
+        assert IndexSuggestion(Item, ('price',), rows=100000).impact == 'high'
+
+        # 过长的索引名截断并附加哈希, 不同列的索引名不同
+        long_a = IndexSuggestion(Item, ('a' * 40, 'b' * 30))
+        long_b = IndexSuggestion(Item, ('a' * 40, 'c' * 30))
+        assert len(long_a.name) <= 60 and long_a.name != long_b.name
+        assert long_a.name == IndexSuggestion(Item, ('a' * 40, 'b' * 30)).name
+        assert suggestion.to_dict()['sql'] == suggestion.create_sql()
+    run_db(test)
+
+
+def test_format_report(run_db):
+    async def test():
+        assert format_report([]) == 'Index advisor: no missing indexes'
+        report = format_report([IndexSuggestion(Item, ('price',), ['filter price'])])
+        assert report.splitlines() == [
+            'Index advisor: 1 missing index(es)',
+            '  [unknown] item(price) ~? rows - filter price',
+            '    CREATE INDEX IF NOT EXISTS "idx_item_price" ON "item" ("price");',
+        ]
+    run_db(test)
+
+
+def test_site_advises_and_creates_indexes(run_db, admin_site):
+    class BrokenAdmin(ModelAdmin):
+        def get_index_suggestions(self):
+            raise RuntimeError('broken')
+
+    async def test():
+        admin_site.register_model(Item, IndexedItemAdmin)
+        admin_site.register_model(Note, BrokenAdmin)
+        missing = await admin_site.advise_indexes()
+        assert len(missing) == 6
+        assert await admin_site.advise_indexes(create=True)
+        assert await admin_site.advise_indexes() == []
+    run_db(test)
@@ -0,0 +1,106 @@
+from qc_robyn_admin.core.admin import ModelAdmin
+from qc_robyn_admin.core.fields import TableField
+from qc_robyn_admin.core.inline import InlineModelAdmin
+from tests.conftest import FakeRequest, create_items, list_params
+from tests.models import Item, Note
+
+
+class NoteInline(InlineModelAdmin):
+    model = Note
+    fk_field = 'item'
+    table_fields = [TableField('id'), TableField('text')]
+
+
+class ScopedNoteInline(NoteInline):
+    async def get_queryset(self, parent_instance):
+        return (await super().get_queryset(parent_instance)).exclude(text__endswith='-0')
+
+
+class ItemAdmin(ModelAdmin):
+    table_fields = [TableField('id'), TableField('name')]
+    inlines = [NoteInline]
+
+
+class CountedItemAdmin(ItemAdmin):
+    show_inline_counts = True
+
+
+async def create_parents() -> list:
+    items = await create_items(3, notes=2)
+    await Note.create(item=items[1], text='extra')
+    await Note.filter(item=items[2]).delete()
+    return items
+
+
+def test_counts_for_visible_page(run_db, queries):
+    async def test():
+        items = await create_parents()
+        admin = ItemAdmin(Item)
+        queries.clear()
+        result = await admin.get_list_data(FakeRequest(), list_params(limit=2, inline_counts='true'))
+        assert result['inline_counts'] == {'Note': {str(items[0].id): 2, str(items[1].id): 3}}
+        count_sql = [sql for sql in queries if '"note"' in sql]
+        # 只统计当前页的行, 一条分组查询
+        assert len(count_sql) == 1 and 'GROUP BY' in count_sql[0]
+
+        result = await admin.get_list_data(FakeRequest(), list_params(offset=2))
+        assert 'inline_counts' not in result
+    run_db(test)
+
+
+def test_rows_without_children_count_zero(run_db):
+    async def test():
+        items = await create_parents()
+        admin = CountedItemAdmin(Item)
+        result = await admin.get_list_data(FakeRequest(), list_params(offset=2))
+        assert result['inline_counts'] == {'Note': {str(items[2].id): 0}}
+        # 参数优先于 show_inline_counts
+        result = await admin.get_list_data(FakeRequest(), list_params(inline_counts='false'))
+        assert 'inline_counts' not in result
+        result = await admin.get_list_data(FakeRequest(), list_params(offset=99))
+        assert result['inline_counts'] == {'Note': {}}
+    run_db(test)
+
+
+def test_no_inlines_no_counts(run_db):
+    class PlainItemAdmin(ModelAdmin):
+        show_inline_counts = True
+        table_fields = [TableField('id')]
+
+    async def test():
+        await create_items(2)
+        admin = PlainItemAdmin(Item)
+        assert not admin.wants_inline_counts({'inline_counts': 'true'})
+        assert 'inline_counts' not in await admin.get_list_data(FakeRequest(), list_params())
+    run_db(test)
+
+
+def test_overridden_inline_queryset_counts_scoped_children(run_db):
+    class ScopedItemAdmin(CountedItemAdmin):
+        inlines = [ScopedNoteInline]
+
+    async def test():
+        items = await create_parents()
+        admin = ScopedItemAdmin(Item)
+        result = await admin.get_list_data(FakeRequest(), list_params())
+        assert result['inline_counts'] == {
+            'Note': {str(items[0].id): 1, str(items[1].id): 2, str(items[2].id): 0}
+        }
+        assert await ScopedNoteInline(Item).count_children([]) == {}
+    run_db(test)
+
+
+def test_counts_cached_with_page_until_child_write(run_db):
+    class CachedItemAdmin(CountedItemAdmin):
+        cache_ttl = 60
+
+    async def test():
+        items = await create_parents()
+        admin = CachedItemAdmin(Item)
+        admin.connect_cache_signals()
+        await admin.get_list_data(FakeRequest(), list_params())
+        # 子记录变更后缓存的列表页失效
+        await Note.create(item=items[2], text='new')
+        result = await admin.get_list_data(FakeRequest(), list_params())
+        assert result['inline_counts']['Note'][str(items[2].id)] == 1
+    run_db(test)
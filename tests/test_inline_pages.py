@@ -0,0 +1,171 @@
+import pytest
+
+from qc_robyn_admin.core.admin import ModelAdmin
+from qc_robyn_admin.core.fields import TableField
+from qc_robyn_admin.core.inline import InlineModelAdmin
+from qc_robyn_admin.core.pagination import InvalidCursor
+from tests.conftest import create_items
+from tests.models import Item, Note
+
+
+class NoteInline(InlineModelAdmin):
+    model = Note
+    fk_field = 'item'
+    per_page = 2
+    table_fields = [TableField('id'), TableField('text')]
+
+
+class NewestNoteInline(NoteInline):
+    default_ordering = ['-id']
+
+
+class ScopedNoteInline(NoteInline):
+    async def get_queryset(self, parent_instance):
+        return (await super().get_queryset(parent_instance)).exclude(text__endswith='-0')
+
+
+class IdNoteInline(NoteInline):
+    table_fields = [TableField('id')]
+
+
+class ItemAdmin(ModelAdmin):
+    table_fields = [TableField('id'), TableField('name')]
+    inlines = [NoteInline]
+
+
+def texts(objects) -> list:
+    return [obj.text for obj in objects]
+
+
+def test_cursor_pages_cover_all_children(run_db):
+    async def test():
+        items = await create_items(2, notes=5)
+        inline = NoteInline(Item)
+        seen, cursor = [], ''
+        while True:
+            page = await inline.get_page(items[0], cursor=cursor)
+            assert page['total'] == 5
+            seen.extend(texts(page['objects']))
+            cursor = page['next_cursor']
+            if cursor is None:
+                break
+        assert seen == [f"note0-{j}" for j in range(5)]
+
+        newest = await NewestNoteInline(Item).get_page(items[0], limit=3)
+        assert texts(newest['objects']) == ['note0-4', 'note0-3', 'note0-2']
+        assert newest['next_offset'] == 3
+    run_db(test)
+
+
+def test_cursor_pages_over_nullable_sort_column(run_db):
+    class RankedNoteInline(NoteInline):
+        table_fields = [TableField('id'), TableField('rank', sortable=True)]
+
+    async def test():
+        items = await create_items(1, notes=7)
+        notes = await Note.filter(item=items[0]).order_by('id')
+        for note, rank in zip(notes, [2, None, 1, None, 2, None, 1]):
+            note.rank = rank
+            await note.save()
+        inline = RankedNoteInline(Item)
+        # SQLite 升序时 NULL 排在最前
+        asc = sorted(notes, key=lambda note: (note.rank is not None, note.rank or 0, note.id))
+        for order, expected in (('asc', asc), ('desc', asc[::-1])):
+            seen, cursor = [], ''
+            while True:
+                page = await inline.get_page(items[0], sort_field='rank', sort_order=order, cursor=cursor)
+                seen.extend(note.id for note in page['objects'])
+                cursor = page['next_cursor']
+                if cursor is None:
+                    break
+            assert seen == [note.id for note in expected]
+    run_db(test)
+
+
+def test_limit_clamped(run_db):
+    class SmallInline(NoteInline):
+        max_per_page = 3
+
+    async def test():
+        items = await create_items(1, notes=5)
+        page = await SmallInline(Item).get_page(items[0], limit=100)
+        assert len(page['objects']) == 3
+        page = await SmallInline(Item).get_page(items[0], limit=-1)
+        assert len(page['objects']) == 1
+    run_db(test)
+
+
+def test_invalid_cursor_raises(run_db):
+    async def test():
+        items = await create_items(1, notes=3)
+        with pytest.raises(InvalidCursor):
+            await NoteInline(Item).get_page(items[0], cursor='not-a-cursor')
+    run_db(test)
+
+
+def test_search_children(run_db):
+    async def test():
+        items = await create_items(1, notes=12)
+        inline = NoteInline(Item)
+        page = await inline.get_page(items[0], search='0-1')
+        assert page['total'] == 3
+        assert texts(page['objects']) == ['note0-1', 'note0-10']
+        # 没有可搜索的字段时不过滤
+        assert IdNoteInline(Item).get_search_query('x') is None
+        page = await IdNoteInline(Item).get_page(items[0], search='x')
+        assert page['total'] == 12
+    run_db(test)
+
+
+def test_get_inline_data_returns_page_metadata(run_db):
+    async def test():
+        items = await create_items(1, notes=3)
+        admin = ItemAdmin(Item)
+        first = await admin.get_inline_data(str(items[0].id), 'Note')
+        assert first['total'] == 3 and first['next_offset'] == 2
+        assert [row['data']['text'] for row in first['data']] == ['note0-0', 'note0-1']
+        rest = await admin.get_inline_data(str(items[0].id), 'Note', cursor=first['next_cursor'])
+        assert [row['data']['text'] for row in rest['data']] == ['note0-2']
+        assert rest['next_cursor'] is None
+
+        empty = {'data': [], 'total': 0, 'next_cursor': None, 'next_offset': None}
+        assert await admin.get_inline_data(str(items[0].id), 'Missing') == empty
+        assert await admin.get_inline_data('9999', 'Note') == empty
+        assert await admin.get_inline_data(str(items[0].id), 'Note', cursor='bad') == empty
+    run_db(test)
+
+
+def test_first_pages_in_one_windowed_query(run_db, queries):
+    async def test():
+        items = await create_items(3, notes=3)
+        extra = await Item.create(name='empty')
+        parent_ids = [item.id for item in items] + [extra.id]
+        inline = NoteInline(Item)
+        queries.clear()
+        pages = await inline.get_first_pages(parent_ids)
+        # 一次统计总数, 一次按窗口函数取每个父记录的第一页
+        assert len(queries) == 2
+        assert any('ROW_NUMBER() OVER' in sql for sql in queries)
+
+        for item in items:
+            expected = await inline.get_page(item)
+            page = pages[str(item.id)]
+            assert texts(page['objects']) == texts(expected['objects'])
+            assert page['total'] == 3 and page['next_offset'] == 2
+            assert page['next_cursor'] == expected['next_cursor']
+        assert pages[str(extra.id)] == {'objects': [], 'total': 0, 'next_cursor': None, 'next_offset': None}
+    run_db(test)
+
+
+def test_first_pages_fall_back_when_get_queryset_overridden(run_db, queries):
+    async def test():
+        items = await create_items(2, notes=3)
+        inline = ScopedNoteInline(Item)
+        queries.clear()
+        pages = await inline.get_first_pages([items[0].id, items[1].id, 9999])
+        assert not any('ROW_NUMBER' in sql for sql in queries)
+        assert texts(pages[str(items[1].id)]['objects']) == ['note1-1', 'note1-2']
+        assert pages[str(items[1].id)]['total'] == 2
+        # 不存在的父记录不返回
+        assert '9999' not in pages
+    run_db(test)
@@ -0,0 +1,133 @@
+import asyncio
+
+from qc_robyn_admin.core.admin import ModelAdmin
+from qc_robyn_admin.core.fields import SearchField, TableField
+from qc_robyn_admin.core.ngram import TrigramIndex, trigrams
+from tests.conftest import FakeRequest, create_items, list_params
+from tests.models import Item
+
+
+class NgramItemAdmin(ModelAdmin):
+    ngram_search = True
+    table_fields = [TableField('id'), TableField('name')]
+    search_fields = [SearchField('name'), SearchField('payload')]
+
+
+def names(result: dict) -> list:
+    return sorted(row['data']['name'] for row in result['data'])
+
+
+def test_trigram_index_substring_search():
+    assert trigrams('abcd') == {'abc', 'bcd'}
+    assert trigrams('ab') == set()
+    index = TrigramIndex()
+    index.add(1, ['Apple Pie', None])
+    index.add(2, ['pineapple'])
+    index.add(3, ['banana'])
+    assert index.search('APPLE') == {1, 2}
+    assert index.search('pi') == {1, 2}
+    # 三元组都出现但不连续
+    assert index.search('nanab') == set()
+
+    index.add(2, ['pear'])
+    assert index.search('apple') == {1}
+    index.remove(1)
+    index.remove(99)
+    assert index.search('apple') == set()
+    assert index.stats()['rows'] == 2 and index.stats()['bytes'] > 0
+
+
+def test_search_uses_candidate_pks(run_db, queries):
+    async def test():
+        await create_items(12)
+        admin = NgramItemAdmin(Item)
+        assert admin.get_ngram_stats() is None
+        result = await admin.get_list_data(FakeRequest(), list_params(search='EM01'))
+        assert names(result) == ['item010', 'item011']
+        assert admin.get_ngram_stats()['rows'] == 12
+
+        queries.clear()
+        result = await admin.get_list_data(FakeRequest(), list_params(search='payload 3'))
+        assert names(result) == ['item003']
+        # 索引已构建, 搜索条件为主键列表
+        assert not any('LIKE' in sql for sql in queries)
+        assert all('"id" IN (?)' in sql for sql in queries)
+    run_db(test)
+
+
+def test_index_updated_on_save_and_delete(run_db):
+    async def test():
+        await create_items(2)
+        admin = NgramItemAdmin(Item)
+        admin.connect_cache_signals()
+        await admin.get_ngram_index()
+
+        item = await Item.create(name='walrus')
+        assert names(await admin.get_list_data(FakeRequest(), list_params(search='alru'))) == ['walrus']
+        item.name = 'narwhal'
+        await item.save()
+        assert (await admin.get_list_data(FakeRequest(), list_params(search='alru')))['total'] == 0
+        # 只更新部分字段时从数据库重新读取
+        await Item.filter(id=item.id).update(payload='tusk')
+        item = await Item.get(id=item.id).only('id', 'payload')
+        item.payload = 'long tusk'
+        await item.save(update_fields=['payload'])
+        assert names(await admin.get_list_data(FakeRequest(), list_params(search='long tu'))) == ['narwhal']
+        await item.delete()
+        assert (await admin.get_list_data(FakeRequest(), list_params(search='narwhal')))['total'] == 0
+        assert admin.get_ngram_stats()['rows'] == 2
+    run_db(test)
+
+
+def test_concurrent_first_searches_share_build(run_db):
+    async def test():
+        await create_items(3)
+        admin = NgramItemAdmin(Item)
+        first, second = await asyncio.gather(admin.get_ngram_index(), admin.get_ngram_index())
+        assert first is second is not None
+    run_db(test)
+
+
+def test_too_many_rows_falls_back_to_database(run_db, queries):
+    class SmallNgramItemAdmin(NgramItemAdmin):
+        ngram_max_rows = 3
+
+    async def test():
+        await create_items(4)
+        admin = SmallNgramItemAdmin(Item)
+        queries.clear()
+        result = await admin.get_list_data(FakeRequest(), list_params(search='item002'))
+        assert names(result) == ['item002']
+        assert admin.get_ngram_stats() is None
+        assert await admin.get_ngram_index() is None
+    run_db(test)
+
+
+def test_too_many_candidates_uses_icontains(run_db, queries):
+    class FewCandidatesItemAdmin(NgramItemAdmin):
+        ngram_max_candidates = 2
+
+    async def test():
+        await create_items(5)
+        admin = FewCandidatesItemAdmin(Item)
+        await admin.get_ngram_index()
+        queries.clear()
+        result = await admin.get_list_data(FakeRequest(), list_params(search='ITEM'))
+        assert result['total'] == 5
+        assert any('LIKE' in sql for sql in queries)
+    run_db(test)
+
+
+def test_failed_build_not_retried_until_reset(run_db):
+    class BrokenNgramItemAdmin(NgramItemAdmin):
+        def get_search_columns(self):
+            return ['missing']
+
+    async def test():
+        await create_items(2)
+        admin = BrokenNgramItemAdmin(Item)
+        assert await admin.get_ngram_index() is None
+        assert admin._ngram_failed
+        admin.reset_ngram_index()
+        assert not admin._ngram_failed
+    run_db(test)
@@ -0,0 +1,97 @@
+from qc_robyn_admin.core.admin import ModelAdmin
+from qc_robyn_admin.core.fields import SearchField, TableField
+from qc_robyn_admin.models import AdminUser
+from tests.conftest import FakeRequest, create_items, list_params
+from tests.models import Item
+
+
+class CachedItemAdmin(ModelAdmin):
+    cache_ttl = 60
+    table_fields = [
+        TableField('id'),
+        TableField('name'),
+        TableField('AdminUser_username', related_model=AdminUser, related_key='owner_id'),
+    ]
+    search_fields = [SearchField('name')]
+
+
+def test_page_served_from_cache(run_db, queries):
+    async def test():
+        await create_items(6)
+        admin = CachedItemAdmin(Item)
+        first = await admin.get_list_data(FakeRequest(), list_params(limit=3))
+        queries.clear()
+        assert await admin.get_list_data(FakeRequest(), list_params(limit=3)) is first
+        assert queries == []
+
+        # 参数不同的页单独缓存
+        second = await admin.get_list_data(FakeRequest(), list_params(limit=3, offset=3))
+        assert second is not first and len(queries) > 0
+        assert len(admin._page_cache) == 2
+        assert admin._page_cache.total_bytes > 0
+    run_db(test)
+
+
+def test_page_cache_cleared_on_model_and_related_writes(run_db):
+    async def test():
+        items = await create_items(4)
+        admin = CachedItemAdmin(Item)
+        admin.connect_cache_signals()
+        await admin.get_list_data(FakeRequest(), list_params())
+
+        await Item.create(name='extra')
+        result = await admin.get_list_data(FakeRequest(), list_params())
+        assert result['total'] == 5
+
+        # 关联字段引用的模型变更后也失效
+        owner = await AdminUser.get(id=items[0].owner_id)
+        owner.username = 'renamed'
+        await owner.save()
+        result = await admin.get_list_data(FakeRequest(), list_params())
+        assert result['data'][0]['data']['AdminUser_username'] == 'renamed'
+    run_db(test)
+
+
+def test_page_larger_than_max_bytes_not_cached(run_db):
+    class SmallCacheItemAdmin(CachedItemAdmin):
+        cache_max_bytes = 64
+
+    async def test():
+        await create_items(6)
+        admin = SmallCacheItemAdmin(Item)
+        await admin.get_list_data(FakeRequest(), list_params())
+        assert len(admin._page_cache) == 0
+        # 空页小于上限, 可以缓存
+        await admin.get_list_data(FakeRequest(), list_params(search='nothing'))
+        assert len(admin._page_cache) == 1
+    run_db(test)
+
+
+def test_request_scoped_page_not_cached(run_db):
+    class OwnItemAdmin(CachedItemAdmin):
+        async def get_queryset(self, request, params):
+            return (await super().get_queryset(request, params)).filter(active=True)
+
+    async def test():
+        await create_items(4)
+        admin = OwnItemAdmin(Item)
+        assert (await admin.get_list_data(FakeRequest(), list_params()))['total'] == 2
+        await Item.create(name='extra', active=True)
+        assert (await admin.get_list_data(FakeRequest(), list_params()))['total'] == 3
+        assert len(admin._page_cache) == 0
+    run_db(test)
+
+
+def test_page_started_before_invalidation_not_cached(run_db):
+    class RacingItemAdmin(CachedItemAdmin):
+        async def get_list_count(self, queryset, params):
+            # 查询过程中有写入
+            self.invalidate_cache()
+            return await super().get_list_count(queryset, params)
+
+    async def test():
+        await create_items(2)
+        admin = RacingItemAdmin(Item)
+        await admin.get_list_data(FakeRequest(), list_params())
+        assert len(admin._page_cache) == 0
+    run_db(test)
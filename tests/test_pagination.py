@@ -0,0 +1,150 @@
+from datetime import date, datetime
+from decimal import Decimal
+
+import pytest
+
+from qc_robyn_admin.core.admin import ModelAdmin
+from qc_robyn_admin.core.fields import TableField
+from qc_robyn_admin.core.pagination import InvalidCursor, decode_cursor, encode_cursor, keyset_condition
+from tests.conftest import FakeRequest, create_items, list_params
+from tests.models import Item
+
+
+class KeysetItemAdmin(ModelAdmin):
+    pagination = 'keyset'
+    table_fields = [TableField('id'), TableField('name'), TableField('score', sortable=True)]
+
+
+@pytest.mark.parametrize('value', [
+    'abc', 7, 1.5, None, True,
+    datetime(2024, 5, 17, 8, 30), date(2024, 5, 17), Decimal('12.50'),
+])
+def test_cursor_round_trip(value):
+    cursor = encode_cursor('score', 'desc', value, 42, 'prev')
+    assert decode_cursor(cursor) == {
+        'sort': 'score', 'order': 'desc', 'value': value, 'pk': 42, 'direction': 'prev'
+    }
+
+
+def test_empty_cursor_is_none():
+    assert decode_cursor('') is None
+
+
+@pytest.mark.parametrize('cursor', ['not-a-cursor', encode_cursor('id', 'asc', 1, 1, 'sideways')])
+def test_invalid_cursor(cursor):
+    with pytest.raises(InvalidCursor):
+        decode_cursor(cursor)
+
+
+def lookups(condition) -> set:
+    """收集 Q 条件中用到的全部查询键"""
+    return set(condition.filters).union(*(lookups(child) for child in condition.children))
+
+
+def test_keyset_condition_follows_null_ordering():
+    # 升序时 NULL 在最后 (PostgreSQL): 非 NULL 游标之后还有 NULL 记录
+    assert 'owner_id__isnull' in lookups(keyset_condition('owner_id', 'id', 3, 7, 'gt', nulls_first=False))
+    assert 'owner_id__isnull' not in lookups(keyset_condition('owner_id', 'id', 3, 7, 'gt', nulls_first=True))
+    assert 'owner_id__isnull' in lookups(keyset_condition('owner_id', 'id', 3, 7, 'lt', nulls_first=True))
+    assert lookups(keyset_condition('id', 'id', None, 7, 'gt')) == {'id__gt'}
+
+
+async def walk(admin, **kwargs) -> tuple[list, list]:
+    """沿 next_cursor 翻到最后一页, 返回各页的 id"""
+    pages, cursors = [], []
+    params = list_params(limit=5, **kwargs)
+    while True:
+        result = await admin.get_list_data(FakeRequest(), dict(params))
+        pages.append([row['data']['id'] for row in result['data']])
+        cursors.append(result)
+        if not result['next_cursor']:
+            return pages, cursors
+        params['cursor'] = result['next_cursor']
+
+
+def test_keyset_walks_every_row_once(run_db):
+    async def test():
+        items = await create_items(12)
+        admin = KeysetItemAdmin(Item)
+        pages, results = await walk(admin)
+        assert [len(page) for page in pages] == [5, 5, 2]
+        assert [int(pk) for page in pages for pk in page] == [item.id for item in items]
+        assert results[0]['prev_cursor'] is None
+        assert all(result['total'] == 12 for result in results)
+
+        # 从第二页向前翻回到第一页
+        back = await admin.get_list_data(FakeRequest(), list_params(limit=5, cursor=results[1]['prev_cursor']))
+        assert [row['data']['id'] for row in back['data']] == pages[0]
+    run_db(test)
+
+
+def test_keyset_sort_with_ties(run_db):
+    async def test():
+        items = await create_items(12)
+        admin = KeysetItemAdmin(Item)
+        pages, _ = await walk(admin, sort='score', order='desc')
+        expected = sorted(items, key=lambda item: (-item.score, -item.id))
+        assert [int(pk) for page in pages for pk in page] == [item.id for item in expected]
+    run_db(test)
+
+
+def test_keyset_sort_by_relation_uses_fk_column(run_db):
+    async def test():
+        items = await create_items(12)
+        admin = KeysetItemAdmin(Item)
+        keyset = admin.get_keyset_state(list_params(sort='owner'))
+        assert keyset['sort'] == 'owner_id'
+        pages, _ = await walk(admin, sort='owner')
+        expected = sorted(items, key=lambda item: (item.owner_id, item.id))
+        assert [int(pk) for page in pages for pk in page] == [item.id for item in expected]
+    run_db(test)
+
+
+def test_keyset_walks_nullable_sort_column(run_db):
+    async def test():
+        items = await create_items(12)
+        for item in items[::3]:
+            item.owner = None
+            await item.save()
+        admin = KeysetItemAdmin(Item)
+        # SQLite 升序时 NULL 排在最前
+        asc = sorted(items, key=lambda item: (item.owner_id is not None, item.owner_id or 0, item.id))
+        for order, expected in (('asc', asc), ('desc', asc[::-1])):
+            pages, results = await walk(admin, sort='owner', order=order)
+            assert [int(pk) for page in pages for pk in page] == [item.id for item in expected]
+            # 从每一页向前翻回上一页
+            for page, result in zip(pages, results[1:]):
+                back = await admin.get_list_data(
+                    FakeRequest(), list_params(limit=5, sort='owner', order=order, cursor=result['prev_cursor'])
+                )
+                assert [row['data']['id'] for row in back['data']] == page
+    run_db(test)
+
+
+def test_keyset_cursor_reset_when_sort_changes(run_db):
+    async def test():
+        await create_items(12)
+        admin = KeysetItemAdmin(Item)
+        first = await admin.get_list_data(FakeRequest(), list_params(limit=5))
+        keyset = admin.get_keyset_state(list_params(cursor=first['next_cursor'], sort='score'))
+        assert keyset['cursor'] is None
+    run_db(test)
+
+
+def test_keyset_falls_back_to_offset_without_cursor(run_db):
+    async def test():
+        await create_items(12)
+        admin = KeysetItemAdmin(Item)
+        assert admin.get_keyset_state(list_params(offset=5)) is None
+        result = await admin.get_list_data(FakeRequest(), list_params(limit=5, offset=10))
+        assert len(result['data']) == 2
+        assert 'next_cursor' not in result
+    run_db(test)
+
+
+def test_invalid_cursor_raises_from_list_data(run_db):
+    async def test():
+        await create_items(3)
+        with pytest.raises(InvalidCursor):
+            await KeysetItemAdmin(Item).get_list_data(FakeRequest(), list_params(cursor='garbage'))
+    run_db(test)
@@ -0,0 +1,82 @@
+from qc_robyn_admin.core.admin import ModelAdmin
+from qc_robyn_admin.core.fields import TableField
+from qc_robyn_admin.core.inline import InlineModelAdmin
+from qc_robyn_admin.models import AdminUser
+from tests.conftest import FakeRequest, create_items, list_params
+from tests.models import Item, Note
+
+
+class ProjectedItemAdmin(ModelAdmin):
+    table_fields = [
+        TableField('id'),
+        TableField('name'),
+        TableField('score'),
+        TableField('AdminUser_username', related_model=AdminUser, related_key='owner_id'),
+    ]
+
+
+class NoteInline(InlineModelAdmin):
+    model = Note
+    fk_field = 'item'
+    table_fields = [TableField('text')]
+    default_ordering = ['-id']
+
+
+def test_list_selects_only_table_columns(run_db, queries):
+    async def test():
+        await create_items(3)
+        admin = ProjectedItemAdmin(Item)
+        assert admin.get_list_columns(admin.table_fields) == ['id', 'name', 'score', 'owner_id']
+        queries.clear()
+        result = await admin.get_list_data(FakeRequest(), list_params())
+        page_sql = queries[-1]
+        assert '"payload"' not in page_sql and '"price"' not in page_sql
+        assert result['data'][0]['data']['AdminUser_username'] == 'user0'
+    run_db(test)
+
+
+def test_sparse_fieldset(run_db, queries):
+    async def test():
+        await create_items(3)
+        admin = ProjectedItemAdmin(Item)
+        queries.clear()
+        result = await admin.get_list_data(FakeRequest(), list_params(fields='name'))
+        assert set(result['data'][0]['data']) == {'id', 'name'}
+        assert '"score"' not in queries[-1]
+    run_db(test)
+
+
+def test_unknown_fields_return_every_column(run_db):
+    async def test():
+        await create_items(3)
+        admin = ProjectedItemAdmin(Item)
+        result = await admin.get_list_data(FakeRequest(), list_params(fields='nope,,'))
+        assert set(result['data'][0]['data']) == {'id', 'name', 'score', 'AdminUser_username'}
+    run_db(test)
+
+
+def test_non_column_field_selects_everything(run_db, queries):
+    class PropertyItemAdmin(ModelAdmin):
+        table_fields = [TableField('id'), TableField('pk')]
+
+    async def test():
+        items = await create_items(2)
+        admin = PropertyItemAdmin(Item)
+        assert admin.get_list_columns(admin.table_fields) is None
+        queries.clear()
+        result = await admin.get_list_data(FakeRequest(), list_params())
+        assert '"payload"' in queries[-1]
+        assert result['data'][0]['data']['pk'] == str(items[0].id)
+    run_db(test)
+
+
+def test_inline_selects_table_and_ordering_columns(run_db, queries):
+    async def test():
+        items = await create_items(1, notes=3)
+        inline = NoteInline(Item)
+        assert inline.get_list_columns() == ['id', 'text']
+        queries.clear()
+        page = await inline.get_page(items[0])
+        assert [note.text for note in page['objects']] == ['note0-2', 'note0-1', 'note0-0']
+        assert '"item_id"' not in queries[-1].split('FROM')[0]
+    run_db(test)
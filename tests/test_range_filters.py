@@ -0,0 +1,85 @@
+from datetime import date, datetime, timedelta
+
+import pytest
+
+from qc_robyn_admin.core.admin import ModelAdmin
+from qc_robyn_admin.core.fields import TableField
+from qc_robyn_admin.core.filters import DateRangeFilter, InvalidFilterValue, NumberRangeFilter
+from tests.conftest import FakeRequest, create_items, list_params
+from tests.models import Item
+
+
+class RangeItemAdmin(ModelAdmin):
+    table_fields = [TableField('id'), TableField('score')]
+    filter_fields = [NumberRangeFilter('score'), DateRangeFilter('created_at')]
+
+
+def test_date_range_includes_whole_end_day():
+    assert DateRangeFilter('created_at').parse_range('2024-05-01,2024-05-17') == {
+        'created_at__gte': date(2024, 5, 1),
+        'created_at__lt': date(2024, 5, 18),
+    }
+
+
+def test_date_range_with_times_and_open_ends():
+    date_filter = DateRangeFilter('created_at')
+    assert date_filter.parse_range(',2024-05-17T08:30:00') == {
+        'created_at__lte': datetime(2024, 5, 17, 8, 30)
+    }
+    assert date_filter.parse_range('2024-05-01,') == {'created_at__gte': date(2024, 5, 1)}
+
+
+def test_date_range_from_panel_params():
+    date_filter = DateRangeFilter('created_at')
+    params = {'created_at_start': '2024-05-01', 'created_at_end': ''}
+    assert date_filter.get_filter_value(params) == '2024-05-01,'
+    assert date_filter.get_filter_value({}) is None
+
+
+@pytest.mark.parametrize('value', ['2024-13-01,', 'yesterday', '2024-05-17,2024-05-01'])
+def test_invalid_date_range(value):
+    with pytest.raises(InvalidFilterValue):
+        DateRangeFilter('created_at').parse_range(value)
+
+
+def test_number_range_bounds():
+    number_filter = NumberRangeFilter('score')
+    assert number_filter.parse_range('1,3') == {'score__gte': 1, 'score__lte': 3}
+    assert number_filter.parse_range('1.5,') == {'score__gte': 1.5}
+    assert number_filter.get_filter_value({'score_max': '4'}) == ',4'
+
+
+@pytest.mark.parametrize('value', ['a,3', '5,1'])
+def test_invalid_number_range(value):
+    with pytest.raises(InvalidFilterValue):
+        NumberRangeFilter('score').parse_range(value)
+
+
+def test_range_filters_in_list_query(run_db, queries):
+    async def test():
+        items = await create_items(10)
+        admin = RangeItemAdmin(Item)
+        queries.clear()
+        result = await admin.get_list_data(FakeRequest(), list_params(score='1,2'))
+        assert result['total'] == len([item for item in items if 1 <= item.score <= 2])
+        assert '"score">=' in queries[0] and '"score"<=' in queries[0]
+
+        # 前后各留一天, 与测试运行的时区无关
+        start, end = (date.today() + timedelta(days=days) for days in (-1, 1))
+        result = await admin.get_list_data(FakeRequest(), list_params(
+            created_at_start=start.isoformat(), created_at_end=end.isoformat()
+        ))
+        assert result['total'] == 10
+        result = await admin.get_list_data(FakeRequest(), list_params(created_at_end='2000-01-01'))
+        assert result['total'] == 0
+    run_db(test)
+
+
+def test_invalid_range_rejected_before_query(run_db, queries):
+    async def test():
+        await create_items(3)
+        queries.clear()
+        with pytest.raises(InvalidFilterValue):
+            await RangeItemAdmin(Item).get_list_data(FakeRequest(), list_params(score='9,1'))
+        assert queries == []
+    run_db(test)
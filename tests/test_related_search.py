@@ -0,0 +1,67 @@
+from qc_robyn_admin.core.admin import ModelAdmin
+from qc_robyn_admin.core.fields import SearchField, TableField
+from qc_robyn_admin.core.filters import InputFilter
+from qc_robyn_admin.models import AdminUser
+from tests.conftest import FakeRequest, create_items, list_params
+from tests.models import Item
+
+
+class OwnerSearchAdmin(ModelAdmin):
+    table_fields = [TableField('id'), TableField('name')]
+    search_fields = [
+        SearchField('name'),
+        SearchField('AdminUser_username', related_model=AdminUser, related_key='owner_id'),
+    ]
+    filter_fields = [
+        InputFilter('AdminUser_email', related_model=AdminUser, related_key='owner_id'),
+    ]
+
+
+def ids(result) -> set:
+    return {int(row['data']['id']) for row in result['data']}
+
+
+def test_related_search_uses_subquery(run_db, queries):
+    async def test():
+        items = await create_items(6)
+        admin = OwnerSearchAdmin(Item)
+        queries.clear()
+        result = await admin.get_list_data(FakeRequest(), list_params(search='user1'))
+        assert ids(result) == {item.id for item in items if item.owner_id == items[1].owner_id}
+        # 关联表的匹配在数据库子查询中完成, 不先查询匹配的关联记录
+        selects = [sql for sql in queries if 'FROM "item"' in sql]
+        assert len(queries) == len(selects) == 2
+        assert all('IN (SELECT' in sql for sql in selects)
+    run_db(test)
+
+
+def test_related_filter_uses_subquery(run_db):
+    async def test():
+        items = await create_items(6)
+        admin = OwnerSearchAdmin(Item)
+        result = await admin.get_list_data(FakeRequest(), list_params(AdminUser_email='user0@'))
+        assert result['total'] == 3
+        assert ids(result) == {item.id for item in items if item.owner_id == items[0].owner_id}
+    run_db(test)
+
+
+def test_related_search_without_match(run_db):
+    async def test():
+        await create_items(6)
+        result = await OwnerSearchAdmin(Item).get_list_data(FakeRequest(), list_params(search='nobody'))
+        assert result['total'] == 0 and result['data'] == []
+    run_db(test)
+
+
+def test_invalid_related_search_field_is_skipped(run_db):
+    class BrokenSearchAdmin(OwnerSearchAdmin):
+        search_fields = [
+            SearchField('name'),
+            SearchField('AdminUser_nickname', related_model=AdminUser, related_key='owner_id'),
+        ]
+
+    async def test():
+        items = await create_items(6)
+        result = await BrokenSearchAdmin(Item).get_list_data(FakeRequest(), list_params(search='item002'))
+        assert ids(result) == {items[2].id}
+    run_db(test)
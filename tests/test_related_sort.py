@@ -0,0 +1,73 @@
+from qc_robyn_admin.core.admin import ModelAdmin
+from qc_robyn_admin.core.fields import TableField
+from qc_robyn_admin.core.inline import InlineModelAdmin
+from qc_robyn_admin.models import AdminUser
+from tests.conftest import FakeRequest, create_items, list_params
+from tests.models import Item, Note
+
+
+class SortedItemAdmin(ModelAdmin):
+    default_ordering = ['id']
+    table_fields = [
+        TableField('id'),
+        TableField('name', sortable=True),
+        TableField('AdminUser_username', related_model=AdminUser, related_key='owner_id', sortable=True),
+        TableField('AdminUser_pk', related_model=AdminUser, related_key='owner_id', sortable=True),
+    ]
+
+
+class NoteInline(InlineModelAdmin):
+    model = Note
+    fk_field = 'item'
+    per_page = 2
+    table_fields = [
+        TableField('text', sortable=True),
+        TableField('Item_name', related_model=Item, related_key='item_id', sortable=True),
+    ]
+
+
+def test_related_sort_field_is_join_path(run_db):
+    async def test():
+        admin = SortedItemAdmin(Item)
+        assert admin.get_sort_field('AdminUser_username') == 'owner__username'
+        assert admin.get_sort_field('name') == 'name'
+        # 关联字段不是数据库列或字段不存在时不能排序
+        assert admin.get_sort_field('AdminUser_pk') is None
+        assert admin.get_sort_field('nope') is None
+    run_db(test)
+
+
+def test_list_sorted_by_related_column(run_db, queries):
+    async def test():
+        await create_items(6)
+        admin = SortedItemAdmin(Item)
+        queries.clear()
+        result = await admin.get_list_data(FakeRequest(), list_params(sort='AdminUser_username', order='desc'))
+        owners = [row['data']['AdminUser_username'] for row in result['data']]
+        assert owners == ['user1'] * 3 + ['user0'] * 3
+        page_sql = next(sql for sql in queries if 'ORDER BY' in sql)
+        assert 'JOIN "robyn_admin_users"' in page_sql
+    run_db(test)
+
+
+def test_unsortable_related_field_uses_default_ordering(run_db):
+    async def test():
+        items = await create_items(4)
+        result = await SortedItemAdmin(Item).get_list_data(
+            FakeRequest(), list_params(sort='AdminUser_pk', order='desc')
+        )
+        assert [int(row['data']['id']) for row in result['data']] == [item.id for item in items]
+    run_db(test)
+
+
+def test_inline_related_sort_pages_by_offset(run_db):
+    async def test():
+        items = await create_items(1, notes=3)
+        inline = NoteInline(Item)
+        assert inline.get_page_ordering('Item_name') is None
+        first = await inline.get_page(items[0], sort_field='Item_name')
+        assert first['next_cursor'] is None and first['next_offset'] == 2
+        rest = await inline.get_page(items[0], sort_field='Item_name', offset=first['next_offset'])
+        assert len(first['objects']) + len(rest['objects']) == 3
+        assert rest['next_offset'] is None
+    run_db(test)
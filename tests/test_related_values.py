@@ -0,0 +1,67 @@
+from qc_robyn_admin.core.admin import ModelAdmin
+from qc_robyn_admin.core.fields import TableField, load_related_values
+from qc_robyn_admin.models import AdminUser
+from tests.conftest import create_items
+from tests.models import Item
+
+
+class OwnedItemAdmin(ModelAdmin):
+    table_fields = [
+        TableField('id'),
+        TableField('name'),
+        TableField('AdminUser_username', related_model=AdminUser, related_key='owner_id'),
+        TableField('AdminUser_email', related_model=AdminUser, related_key='owner_id'),
+    ]
+
+
+def test_related_values_loaded_once_per_model(run_db, queries):
+    async def test():
+        await create_items(10)
+        admin = OwnedItemAdmin(Item)
+        objects = await Item.all().order_by('id')
+        queries.clear()
+        rows = await admin.serialize_objects(objects)
+        # 两个关联字段来自同一个模型, 只查询一次
+        assert len(queries) == 1
+        assert [row['AdminUser_username'] for row in rows[:2]] == ['user0', 'user1']
+        assert rows[1]['AdminUser_email'] == 'user1@example.com'
+    run_db(test)
+
+
+def test_related_values_columns_and_ids(run_db):
+    async def test():
+        items = await create_items(4)
+        admin = OwnedItemAdmin(Item)
+        values = await load_related_values(items, admin.table_fields, admin.get_related_field_name)
+        owners = {item.owner_id for item in items}
+        assert set(values) == {'AdminUser_username', 'AdminUser_email'}
+        assert set(values['AdminUser_username']) == owners
+    run_db(test)
+
+
+def test_missing_related_row_and_null_fk(run_db):
+    async def test():
+        items = await create_items(2)
+        await Item.filter(id=items[0].id).update(owner_id=None)
+        objects = await Item.all().order_by('id')
+        # 外键指向不存在的记录
+        objects[1].owner_id = 9999
+        rows = await OwnedItemAdmin(Item).serialize_objects(objects)
+        assert [row['AdminUser_username'] for row in rows] == ['', '']
+    run_db(test)
+
+
+def test_unknown_related_field_is_skipped(run_db, queries):
+    class BadFieldAdmin(ModelAdmin):
+        table_fields = [
+            TableField('id'),
+            TableField('AdminUser_nickname', related_model=AdminUser, related_key='owner_id'),
+        ]
+
+    async def test():
+        items = await create_items(2)
+        admin = BadFieldAdmin(Item)
+        queries.clear()
+        assert await load_related_values(items, admin.table_fields, admin.get_related_field_name) == {}
+        assert queries == []
+    run_db(test)
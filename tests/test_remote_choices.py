@@ -0,0 +1,94 @@
+from qc_robyn_admin.auth_admin import UserRoleAdmin
+from qc_robyn_admin.auth_models import Role, UserRole
+from qc_robyn_admin.core.admin import ModelAdmin
+from qc_robyn_admin.core.fields import DisplayType, FormField
+from qc_robyn_admin.models import AdminUser
+from tests.models import Item
+
+
+async def create_users(count: int) -> list:
+    return [
+        await AdminUser.create(username=f"user{i:02d}", password="x", email=f"user{i}@example.com")
+        for i in range(count)
+    ]
+
+
+def test_form_field_config_has_no_rows():
+    field = FormField('user_id', field_type=DisplayType.SELECT, choices_model=AdminUser, choices_label='username')
+    data = field.to_dict()
+    assert data['remote_choices'] is True and data['choices'] is None
+    assert data['choices_page_size'] == 20
+    # 未指定显示字段时显示值字段
+    assert FormField('role_id', choices_model=Role).choices_label == 'id'
+    assert FormField('name').to_dict()['remote_choices'] is False
+
+
+def test_choices_paged_by_label(run_db, queries):
+    async def test():
+        users = await create_users(5)
+        admin = UserRoleAdmin(UserRole)
+        # 创建用户时会自动创建 admin 账号
+        page = await admin.get_choices('user_id', limit=2)
+        assert [option['label'] for option in page['results']] == ['admin', 'user00']
+        queries.clear()
+        page = await admin.get_choices('user_id', search='user', limit=2)
+        assert page['results'] == [
+            {'value': str(users[0].id), 'label': 'user00'}, {'value': str(users[1].id), 'label': 'user01'}
+        ]
+        assert page['more'] is True and page['selected'] == []
+        # 只查询值和显示字段, 不统计总数
+        assert len(queries) == 1
+        assert '"password"' not in queries[0] and 'COUNT' not in queries[0]
+
+        last = await admin.get_choices('user_id', search='user', offset=4, limit=2)
+        assert [option['label'] for option in last['results']] == ['user04']
+        assert last['more'] is False
+    run_db(test)
+
+
+def test_choices_search_and_selected(run_db, queries):
+    async def test():
+        users = await create_users(12)
+        await Role.create(name='editor')
+        admin = UserRoleAdmin(UserRole)
+        page = await admin.get_choices('user_id', search='R1')
+        assert [option['label'] for option in page['results']] == ['user10', 'user11']
+
+        queries.clear()
+        page = await admin.get_choices('user_id', limit=1, values=[str(users[7].id), str(users[9].id)])
+        # 已选值一次查询取得显示文本
+        assert page['selected'] == [
+            {'value': str(users[7].id), 'label': 'user07'}, {'value': str(users[9].id), 'label': 'user09'}
+        ]
+        assert len(queries) == 2
+
+        roles = await admin.get_choices('role_id')
+        assert [option['label'] for option in roles['results']] == ['editor']
+    run_db(test)
+
+
+def test_unknown_field_returns_none(run_db):
+    class ItemAdmin(ModelAdmin):
+        form_fields = [FormField('name'), FormField('owner_id', choices_model=AdminUser, choices_label='username')]
+
+    async def test():
+        admin = UserRoleAdmin(UserRole)
+        assert await admin.get_choices('missing') is None
+        assert await admin.get_choices('created_at') is None
+        # 没有 choices_model 的字段不提供远程选项
+        assert await ItemAdmin(Item).get_choices('name') is None
+        assert (await ItemAdmin(Item).get_choices('owner_id'))['results'] == []
+    run_db(test)
+
+
+def test_limit_capped_by_max_per_page(run_db):
+    class SmallPageAdmin(UserRoleAdmin):
+        max_per_page = 3
+
+    async def test():
+        await create_users(5)
+        page = await SmallPageAdmin(UserRole).get_choices('user_id', limit=100)
+        assert len(page['results']) == 3 and page['more'] is True
+        page = await SmallPageAdmin(UserRole).get_choices('user_id', offset=-5, limit=-1)
+        assert len(page['results']) == 1
+    run_db(test)
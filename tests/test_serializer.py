@@ -0,0 +1,101 @@
+from qc_robyn_admin.core.admin import ModelAdmin
+from qc_robyn_admin.core.fields import DisplayType, TableField
+from qc_robyn_admin.core.inline import InlineModelAdmin
+from qc_robyn_admin.core.serializer import RowSerializer, ValuesRow
+from qc_robyn_admin.models import AdminUser
+from tests.conftest import create_items
+from tests.models import Item, Note
+
+
+async def shout(value):
+    return str(value).upper()
+
+
+def broken(value):
+    raise ValueError('broken formatter')
+
+
+class SerializedItemAdmin(ModelAdmin):
+    table_fields = [
+        TableField('id'),
+        TableField('name', formatter=lambda value: f"<{value}>"),
+        TableField('payload', formatter=shout),
+        TableField('score', formatter=broken),
+        TableField('active', display_type=DisplayType.SWITCH),
+        TableField('price'),
+        TableField('AdminUser_username', related_model=AdminUser, related_key='owner_id'),
+    ]
+
+
+class NoteInline(InlineModelAdmin):
+    model = Note
+    fk_field = 'item'
+    table_fields = [
+        TableField('text', formatter=lambda value: value.title()),
+        TableField('Item_name', related_model=Item, related_key='item_id'),
+    ]
+
+
+def test_compiled_serializer_matches_serialize_object(run_db):
+    async def test():
+        await create_items(4)
+        admin = SerializedItemAdmin(Item)
+        objects = await Item.all().order_by('id')
+        for for_display in (True, False):
+            expected = [await admin.serialize_object(obj, for_display=for_display) for obj in objects]
+            assert await admin.serialize_objects(objects, for_display=for_display) == expected
+    run_db(test)
+
+
+def test_formatters_and_switch_values(run_db):
+    async def test():
+        await create_items(2)
+        admin = SerializedItemAdmin(Item)
+        serializer = admin.get_serializer()
+        assert not serializer.is_sync
+        row = (await admin.serialize_objects(await Item.filter(name='item001')))[0]
+        assert row['name'] == '<item001>'
+        assert row['payload'] == 'PAYLOAD 1'
+        # 格式化函数出错时输出原值
+        assert row['score'] == '1'
+        assert row['active'] is False
+        assert row['AdminUser_username'] == 'user1'
+    run_db(test)
+
+
+def test_sync_serializer_on_values_rows():
+    serializer = RowSerializer(
+        [TableField('name', formatter=str.upper), TableField('score')], lambda field: 'id'
+    )
+    assert serializer.is_sync
+    row = ValuesRow(name='a', score=None)
+    assert serializer.serialize_sync(row, {}) == {'name': 'A', 'score': ''}
+    assert serializer.serialize_sync(row, {}, for_display=False) == {'name': 'a', 'score': ''}
+
+
+def test_inline_serializer_matches_serialize_object(run_db):
+    async def test():
+        items = await create_items(1, notes=2)
+        inline = NoteInline(Item)
+        notes = await Note.filter(item=items[0]).order_by('id')
+        expected = [await inline.serialize_object(note) for note in notes]
+        rows = await inline.serialize_objects(notes)
+        assert rows == expected
+        assert list(rows[0]) == ['id', 'text', 'Item_name']
+        assert rows[0]['Item_name'] == 'item000'
+    run_db(test)
+
+
+def test_overridden_serialize_object_is_used(run_db):
+    class CustomItemAdmin(ModelAdmin):
+        table_fields = [TableField('id'), TableField('name')]
+
+        async def serialize_object(self, obj, for_display=True):
+            return {'id': str(obj.id), 'name': obj.name[::-1]}
+
+    async def test():
+        await create_items(1)
+        admin = CustomItemAdmin(Item)
+        assert admin.get_serializer() is None
+        assert (await admin.serialize_objects(await Item.all()))[0]['name'] == '000meti'
+    run_db(test)
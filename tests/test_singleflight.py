@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+
+from qc_robyn_admin.core.singleflight import SingleFlight
+from qc_robyn_admin.core.site import AdminSite
+from tests.conftest import FakeRequest
+
+
+def test_concurrent_calls_share_one_execution():
+    async def test():
+        flight = SingleFlight()
+        calls = []
+        release = asyncio.Event()
+
+        async def query():
+            calls.append(1)
+            await release.wait()
+            return {'total': 3}
+
+        waiters = [asyncio.create_task(flight.do('page', query)) for _ in range(5)]
+        await asyncio.sleep(0)
+        assert len(flight) == 1
+        release.set()
+        results = await asyncio.gather(*waiters)
+        assert calls == [1]
+        assert all(result is results[0] for result in results)
+        assert len(flight) == 0
+
+        # 上一次调用结束后再次执行
+        await flight.do('page', query)
+        assert calls == [1, 1]
+    asyncio.run(test())
+
+
+def test_different_keys_run_separately():
+    async def test():
+        flight = SingleFlight()
+
+        async def query(value):
+            await asyncio.sleep(0)
+            return value
+
+        assert await asyncio.gather(
+            flight.do('a', lambda: query(1)), flight.do('b', lambda: query(2))
+        ) == [1, 2]
+    asyncio.run(test())
+
+
+def test_exception_shared_and_key_released():
+    async def test():
+        flight = SingleFlight()
+
+        async def failing():
+            await asyncio.sleep(0)
+            raise ValueError('query failed')
+
+        results = await asyncio.gather(
+            flight.do('page', failing), flight.do('page', failing), return_exceptions=True
+        )
+        assert [type(result) for result in results] == [ValueError, ValueError]
+        assert len(flight) == 0
+    asyncio.run(test())
+
+
+def test_cancelled_waiter_does_not_cancel_others():
+    async def test():
+        flight = SingleFlight()
+        release = asyncio.Event()
+
+        async def query():
+            await release.wait()
+            return 'done'
+
+        first = asyncio.create_task(flight.do('page', query))
+        second = asyncio.create_task(flight.do('page', query))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+        assert await second == 'done'
+        with pytest.raises(asyncio.CancelledError):
+            await first
+    asyncio.run(test())
+
+
+def test_session_user_id_from_cookie():
+    site = AdminSite.__new__(AdminSite)
+    site.session_secret = 'secret'
+    site.session_expire = 3600
+    token = site._generate_session_token(7)
+    request = FakeRequest({'Cookie': f"lang=en; session_token={token}"})
+    assert site._get_session_user_id(request) == 7
+    assert site._get_session_user_id(FakeRequest()) is None
+
+    other = AdminSite.__new__(AdminSite)
+    other.session_secret = 'other'
+    other.session_expire = 3600
+    assert other._get_session_user_id(request) is None
@@ -0,0 +1,58 @@
+import pytest
+
+from qc_robyn_admin.core.admin import ModelAdmin
+from qc_robyn_admin.core.fields import TableField
+from qc_robyn_admin.core.serializer import ValuesRow
+from qc_robyn_admin.models import AdminUser
+from tests.conftest import FakeRequest, create_items, list_params
+from tests.models import Item
+
+
+class RowItemAdmin(ModelAdmin):
+    table_fields = [
+        TableField('id'),
+        TableField('name', formatter=str.upper),
+        TableField('price'),
+        TableField('created_at'),
+        TableField('AdminUser_username', related_model=AdminUser, related_key='owner_id'),
+    ]
+
+
+class ScopedRowItemAdmin(RowItemAdmin):
+    async def get_queryset(self, request, params):
+        return await super().get_queryset(request, params)
+
+
+def test_values_row_attributes():
+    row = ValuesRow(name='a')
+    assert row.name == 'a'
+    with pytest.raises(AttributeError):
+        row.missing
+
+
+def test_list_page_skips_model_instances(run_db, queries):
+    async def test():
+        items = await create_items(4)
+        admin = RowItemAdmin(Item)
+        objects, related_values = await admin.fetch_values(
+            Item.all().order_by('id'), admin.get_list_columns(admin.table_fields), admin.table_fields
+        )
+        assert all(type(obj) is ValuesRow for obj in objects)
+        assert related_values['AdminUser_username'] == {items[0].owner_id: 'user0', items[1].owner_id: 'user1'}
+
+        queries.clear()
+        await admin.get_list_data(FakeRequest(), list_params())
+        # 总数和当前页各一条查询, 关联字段在当前页的查询中 JOIN
+        assert len(queries) == 2
+    run_db(test)
+
+
+def test_values_rows_match_model_instances(run_db):
+    async def test():
+        await create_items(4)
+        fast = await RowItemAdmin(Item).get_list_data(FakeRequest(), list_params())
+        # 重写了 get_queryset 时使用模型实例
+        slow = await ScopedRowItemAdmin(Item).get_list_data(FakeRequest(), list_params())
+        assert fast == slow
+        assert fast['data'][0]['data']['name'] == 'ITEM000'
+    run_db(test)